@@ -0,0 +1,165 @@
+import time
+
+import numpy as np
+
+from algorithms.distance_matrix import compute_distance_matrix, as_cost_matrix, DEFAULT_MEMORY_BUDGET, \
+    UNREACHABLE_COST
+
+
+def allocate_waypoints(environment, drone_starts, waypoints, max_workers=None, time_budget=2.0,
+                       memory_budget=DEFAULT_MEMORY_BUDGET):
+    """Split waypoints between any number of drones, minimizing makespan then total battery
+
+    Uses NFZ-aware distances: waypoints are clustered to their nearest drone start,
+    ordered by cheapest insertion, then improved by relocate/swap local search.
+    Returns a dict with per-drone ordered waypoint lists and route costs. Waypoints
+    no drone start can reach are left out of every assignment and listed under
+    'unreachable' - callers should report them.
+    """
+    num_drones = len(drone_starts)
+    points = [drone['start_position'] for drone in drone_starts] + [wp['position'] for wp in waypoints]
+    distances = compute_distance_matrix(environment, points, max_workers=max_workers, memory_budget=memory_budget)
+    cost = as_cost_matrix(distances)
+
+    allocator = _RouteAllocator(cost, num_drones)
+    unreachable = [w for w in range(len(waypoints)) if not allocator.is_reachable(w)]
+    allocator.build_initial_routes([w for w in range(len(waypoints)) if allocator.is_reachable(w)])
+    allocator.improve(time_budget)
+
+    route_costs = allocator.route_costs()
+    return {
+        'assignments': {
+            drone['drone_id']: [waypoints[w] for w in route]
+            for drone, route in zip(drone_starts, allocator.routes)
+        },
+        'route_costs': {drone['drone_id']: int(c) for drone, c in zip(drone_starts, route_costs)},
+        'makespan': int(max(route_costs, default=0)),
+        'total_cost': int(sum(route_costs)),
+        'unreachable': [waypoints[w] for w in unreachable]
+    }
+
+
+class _RouteAllocator:
+    """Multi-vehicle open-route construction and local search over a cost matrix
+
+    Matrix indices: 0..num_drones-1 are drone starts, num_drones.. are waypoints.
+    Routes hold waypoint numbers (matrix index minus num_drones).
+    """
+
+    def __init__(self, cost, num_drones):
+        self.cost = cost
+        self.num_drones = num_drones
+        self.routes = [[] for _ in range(num_drones)]
+
+    def is_reachable(self, waypoint):
+        """Waypoint can be reached from at least one drone start"""
+        return bool(np.any(self.cost[:self.num_drones, self.num_drones + waypoint] < UNREACHABLE_COST))
+
+    def route_cost(self, drone, route):
+        """Open-route battery cost: start -> waypoints in order"""
+        if not route:
+            return 0
+        nodes = np.array([drone] + [self.num_drones + w for w in route])
+        return int(self.cost[nodes[:-1], nodes[1:]].sum())
+
+    def route_costs(self):
+        return [self.route_cost(drone, route) for drone, route in enumerate(self.routes)]
+
+    def best_insertion(self, drone, route, waypoint):
+        """Return (added_cost, position) for the cheapest place to insert waypoint"""
+        node = self.num_drones + waypoint
+        previous = np.array([drone] + [self.num_drones + w for w in route])
+        following = previous[1:]
+
+        # Inserting between previous[j] and following[j], or appending after the last node
+        deltas = np.empty(len(previous), dtype=np.int64)
+        deltas[:-1] = (self.cost[previous[:-1], node] + self.cost[node, following]
+                       - self.cost[previous[:-1], following])
+        deltas[-1] = self.cost[previous[-1], node]
+        position = int(np.argmin(deltas))
+        return int(deltas[position]), position
+
+    def build_initial_routes(self, waypoints):
+        """Cluster waypoints to their nearest start, then order each cluster by cheapest insertion"""
+        waypoints = np.asarray(waypoints, dtype=np.int64)
+        if waypoints.size == 0:
+            return
+
+        start_costs = self.cost[:self.num_drones, self.num_drones + waypoints]
+        clusters = np.argmin(start_costs, axis=0)
+
+        # Insert far waypoints first so near ones slot in between them
+        order = np.argsort(-start_costs.min(axis=0), kind='stable')
+        for k in order.tolist():
+            drone = int(clusters[k])
+            waypoint = int(waypoints[k])
+            _, position = self.best_insertion(drone, self.routes[drone], waypoint)
+            self.routes[drone].insert(position, waypoint)
+
+    def improve(self, time_budget):
+        """Relocate and swap waypoints between routes while (makespan, total) improves"""
+        deadline = time.perf_counter() + time_budget
+        costs = self.route_costs()
+
+        improved = True
+        while improved and time.perf_counter() < deadline:
+            improved = False
+            # Work from the longest route down so makespan moves are tried first
+            for source in np.argsort(costs)[::-1].tolist():
+                if self._try_relocate(source, costs) or self._try_swap(source, costs):
+                    improved = True
+                    break
+                if time.perf_counter() >= deadline:
+                    break
+
+    def _objective(self, costs):
+        return max(costs, default=0), sum(costs)
+
+    def _try_relocate(self, source, costs):
+        """Move one waypoint from source into another route if the objective improves"""
+        current = self._objective(costs)
+        route = self.routes[source]
+        for index, waypoint in enumerate(route):
+            reduced = route[:index] + route[index + 1:]
+            reduced_cost = self.route_cost(source, reduced)
+            for target in range(self.num_drones):
+                if target == source:
+                    continue
+                added, position = self.best_insertion(target, self.routes[target], waypoint)
+                if added >= UNREACHABLE_COST:
+                    continue
+                trial = list(costs)
+                trial[source] = reduced_cost
+                trial[target] = costs[target] + added
+                if self._objective(trial) < current:
+                    self.routes[source] = reduced
+                    self.routes[target].insert(position, waypoint)
+                    costs[:] = trial
+                    return True
+        return False
+
+    def _try_swap(self, source, costs):
+        """Exchange one waypoint between source and another route if the objective improves"""
+        current = self._objective(costs)
+        for index, waypoint in enumerate(self.routes[source]):
+            reduced_source = self.routes[source][:index] + self.routes[source][index + 1:]
+            for target in range(self.num_drones):
+                if target == source:
+                    continue
+                for other_index, other in enumerate(self.routes[target]):
+                    reduced_target = self.routes[target][:other_index] + self.routes[target][other_index + 1:]
+                    added_source, source_position = self.best_insertion(source, reduced_source, other)
+                    added_target, target_position = self.best_insertion(target, reduced_target, waypoint)
+                    if added_source >= UNREACHABLE_COST or added_target >= UNREACHABLE_COST:
+                        continue
+                    trial = list(costs)
+                    trial[source] = self.route_cost(source, reduced_source) + added_source
+                    trial[target] = self.route_cost(target, reduced_target) + added_target
+                    if self._objective(trial) < current:
+                        reduced_source.insert(source_position, other)
+                        reduced_target.insert(target_position, waypoint)
+                        self.routes[source] = reduced_source
+                        self.routes[target] = reduced_target
+                        costs[:] = trial
+                        return True
+        return False
@@ -0,0 +1,94 @@
+import heapq
+import time
+
+
+class AStarPlanner:
+    """Heap-based A* path planner over the environment grid (4-connected, Manhattan heuristic)"""
+
+    def __init__(self, environment):
+        self.environment = environment
+
+        # Performance counters (cumulative and for the most recent plan)
+        self.plans_computed = 0
+        self.nodes_expanded = 0
+        self.planning_time = 0.0
+        self.last_nodes_expanded = 0
+        self.last_planning_time = 0.0
+
+    def plan(self, start, goal):
+        """Return the optimal route from start to goal (start excluded), or None if unreachable"""
+        started = time.perf_counter()
+        route, expanded = self._search(tuple(start), tuple(goal))
+        elapsed = time.perf_counter() - started
+
+        self.plans_computed += 1
+        self.nodes_expanded += expanded
+        self.planning_time += elapsed
+        self.last_nodes_expanded = expanded
+        self.last_planning_time = elapsed
+        return route
+
+    def get_stats(self):
+        """Return planner performance counters"""
+        return {
+            'plans_computed': self.plans_computed,
+            'nodes_expanded': self.nodes_expanded,
+            'planning_time': self.planning_time,
+            'last_nodes_expanded': self.last_nodes_expanded,
+            'last_planning_time': self.last_planning_time
+        }
+
+    def _search(self, start, goal):
+        """Run A* and return (route, nodes_expanded)"""
+        if start == goal:
+            return [], 0
+
+        is_valid = self.environment.is_valid_position
+        if not is_valid(goal):
+            return None, 0
+
+        goal_row, goal_col = goal
+        g_score = {start: 0}
+        came_from = {}
+        closed = set()
+
+        # Heap entries: (f, h, tie_breaker, node) - lower h breaks f-ties toward the goal
+        h_start = abs(goal_row - start[0]) + abs(goal_col - start[1])
+        open_heap = [(h_start, h_start, 0, start)]
+        counter = 1
+        expanded = 0
+
+        while open_heap:
+            _, _, _, node = heapq.heappop(open_heap)
+            if node in closed:
+                continue  # Stale heap entry
+            if node == goal:
+                return self._reconstruct(came_from, start, goal), expanded
+
+            closed.add(node)
+            expanded += 1
+
+            row, col = node
+            next_g = g_score[node] + 1
+            for neighbor in ((row + 1, col), (row - 1, col), (row, col + 1), (row, col - 1)):
+                if neighbor in closed or not is_valid(neighbor):
+                    continue
+                if next_g < g_score.get(neighbor, next_g + 1):
+                    g_score[neighbor] = next_g
+                    came_from[neighbor] = node
+                    h = abs(goal_row - neighbor[0]) + abs(goal_col - neighbor[1])
+                    heapq.heappush(open_heap, (next_g + h, h, counter, neighbor))
+                    counter += 1
+
+        return None, expanded
+
+    @staticmethod
+    def _reconstruct(came_from, start, goal):
+        """Walk parent links back from goal to build the route"""
+        route = [goal]
+        node = goal
+        while came_from[node] != start:
+            node = came_from[node]
+            route.append(node)
+        route.reverse()
+        return route
@@ -0,0 +1,101 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+# Cost used in place of -1 (unreachable) when distances are summed or minimized
+UNREACHABLE_COST = 10 ** 9
+
+# Sources searched together, one bit each in a uint64 per cell
+SOURCES_PER_BATCH = 64
+
+# Default memory budget for the BFS working arrays of all pool threads together
+DEFAULT_MEMORY_BUDGET = 256 * 1024 * 1024
+
+# Full-grid uint64 arrays each BFS worker holds at once (frontier, grown, unreached, temporary)
+WORKER_ARRAYS = 4
+
+
+def compute_distance_matrix(environment, points, max_workers=None, memory_budget=DEFAULT_MEMORY_BUDGET):
+    """NFZ-aware shortest-path distances between all pairs of points (-1 = unreachable)
+
+    Bit-parallel BFS: each batch of 64 sources floods the grid together, one bit per
+    source in a uint64 word per cell, so a single set of array shifts advances all 64
+    wavefronts. Batches run on a thread pool (NumPy releases the GIL for the shifts),
+    with no more threads than fit their working arrays in memory_budget (always at least one).
+    """
+    points = np.asarray(points, dtype=np.int64).reshape(-1, 2)
+    count = len(points)
+    matrix = np.full((count, count), -1, dtype=np.int64)
+    if count == 0:
+        return matrix
+
+    free_words = np.where(environment.nfz_mask, np.uint64(0), ~np.uint64(0))
+    batches = [np.arange(start, min(start + SOURCES_PER_BATCH, count))
+               for start in range(0, count, SOURCES_PER_BATCH)]
+
+    def fill_batch(sources):
+        matrix[sources] = _batch_bfs(free_words, points, sources)
+
+    max_workers = max_workers or os.cpu_count() or 1
+    max_workers = min(max_workers, max(1, memory_budget // (WORKER_ARRAYS * free_words.nbytes)))
+    if max_workers == 1 or len(batches) == 1:
+        for sources in batches:
+            fill_batch(sources)
+    else:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            list(executor.map(fill_batch, batches))
+    return matrix
+
+
+def as_cost_matrix(distance_matrix):
+    """Replace unreachable (-1) entries with UNREACHABLE_COST"""
+    return np.where(distance_matrix < 0, UNREACHABLE_COST, distance_matrix)
+
+
+def _batch_bfs(free_words, points, sources):
+    """Distances from up to 64 sources to every point; returns a (len(sources), len(points)) array"""
+    distances = np.full((len(sources), len(points)), -1, dtype=np.int64)
+    point_rows, point_cols = points[:, 0], points[:, 1]
+
+    frontier = np.zeros(free_words.shape, dtype=np.uint64)
+    for bit, source in enumerate(sources.tolist()):
+        row, col = points[source]
+        frontier[row, col] |= np.uint64(1 << bit) & free_words[row, col]
+    unreached = free_words & ~frontier  # Free cells each source has not flooded yet
+
+    distance = 0
+    _record_arrivals(distances, frontier[point_rows, point_cols], distance, len(sources))
+    pending = np.count_nonzero(distances < 0)
+
+    grown = np.empty_like(frontier)
+    while pending:
+        distance += 1
+
+        # Four-neighbour dilation of every wavefront at once
+        grown.fill(0)
+        grown[1:] |= frontier[:-1]
+        grown[:-1] |= frontier[1:]
+        grown[:, 1:] |= frontier[:, :-1]
+        grown[:, :-1] |= frontier[:, 1:]
+        grown &= unreached
+        if not grown.any():
+            break
+
+        unreached ^= grown
+        frontier, grown = grown, frontier
+        pending -= _record_arrivals(distances, frontier[point_rows, point_cols], distance, len(sources))
+
+    return distances
+
+
+def _record_arrivals(distances, arrival_words, distance, num_sources):
+    """Store distance for every (source, point) bit set in arrival_words; returns how many"""
+    arrived_points = np.flatnonzero(arrival_words)
+    if arrived_points.size == 0:
+        return 0
+    words = arrival_words[arrived_points].astype('<u8').view(np.uint8).reshape(-1, 8)
+    bits = np.unpackbits(words, axis=1, bitorder='little')[:, :num_sources]
+    point_slots, source_bits = np.nonzero(bits)
+    distances[source_bits, arrived_points[point_slots]] = distance
+    return len(source_bits)
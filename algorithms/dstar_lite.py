@@ -0,0 +1,157 @@
+import heapq
+import math
+import time
+
+
+class DStarLitePlanner:
+    """Incremental D* Lite planner toward one fixed goal (4-connected grid, unit costs)
+
+    Searches backward from the goal, so as the drone moves only the start changes.
+    When NFZs switch on or off, only the cells in the changed rectangles (and their
+    neighbours) are re-evaluated and the search repairs the affected part of its
+    tree instead of starting over.
+    """
+
+    def __init__(self, environment, goal, start):
+        self.environment = environment
+        self.goal = tuple(goal)
+        self.start = tuple(start)
+        self.last_start = self.start
+        self.key_modifier = 0  # km in the D* Lite paper
+        self.g = {}
+        self.rhs = {self.goal: 0}
+        self.open_heap = []
+        self.open_keys = {}  # node -> key it was queued with (stale heap entries are skipped)
+        self.seen_version = environment.version
+
+        # Performance counters (cumulative and for the most recent repair)
+        self.nodes_expanded = 0
+        self.planning_time = 0.0
+        self.last_nodes_expanded = 0
+        self.last_planning_time = 0.0
+        self.repairs = 0
+
+        self._push(self.goal)
+        self._compute_shortest_path()
+
+    def next_step(self, position):
+        """Move the start to position, repair after any NFZ changes, and return the next cell
+
+        Returns None when the goal is unreachable from position.
+        """
+        position = tuple(position)
+        if position != self.start:
+            self.start = position
+        self._apply_environment_changes()
+        if position == self.goal:
+            return position
+        if math.isinf(self._g(position)) and math.isinf(self._rhs(position)):
+            self._compute_shortest_path()
+
+        best, best_cost = None, math.inf
+        for neighbor in self._neighbors(position):
+            cost = self._cost(position, neighbor) + self._g(neighbor)
+            if cost < best_cost:
+                best, best_cost = neighbor, cost
+        return best
+
+    def get_stats(self):
+        """Return repair counters (nodes expanded, planning time)"""
+        return {
+            'repairs': self.repairs,
+            'nodes_expanded': self.nodes_expanded,
+            'planning_time': self.planning_time,
+            'last_nodes_expanded': self.last_nodes_expanded,
+            'last_planning_time': self.last_planning_time
+        }
+
+    def _apply_environment_changes(self):
+        """Re-evaluate only the cells inside NFZ rectangles changed since the last repair"""
+        if self.environment.version == self.seen_version:
+            return
+        regions = self.environment.nfz_changes_since(self.seen_version)
+        self.seen_version = self.environment.version
+        if not regions:
+            return
+
+        # Edge costs changed around the drone's current position, so keys shift by the distance moved
+        self.key_modifier += _manhattan(self.last_start, self.start)
+        self.last_start = self.start
+        for top, left, bottom, right in regions:
+            for row in range(max(top - 1, 0), min(bottom + 1, self.environment.rows - 1) + 1):
+                for col in range(max(left - 1, 0), min(right + 1, self.environment.cols - 1) + 1):
+                    self._update_vertex((row, col))
+        self.repairs += 1
+        self._compute_shortest_path()
+
+    def _compute_shortest_path(self):
+        started = time.perf_counter()
+        expanded = 0
+        start = self.start
+        while self.open_heap:
+            key, node = self.open_heap[0]
+            if self.open_keys.get(node) != key:
+                heapq.heappop(self.open_heap)  # Stale entry
+                continue
+            start_key = self._key(start)
+            if key >= start_key and self._rhs(start) == self._g(start):
+                break
+
+            heapq.heappop(self.open_heap)
+            del self.open_keys[node]
+            expanded += 1
+            new_key = self._key(node)
+            if key < new_key:
+                self._push(node, new_key)
+            elif self._g(node) > self._rhs(node):
+                self.g[node] = self._rhs(node)
+                for neighbor in self._neighbors(node):
+                    self._update_vertex(neighbor)
+            else:
+                self.g[node] = math.inf
+                self._update_vertex(node)
+                for neighbor in self._neighbors(node):
+                    self._update_vertex(neighbor)
+
+        elapsed = time.perf_counter() - started
+        self.nodes_expanded += expanded
+        self.planning_time += elapsed
+        self.last_nodes_expanded = expanded
+        self.last_planning_time = elapsed
+
+    def _update_vertex(self, node):
+        if node != self.goal:
+            self.rhs[node] = min((self._cost(node, neighbor) + self._g(neighbor)
+                                  for neighbor in self._neighbors(node)), default=math.inf)
+        self.open_keys.pop(node, None)
+        if self._g(node) != self._rhs(node):
+            self._push(node)
+
+    def _push(self, node, key=None):
+        key = key or self._key(node)
+        self.open_keys[node] = key
+        heapq.heappush(self.open_heap, (key, node))
+
+    def _key(self, node):
+        best = min(self._g(node), self._rhs(node))
+        return (best + _manhattan(self.start, node) + self.key_modifier, best)
+
+    def _g(self, node):
+        return self.g.get(node, math.inf)
+
+    def _rhs(self, node):
+        return self.rhs.get(node, math.inf)
+
+    def _cost(self, node, neighbor):
+        """Unit cost to enter a free cell (a drone caught by a new NFZ can still fly out)"""
+        return 1 if self.environment.is_valid_position(neighbor) else math.inf
+
+    def _neighbors(self, node):
+        row, col = node
+        rows, cols = self.environment.rows, self.environment.cols
+        return [(r, c) for r, c in ((row + 1, col), (row - 1, col), (row, col + 1), (row, col - 1))
+                if 0 <= r < rows and 0 <= c < cols]
+
+
+def _manhattan(a, b):
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
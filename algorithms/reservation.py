@@ -0,0 +1,313 @@
+import heapq
+import itertools
+
+
+class ReservationTable:
+    """Hashed space-time reservations shared by every drone in a mission
+
+    Vertex reservations say "drone d is in cell p at step t", edge reservations
+    "drone d moves a -> b arriving at step t" (to forbid head-on swaps), and a
+    parked drone holds its cell from a step onward until it plans again. All
+    lookups are single dict probes. Reservations older than the current step are
+    dropped by advance(), so the table only holds the fleet's future plans.
+    """
+
+    def __init__(self):
+        self.step = 0
+        self._vertices = {}  # (step, position) -> drone_id
+        self._edges = {}     # (step, from, to) -> drone_id
+        self._by_step = {}   # step -> [vertex or edge key, ...] for garbage collection
+        self._last_step = {}  # position -> latest step any vertex reservation holds it
+        self._parked = {}     # position -> (drone_id, since step)
+        self._parked_by_drone = {}  # drone_id -> position
+        self._collected = 0  # Steps below this have been garbage-collected
+        self.reservations_collected = 0
+
+    def advance(self, step):
+        """Move the clock to step and drop every reservation for earlier steps"""
+        self.step = step
+        for old_step in range(self._collected, step):
+            for key in self._by_step.pop(old_step, ()):
+                if len(key) == 2:
+                    del self._vertices[key]
+                else:
+                    del self._edges[key]
+                self.reservations_collected += 1
+        self._collected = max(self._collected, step)
+
+    def is_free(self, step, position, drone_id):
+        """True if no other drone occupies position at step"""
+        owner = self._vertices.get((step, position))
+        if owner is not None and owner != drone_id:
+            return False
+        parked = self._parked.get(position)
+        return parked is None or parked[0] == drone_id or step < parked[1]
+
+    def is_edge_free(self, step, from_position, to_position, drone_id):
+        """True if no other drone crosses the same edge the opposite way arriving at step"""
+        owner = self._edges.get((step, to_position, from_position))
+        return owner is None or owner == drone_id
+
+    def can_park(self, position, step, drone_id):
+        """True if drone_id may stay at position from step on without meeting a reserved drone"""
+        if self._last_step.get(position, -1) > step:
+            return False
+        parked = self._parked.get(position)
+        return parked is None or parked[0] == drone_id
+
+    def last_reserved_step(self, position):
+        """Latest step any route has reserved position for (-1 if none)"""
+        return self._last_step.get(position, -1)
+
+    def parked_by_other(self, position, drone_id):
+        """True if another drone currently holds position as its parked cell"""
+        parked = self._parked.get(position)
+        return parked is not None and parked[0] != drone_id
+
+    def reserve_route(self, drone_id, route, start_step):
+        """Reserve route (route[i] at start_step + i, moving from route[i - 1]) and park at its end"""
+        self.release_park(drone_id)
+        for offset, position in enumerate(route):
+            step = start_step + offset
+            vertex = (step, position)
+            self._vertices[vertex] = drone_id
+            keys = self._by_step.setdefault(step, [])
+            keys.append(vertex)
+            if offset:
+                edge = (step, route[offset - 1], position)
+                self._edges[edge] = drone_id
+                keys.append(edge)
+            if self._last_step.get(position, -1) < step:
+                self._last_step[position] = step
+        if route:
+            self.park(drone_id, route[-1], start_step + len(route) - 1)
+
+    def park(self, drone_id, position, since):
+        """Hold position for drone_id from step since until it next reserves a route"""
+        self.release_park(drone_id)
+        self._parked[position] = (drone_id, since)
+        self._parked_by_drone[drone_id] = position
+
+    def release_park(self, drone_id):
+        """Give up drone_id's parked cell (before it plans its next leg)"""
+        position = self._parked_by_drone.pop(drone_id, None)
+        if position is not None and self._parked.get(position, (None,))[0] == drone_id:
+            del self._parked[position]
+
+    def snapshot(self):
+        """Copy of the table's state (see SimulationEngine.snapshot)"""
+        return {
+            'step': self.step,
+            'vertices': dict(self._vertices),
+            'edges': dict(self._edges),
+            'by_step': {step: list(keys) for step, keys in self._by_step.items()},
+            'last_step': dict(self._last_step),
+            'parked': dict(self._parked),
+            'parked_by_drone': dict(self._parked_by_drone),
+            'collected': self._collected
+        }
+
+    def restore(self, snapshot):
+        """Return to a state captured by snapshot()"""
+        self.step = snapshot['step']
+        self._vertices = dict(snapshot['vertices'])
+        self._edges = dict(snapshot['edges'])
+        self._by_step = {step: list(keys) for step, keys in snapshot['by_step'].items()}
+        self._last_step = dict(snapshot['last_step'])
+        self._parked = dict(snapshot['parked'])
+        self._parked_by_drone = dict(snapshot['parked_by_drone'])
+        self._collected = snapshot['collected']
+
+    def get_stats(self):
+        """Return live and collected reservation counts"""
+        return {
+            'step': self.step,
+            'vertex_reservations': len(self._vertices),
+            'edge_reservations': len(self._edges),
+            'parked_drones': len(self._parked),
+            'reservations_collected': self.reservations_collected
+        }
+
+
+def plan_space_time(environment, table, drone_id, start, goal, start_step,
+                    constraints=None, max_expansions=20000):
+    """Space-time A* from start (at start_step - 1) to goal, avoiding the table's reservations
+
+    Moves are the four neighbours or waiting in place. The heuristic is the
+    environment's cached BFS distance field to goal when it has one (exact around
+    NFZs), else Manhattan distance. Returns the route excluding
+    start, one position per step from start_step (waits repeat a position), ending
+    where the drone can stay at goal - or None if no such route is found.
+    constraints is an optional set of (step, position) and (step, from, to)
+    keys the route must also avoid (used by conflict-based search).
+    """
+    start, goal = tuple(start), tuple(goal)
+    if table.parked_by_other(goal, drone_id):
+        return None  # Goal is held until its drone moves on - retry on a later step
+    constraints = constraints or frozenset()
+    heuristic = _heuristic(environment, goal)
+    if heuristic(start) is None:
+        return None  # Goal unreachable even with no other drones
+    # The drone cannot settle at goal before the last step anyone else passes through it
+    settle_after = max([table.last_reserved_step(goal)] +
+                       [key[0] for key in constraints if len(key) == 2 and key[1] == goal])
+
+    start_time = start_step - 1
+    tie_breaker = itertools.count()
+    # Heap entries: (f, -g, tie, g, position, step) - f-ties go to the deeper node
+    heap = [(max(heuristic(start), settle_after - start_time), 0, next(tie_breaker), 0, start, start_time)]
+    parents = {(start, start_time): None}
+    expansions = 0
+
+    while heap and expansions < max_expansions:
+        _, _, _, cost, position, time = heapq.heappop(heap)
+        expansions += 1
+        if position == goal and time >= settle_after and table.can_park(goal, time, drone_id):
+            return _rebuild_route(parents, (position, time))
+
+        row, col = position
+        arrive = time + 1
+        for neighbor in (position, (row + 1, col), (row - 1, col), (row, col + 1), (row, col - 1)):
+            state = (neighbor, arrive)
+            if state in parents:
+                continue
+            if neighbor != position and not environment.is_valid_position(neighbor):
+                continue
+            if not table.is_free(arrive, neighbor, drone_id) or \
+                    not table.is_edge_free(arrive, position, neighbor, drone_id):
+                continue
+            if state in constraints or (arrive, position, neighbor) in constraints:
+                continue
+            parents[state] = (position, time)
+            remaining = max(heuristic(neighbor), settle_after - arrive)
+            heapq.heappush(heap, (cost + 1 + remaining, -(cost + 1), next(tie_breaker),
+                                  cost + 1, neighbor, arrive))
+
+    return None
+
+
+def plan_legs(environment, table, legs, start_step, method='prioritized', max_cbs_agents=6,
+              max_cbs_nodes=256, max_expansions=20000):
+    """Plan and reserve collision-free routes for legs [(drone_id, start, goal), ...]
+
+    'prioritized' plans each leg in order against the table, reserving as it goes.
+    'cbs' runs conflict-based search over the legs jointly (against the table's
+    existing reservations) when there are at most max_cbs_agents of them, and
+    falls back to prioritized planning if the search exceeds max_cbs_nodes.
+    Returns {drone_id: route or None}.
+    """
+    if method not in ('prioritized', 'cbs'):
+        raise ValueError(f"Unknown planning method '{method}', expected 'prioritized' or 'cbs'")
+
+    if method == 'cbs' and 1 < len(legs) <= max_cbs_agents:
+        routes = _conflict_based_search(environment, table, legs, start_step, max_cbs_nodes, max_expansions)
+        if routes is not None:
+            for drone_id, route in routes.items():
+                table.reserve_route(drone_id, route, start_step)
+            return routes
+
+    routes = {}
+    for drone_id, start, goal in legs:
+        route = plan_space_time(environment, table, drone_id, start, goal, start_step,
+                                max_expansions=max_expansions)
+        if route is not None:
+            table.reserve_route(drone_id, route, start_step)
+        routes[drone_id] = route
+    return routes
+
+
+def _conflict_based_search(environment, table, legs, start_step, max_nodes, max_expansions):
+    """Optimal (sum of route lengths) joint routes for a few legs, or None if not found in budget"""
+    constraints = {drone_id: frozenset() for drone_id, _, _ in legs}
+    routes = {}
+    for drone_id, start, goal in legs:
+        route = plan_space_time(environment, table, drone_id, start, goal, start_step,
+                                max_expansions=max_expansions)
+        if route is None:
+            return None
+        routes[drone_id] = route
+
+    starts = {drone_id: tuple(start) for drone_id, start, _ in legs}
+    goals = {drone_id: (tuple(start), tuple(goal)) for drone_id, start, goal in legs}
+    tie_breaker = itertools.count()
+    open_nodes = [(_total_length(routes), next(tie_breaker), constraints, routes)]
+
+    for _ in range(max_nodes):
+        if not open_nodes:
+            return None
+        _, _, constraints, routes = heapq.heappop(open_nodes)
+        conflict = _first_conflict(routes, starts, start_step)
+        if conflict is None:
+            return routes
+
+        # Branch: forbid the conflicting move for each of the two drones in turn
+        for drone_id, key in conflict:
+            child_constraints = dict(constraints)
+            child_constraints[drone_id] = constraints[drone_id] | {key}
+            start, goal = goals[drone_id]
+            route = plan_space_time(environment, table, drone_id, start, goal, start_step,
+                                    constraints=child_constraints[drone_id], max_expansions=max_expansions)
+            if route is None:
+                continue
+            child_routes = dict(routes)
+            child_routes[drone_id] = route
+            heapq.heappush(open_nodes, (_total_length(child_routes), next(tie_breaker),
+                                        child_constraints, child_routes))
+    return None
+
+
+def _first_conflict(routes, starts, start_step):
+    """Earliest vertex or swap conflict as [(drone_id, constraint key), (drone_id, constraint key)]"""
+    horizon = max(len(route) for route in routes.values())
+    drone_ids = list(routes)
+
+    def position_at(drone_id, offset):
+        route = routes[drone_id]
+        if offset < 0:
+            return starts[drone_id]
+        return route[min(offset, len(route) - 1)] if route else starts[drone_id]
+
+    for offset in range(horizon):
+        step = start_step + offset
+        occupied = {}
+        for drone_id in drone_ids:
+            position = position_at(drone_id, offset)
+            other = occupied.get(position)
+            if other is not None:
+                return [(other, (step, position)), (drone_id, (step, position))]
+            occupied[position] = drone_id
+
+        for first, second in itertools.combinations(drone_ids, 2):
+            first_from, first_to = position_at(first, offset - 1), position_at(first, offset)
+            second_from, second_to = position_at(second, offset - 1), position_at(second, offset)
+            if first_from == second_to and first_to == second_from and first_from != first_to:
+                return [(first, (step, first_from, first_to)), (second, (step, second_from, second_to))]
+    return None
+
+
+def _total_length(routes):
+    return sum(len(route) for route in routes.values())
+
+
+def _rebuild_route(parents, state):
+    route = []
+    while parents[state] is not None:
+        route.append(state[0])
+        state = parents[state]
+    return route[::-1]
+
+
+def _heuristic(environment, goal):
+    """Return position -> lower bound on steps to goal (None if unreachable)"""
+    if hasattr(environment, 'get_distance_field'):
+        field = environment.get_distance_field(goal)  # Cached per goal - index it, don't copy it
+
+        def from_field(position):
+            distance = int(field[position[0], position[1]])
+            return distance if distance >= 0 else None
+        return from_field
+    return lambda position: _manhattan(position, goal)
+
+
+def _manhattan(a, b):
+    return abs(a[0] - b[0]) + abs(a[1] - b[1])
@@ -0,0 +1,59 @@
+from collections import OrderedDict
+
+
+class RouteCache:
+    """Bounded LRU cache of planned routes shared between navigators"""
+
+    def __init__(self, max_entries=4096):
+        self.max_entries = max_entries
+        self._routes = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @staticmethod
+    def make_key(environment, mode, start, goal):
+        """Build a cache key that changes whenever the environment's NFZ layout changes"""
+        return (environment.cache_key(), mode, tuple(start), tuple(goal))
+
+    def get(self, key):
+        """Return a copy of the cached route, or None on a miss"""
+        route = self._routes.get(key)
+        if route is None:
+            self.misses += 1
+            return None
+
+        self._routes.move_to_end(key)
+        self.hits += 1
+        return list(route)
+
+    def put(self, key, route):
+        """Store a route (kept as an immutable tuple) and evict the least recently used entries"""
+        self._routes[key] = tuple(route)
+        self._routes.move_to_end(key)
+        while len(self._routes) > self.max_entries:
+            self._routes.popitem(last=False)
+            self.evictions += 1
+
+    def clear(self):
+        """Drop all cached routes (counters are kept)"""
+        self._routes.clear()
+
+    def get_stats(self):
+        """Return cache size and hit/miss/eviction counters"""
+        lookups = self.hits + self.misses
+        return {
+            'entries': len(self._routes),
+            'max_entries': self.max_entries,
+            'hits': self.hits,
+            'misses': self.misses,
+            'evictions': self.evictions,
+            'hit_rate': self.hits / lookups if lookups else 0.0
+        }
+
+    def __len__(self):
+        return len(self._routes)
+
+
+# Process-wide cache used by every navigator unless one is passed explicitly
+shared_route_cache = RouteCache()
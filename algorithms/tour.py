@@ -0,0 +1,127 @@
+import time
+
+import numpy as np
+
+from algorithms.distance_matrix import compute_distance_matrix, as_cost_matrix, UNREACHABLE_COST
+
+
+def optimize_tour(environment, start_position, waypoints, time_budget=1.0, max_workers=None):
+    """Reorder one drone's waypoints to shorten its obstacle-aware open tour from start_position
+
+    Starts from the better of the input order and a nearest-neighbour tour, then applies
+    2-opt (all segment reversals scored at once over the distance matrix) and Or-opt
+    segment moves until no move improves or the time budget runs out. Waypoints the
+    start cannot reach are kept, in input order, at the end of the tour.
+    """
+    points = [start_position] + [wp['position'] for wp in waypoints]
+    cost = as_cost_matrix(compute_distance_matrix(environment, points, max_workers=max_workers))
+
+    reachable = [i for i in range(1, len(points)) if cost[0, i] < UNREACHABLE_COST]
+    unreachable = [i for i in range(1, len(points)) if cost[0, i] >= UNREACHABLE_COST]
+
+    input_order = np.array([0] + reachable, dtype=np.int64)
+    tour = _TourOptimizer(cost)
+    best = min((input_order, tour.nearest_neighbour(reachable)), key=tour.path_cost)
+    best = tour.improve(best, time.perf_counter() + time_budget)
+
+    input_cost = tour.path_cost(input_order)
+    optimized_cost = tour.path_cost(best)
+    return {
+        'waypoints': [waypoints[i - 1] for i in best[1:].tolist() + unreachable],
+        'input_cost': input_cost,
+        'optimized_cost': optimized_cost,
+        'battery_saved': input_cost - optimized_cost,
+        'unreachable': [waypoints[i - 1] for i in unreachable]
+    }
+
+
+class _TourOptimizer:
+    """Open-path 2-opt / Or-opt over a cost matrix; paths are index arrays starting at node 0"""
+
+    def __init__(self, cost):
+        # Extra zero-cost "end" node lets the open path be scored like a closed one
+        size = len(cost)
+        self.end = size
+        self.cost = np.zeros((size + 1, size + 1), dtype=np.int64)
+        self.cost[:size, :size] = cost
+
+    def path_cost(self, path):
+        return int(self.cost[path[:-1], path[1:]].sum())
+
+    def nearest_neighbour(self, nodes):
+        """Greedy tour: always fly to the closest unvisited waypoint"""
+        remaining = np.array(nodes, dtype=np.int64)
+        path = [0]
+        while remaining.size:
+            k = int(np.argmin(self.cost[path[-1], remaining]))
+            path.append(int(remaining[k]))
+            remaining = np.delete(remaining, k)
+        return np.array(path, dtype=np.int64)
+
+    def improve(self, path, deadline):
+        """Apply best-improvement 2-opt and Or-opt moves until a local optimum or the deadline"""
+        while time.perf_counter() < deadline:
+            improved = self._two_opt(path)
+            if improved is None:
+                improved = self._or_opt(path)
+            if improved is None:
+                break
+            path = improved
+        return path
+
+    def _two_opt(self, path):
+        """Reverse the path segment [i, j] with the most negative delta, if any"""
+        n = len(path) - 1
+        if n < 2:
+            return None
+
+        extended = np.append(path, self.end)
+        previous = extended[:n]       # path[i - 1] for i = 1..n
+        current = extended[1:n + 1]   # path[i]
+        following = extended[2:]      # path[j + 1] (end node past the last waypoint)
+
+        # delta[i, j] = c(p[i-1], p[j]) + c(p[i], p[j+1]) - c(p[i-1], p[i]) - c(p[j], p[j+1])
+        delta = (self.cost[previous[:, None], current[None, :]]
+                 + self.cost[current[:, None], following[None, :]]
+                 - self.cost[previous, current][:, None]
+                 - self.cost[current, following][None, :])
+        delta[np.tril_indices(n)] = 0
+
+        i, j = np.unravel_index(np.argmin(delta), delta.shape)
+        if delta[i, j] >= 0:
+            return None
+        improved = path.copy()
+        improved[i + 1:j + 2] = path[i + 1:j + 2][::-1]
+        return improved
+
+    def _or_opt(self, path, max_segment=3):
+        """Move a segment of 1-3 waypoints to the best other gap, if that shortens the path"""
+        n = len(path) - 1
+        extended = np.append(path, self.end)
+        best_gain, best_move = 0, None
+
+        for length in range(1, min(max_segment, n) + 1):
+            for first in range(1, n - length + 2):
+                last = first + length - 1
+                before, after = extended[first - 1], extended[last + 1]
+                removal_gain = (self.cost[before, extended[first]] + self.cost[extended[last], after]
+                                - self.cost[before, after])
+
+                # Gaps (k, k+1) of the path with the segment removed
+                rest = np.concatenate((extended[:first], extended[last + 1:]))
+                gap_from, gap_to = rest[:-1], rest[1:]
+                insertion = (self.cost[gap_from, extended[first]] + self.cost[extended[last], gap_to]
+                             - self.cost[gap_from, gap_to])
+                insertion[first - 1] = removal_gain  # Re-inserting in place is no move
+
+                k = int(np.argmin(insertion))
+                gain = removal_gain - insertion[k]
+                if gain > best_gain:
+                    best_gain, best_move = gain, (first, last, k)
+
+        if best_move is None:
+            return None
+        first, last, k = best_move
+        segment = path[first:last + 1]
+        rest = np.concatenate((path[:first], path[last + 1:]))
+        return np.concatenate((rest[:k + 1], segment, rest[k + 1:]))
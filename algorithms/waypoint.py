@@ -1,21 +1,67 @@
+import copy
+
 import numpy as np
 
+from algorithms.astar import AStarPlanner
+from algorithms.dstar_lite import DStarLitePlanner
+from algorithms.route_cache import RouteCache, shared_route_cache
+from models.nfz_index import segment_intersects_rectangle
+from utils.event_log import event_log, DEBUG, INFO, WARNING
+
 
 class WaypointNavigator:
     """Handles drone navigation between waypoints with proper rectangle avoidance"""
 
-    def __init__(self, grid_size, start_position, environment=None, drone=None):
+    # Route planning modes: the original four-strategy cascade, optimal A* search,
+    # gradient descent over the environment's cached per-waypoint distance fields, or
+    # incremental D* Lite that repairs its search as time-activated NFZs change
+    MODES = ('cascade', 'astar', 'field', 'dstar')
+
+    # Conflict-free legs that fail this many steps in a row are given up (like a blocked waypoint)
+    MAX_HOLD_STEPS = 10
+
+    def __init__(self, grid_size, start_position, environment=None, drone=None, mode='cascade',
+                 route_cache=shared_route_cache):
+        if mode not in self.MODES:
+            raise ValueError(f"Unknown navigator mode '{mode}', expected one of {self.MODES}")
+        if mode != 'cascade' and environment is None:
+            raise ValueError(f"Navigator mode '{mode}' requires an environment")
+
         self.drone = drone
         self.environment = environment
         self.grid_size = grid_size
         self.rows, self.cols = grid_size
+        self.mode = mode
+        self.planner = AStarPlanner(environment) if mode == 'astar' else None
+        self.route_cache = route_cache  # None disables caching
         self.bypass_route = []
         self.current_bypass_index = 0
         self.visited_positions = set()
         self.stuck_count = 0
+        self.dstar = None  # DStarLitePlanner for the current waypoint ('dstar' mode)
+        self.environment_version = environment.version if environment is not None else None
+
+        # Space-time reservation mode (set by SimulationEngine): the engine plans each leg
+        # against the shared ReservationTable and the navigator replays it step by step
+        self.reservations = None
+        self.reserved_route = []
+        self.reserved_index = 0
+        self.hold_steps = 0
+        self.finished = False
 
     def get_next_position(self, current_position):
         """Get next position with proper NFZ avoidance"""
+        if self.reservations is not None:
+            return self._follow_reserved_route(current_position)
+        if self.mode == 'dstar':
+            return self._get_dstar_position(current_position)
+
+        # NFZs changed since the bypass was planned - it may now cross one
+        if self.environment is not None and self.environment.version != self.environment_version:
+            self.environment_version = self.environment.version
+            self.bypass_route = []
+            self.current_bypass_index = 0
+
         # Track visited positions to detect loops
         self.visited_positions.add(current_position)
         if len(self.visited_positions) > 20:
@@ -36,33 +82,121 @@ class WaypointNavigator:
         if next_pos in self.visited_positions:
             self.stuck_count += 1
             if self.stuck_count > 3:
-                print("🔄 Detected stuck condition, using direct pathfinding")
+                if event_log.level <= WARNING:
+                    event_log.emit('nav.stuck', self.drone.drone_id, WARNING, position=current_position)
                 return self._get_direct_safe_path(current_position, next_pos)
         else:
             self.stuck_count = 0
 
         # Check if path is blocked by any NFZ
         if not self.environment.is_valid_position(next_pos):
-            print(f"🚧 Path blocked to {next_pos}, calculating safe route...")
+            if event_log.level <= INFO:
+                event_log.emit('nav.blocked', self.drone.drone_id, INFO, position=next_pos)
             safe_route = self._find_safe_route_to_waypoint(current_position)
             if safe_route:
                 self.bypass_route = safe_route
                 self.current_bypass_index = 1
                 return safe_route[0]
             else:
-                print("🚨 No safe route found, moving to next waypoint")
+                if event_log.level <= WARNING:
+                    event_log.emit('nav.no_route', self.drone.drone_id, WARNING, position=current_position)
                 self.drone.current_waypoint_index += 1
                 return self.get_next_position(current_position)
 
         return next_pos
 
+    def _get_dstar_position(self, current_position):
+        """Next step from the D* Lite planner, which repairs itself when NFZs change"""
+        if self.drone.get_next_waypoint_position(current_position) is None:
+            return None
+
+        goal = self.drone.waypoints[self.drone.current_waypoint_index]
+        if self.dstar is None or self.dstar.goal != goal:
+            self.dstar = DStarLitePlanner(self.environment, goal, current_position)
+        next_pos = self.dstar.next_step(current_position)
+        if next_pos is None:
+            if event_log.level <= WARNING:
+                event_log.emit('nav.no_route', self.drone.drone_id, WARNING, position=current_position)
+            self.drone.current_waypoint_index += 1
+            return self._get_dstar_position(current_position)
+        return next_pos
+
+    def needs_leg(self):
+        """Reservation mode: the current reserved leg is used up and the mission isn't over"""
+        return not self.finished and self.reserved_index >= len(self.reserved_route)
+
+    def next_leg_goal(self, current_position):
+        """Reservation mode: the waypoint to plan toward next, or None once all are visited"""
+        while self.drone.get_next_waypoint_position(current_position) is not None:
+            goal = self.drone.waypoints[self.drone.current_waypoint_index]
+            if self.environment.is_valid_position(goal):
+                return goal
+            if event_log.level <= WARNING:
+                event_log.emit('nav.no_route', self.drone.drone_id, WARNING, position=current_position)
+            self.drone.current_waypoint_index += 1
+        self.finished = True
+        return None
+
+    def assign_leg(self, route, current_position):
+        """Reservation mode: take a reserved route, or hold position when planning failed"""
+        if route:
+            self.reserved_route = route
+            self.reserved_index = 0
+            self.hold_steps = 0
+            return
+
+        self.hold_steps += 1
+        if event_log.level <= INFO:
+            event_log.emit('nav.holding', self.drone.drone_id, INFO, position=current_position)
+        if self.hold_steps > self.MAX_HOLD_STEPS:
+            if event_log.level <= WARNING:
+                event_log.emit('nav.no_route', self.drone.drone_id, WARNING, position=current_position)
+            self.drone.current_waypoint_index += 1
+            self.hold_steps = 0
+
+    def _follow_reserved_route(self, current_position):
+        """Replay the reserved leg; hold in place while waiting for the next one"""
+        if self.reserved_index < len(self.reserved_route):
+            next_pos = self.reserved_route[self.reserved_index]
+            if not self.environment.is_valid_position(next_pos):
+                # An NFZ switched on across the leg - hold here and replan next step
+                self.reserved_index = len(self.reserved_route)
+                self.reservations.park(self.drone.drone_id, current_position, self.reservations.step)
+                return current_position
+            self.reserved_index += 1
+            return next_pos
+        if self.finished:
+            return None
+        return current_position
+
     def _find_safe_route_to_waypoint(self, current_position):
         """Find a complete safe route to the current waypoint"""
         if self.drone.current_waypoint_index >= len(self.drone.waypoints):
             return None
 
         target_waypoint = self.drone.waypoints[self.drone.current_waypoint_index]
-        print(f"🎯 Finding safe route from {current_position} to waypoint {target_waypoint}")
+        if event_log.level <= DEBUG:
+            event_log.emit('nav.route_search', self.drone.drone_id, DEBUG,
+                           start=current_position, goal=target_waypoint)
+
+        # Routes depend only on (start, goal, NFZ layout), so drones can share them
+        if self.route_cache is None or self.environment is None:
+            return self._plan_route(current_position, target_waypoint)
+
+        key = RouteCache.make_key(self.environment, self.mode, current_position, target_waypoint)
+        route = self.route_cache.get(key)
+        if route is None:
+            route = self._plan_route(current_position, target_waypoint) or []
+            self.route_cache.put(key, route)
+        return route or None
+
+    def _plan_route(self, current_position, target_waypoint):
+        """Plan a route with the configured mode, or None if no safe route exists"""
+        if self.mode == 'astar':
+            # Optimal single-pass search - no strategy cascade or route length caps
+            return self.planner.plan(current_position, target_waypoint) or None
+        if self.mode == 'field':
+            return self.environment.get_route_from_field(current_position, target_waypoint) or None
 
         # Try different strategies to reach the waypoint
         strategies = [
@@ -79,6 +213,51 @@ class WaypointNavigator:
 
         return None
 
+    def snapshot(self):
+        """Capture bypass progress and loop-detection state"""
+        return {
+            'bypass_route': tuple(self.bypass_route),
+            'current_bypass_index': self.current_bypass_index,
+            'visited_positions': frozenset(self.visited_positions),
+            'stuck_count': self.stuck_count,
+            'reserved_route': tuple(self.reserved_route),
+            'reserved_index': self.reserved_index,
+            'hold_steps': self.hold_steps,
+            'environment_version': self.environment_version,
+            'finished': self.finished
+        }
+
+    def restore(self, snapshot):
+        """Return to a state captured by snapshot()"""
+        self.bypass_route = list(snapshot['bypass_route'])
+        self.current_bypass_index = snapshot['current_bypass_index']
+        self.visited_positions = set(snapshot['visited_positions'])
+        self.stuck_count = snapshot['stuck_count']
+        self.reserved_route = list(snapshot['reserved_route'])
+        self.reserved_index = snapshot['reserved_index']
+        self.hold_steps = snapshot['hold_steps']
+        self.environment_version = snapshot['environment_version']  # Bypass stays valid for these NFZs
+        self.dstar = None
+        self.finished = snapshot['finished']
+
+    def fork(self, drone, environment):
+        """Copy of this navigator steering another drone through another (forked) environment"""
+        forked = copy.copy(self)
+        forked.drone = drone
+        forked.environment = environment
+        forked.planner = AStarPlanner(environment) if self.mode == 'astar' else None
+        forked.dstar = None  # Rebuilt for the fork's environment on its next step
+        forked.restore(self.snapshot())
+        return forked
+
+    def get_planner_stats(self):
+        """Return A* / D* Lite planner counters (nodes expanded, planning time), or None in cascade mode"""
+        if self.dstar is not None:
+            return self.dstar.get_stats()
+        if self.planner is None:
+            return None
+        return self.planner.get_stats()
+
     def _try_direct_approach(self, current_pos, target_pos):
         """Try to find a direct path avoiding NFZs - Optimized with NumPy"""
         route = []
@@ -114,11 +293,8 @@ class WaypointNavigator:
         route = []
         current = current_pos
 
-        # Find all NFZs between current and target
-        blocking_nfzs = []
-        for nfz in self.environment.nfz_rectangles:
-            if self._line_intersects_rectangle(current_pos, target_pos, nfz):
-                blocking_nfzs.append(nfz)
+        # Find all NFZs between current and target (spatial index query, not a full scan)
+        blocking_nfzs = self.environment.nfz_rectangles_on_segment(current_pos, target_pos)
 
         if not blocking_nfzs:
             return []
@@ -275,19 +451,8 @@ class WaypointNavigator:
         return best_move
 
     def _line_intersects_rectangle(self, start, end, nfz):
-        """Check if line from start to end intersects the NFZ rectangle"""
-        start_row, start_col = start
-        end_row, end_col = end
-        top_row, left_col = nfz['top_left']
-        bottom_row, right_col = nfz['bottom_right']
-
-        # Check if either endpoint is inside rectangle
-        if (top_row <= start_row <= bottom_row and left_col <= start_col <= right_col):
-            return True
-        if (top_row <= end_row <= bottom_row and left_col <= end_col <= right_col):
-            return True
-
-        return False
+        """Check if line from start to end intersects the NFZ rectangle (anywhere, not just at endpoints)"""
+        return segment_intersects_rectangle(start, end, *nfz['top_left'], *nfz['bottom_right'])
 
     def _is_route_valid(self, route):
         """Check if all positions in the route are valid"""
@@ -3,18 +3,28 @@ from models.environment import SearchEnvironment
 from utils.data_loader import load_mission_data, load_targets_data, load_nfz_data, load_waypoints_data, \
     load_drone_starts
 from algorithms.waypoint import WaypointNavigator
+from algorithms.allocation import allocate_waypoints
+from algorithms.tour import optimize_tour
 from simulation.engine import SimulationEngine
 from visualization.plotter import SimulationPlotter
+from utils.event_log import event_log, ConsoleSink, DEBUG
+from utils.scenario_bundle import load_fresh_scenario
 
 
 def main():
     """Main application for drone waypoint navigation simulation"""
+    # Show every simulation event on the console
+    event_log.configure(level=DEBUG, sinks=[ConsoleSink()])
+
     print("\n" + "🚁" * 10)
     print("Rescue Drone Waypoint Navigation")
     print("🚁" * 10)
 
+    # Use the compiled scenario bundle when it is up to date, else parse the CSVs
+    scenario = load_fresh_scenario('data')
+
     # Load mission configuration
-    mission = load_mission_data('data/missions.csv')
+    mission = scenario.mission() if scenario else load_mission_data('data/missions.csv')
     if not mission:
         return
 
@@ -24,7 +34,7 @@ def main():
     print(f"Targets: {mission['targets_to_find']}")
 
     # load drone config
-    drone_starts = load_drone_starts('data/drone_starts.csv')
+    drone_starts = scenario.drone_starts() if scenario else load_drone_starts('data/drone_starts.csv')
     if not drone_starts:
         # Fallback to single drone
         drone_starts = [{'drone_id': 1, 'start_position': mission['start_position'], 'color': 'blue'}]
@@ -34,9 +44,12 @@ def main():
         print(f"  - Drone {drone_config['drone_id']}: {drone_config['start_position']} ({drone_config['color']})")
 
     # Load mission data
-    targets = load_targets_data('data/targets.csv')
-    nfz_rectangles = load_nfz_data('data/nfz.csv')
-    waypoints = load_waypoints_data('data/waypoints.csv')
+    if scenario:
+        targets, nfz_rectangles, waypoints = scenario.targets(), scenario.nfz_rectangles(), scenario.waypoints()
+    else:
+        targets = load_targets_data('data/targets.csv')
+        nfz_rectangles = load_nfz_data('data/nfz.csv')
+        waypoints = load_waypoints_data('data/waypoints.csv')
 
     print(f"\nTargets: {len(targets)} | NFZs: {len(nfz_rectangles)} | Waypoints: {len(waypoints)}")
 
@@ -48,16 +61,27 @@ def main():
 
     # === STEP 6: CREATE DRONES (BUT USE ONLY FIRST ONE) ===
     # Initialize environment and drones
-    environment = SearchEnvironment(grid_size=mission['grid_size'])
+    if scenario:
+        environment = scenario.build_environment()
+    else:
+        environment = SearchEnvironment(grid_size=mission['grid_size'])
+
+        environment.add_targets(
+            [target['position'] for target in targets],
+            target_ids=[target['target_id'] for target in targets],
+            priorities=[target['priority'] for target in targets]
+        )
 
-    for target in targets:
-        environment.add_target(target['position'])
+        for nfz in nfz_rectangles:
+            environment.add_nfz_rectangle(nfz)
 
-    for nfz in nfz_rectangles:
-        environment.add_nfz_rectangle(nfz)
+    # Split waypoints between drones with NFZ-aware routing
+    allocation = allocate_waypoints(environment, drone_starts, waypoints) if waypoints else None
+    if allocation and allocation['unreachable']:
+        print(f"  - {len(allocation['unreachable'])} waypoints unreachable from every drone start")
 
     drones = []
-    for i, drone_config in enumerate(drone_starts):
+    for drone_config in drone_starts:
         drone = RescueDrone(
             start_position=drone_config['start_position'],
             battery=400,
@@ -65,18 +89,13 @@ def main():
             color=drone_config['color']
         )
 
-        if waypoints:
-            # Split waypoints between drones
-            if len(drone_starts) == 2:  # For 2 drones
-                if i == 0:  # Drone 1 gets first half
-                    drone_waypoints = waypoints[:len(waypoints) // 2]  # First 6 waypoints
-                else:  # Drone 2 gets second half
-                    drone_waypoints = waypoints[len(waypoints) // 2:]  # Last 6 waypoints
-            else:
-                drone_waypoints = waypoints  # Fallback for single drone
-
+        if allocation:
+            # Order the drone's waypoints into a short obstacle-aware tour
+            tour = optimize_tour(environment, drone.position, allocation['assignments'][drone.drone_id])
+            drone_waypoints = tour['waypoints']
             drone.set_waypoints(drone_waypoints)
-            print(f"  - Drone {drone.drone_id} assigned {len(drone_waypoints)} waypoints")
+            print(f"  - Drone {drone.drone_id} assigned {len(drone_waypoints)} waypoints "
+                  f"(tour saves {tour['battery_saved']} battery)")
 
         drones.append(drone)
 
@@ -97,7 +116,7 @@ def main():
         navigators.append(navigator)
 
     simulation = SimulationEngine(drones, environment, navigators)
-    plotter = SimulationPlotter(grid_size=mission['grid_size'])
+    plotter = SimulationPlotter(grid_size=mission['grid_size'], live=True)
 
     # Execute simulation
     print(f"\n🚀 Starting Mission")
@@ -1,12 +1,15 @@
 import numpy as np
 
+from utils.event_log import event_log, DEBUG, INFO
+
 
 class RescueDrone:
     """Autonomous drone for waypoint navigation and target rescue operations"""
 
-    def __init__(self, start_position=(0, 0), battery=2000, drone_id=1, color='blue'):
+    def __init__(self, start_position=(0, 0), battery=2000, drone_id=1, color='blue', sensor=None):
         self.drone_id = drone_id
         self.color = color
+        self.sensor = sensor  # SensorFootprint, or None to scan only the occupied cell
         self.position = start_position  # Keep as tuple
         self.battery = battery
         self.path_history = [start_position]
@@ -29,18 +32,59 @@ class RescueDrone:
         self.total_distance += distance
         self.battery -= distance
 
-        print(f"🚁 Drone {self.drone_id} moved to {new_position} | Battery: {self.battery}")
+        if event_log.level <= DEBUG:
+            event_log.emit('drone.move', self.drone_id, DEBUG, position=new_position, battery=self.battery)
         return True
 
     def scan_area(self, environment):
-        """Scan current position for targets and collect if found"""
+        """Scan current position (or sensor footprint) for targets and collect if found"""
+        if self.sensor is not None:
+            return self._scan_footprint(environment)
+
         if environment.has_target(self.position):
-            print(f"🎯 Drone {self.drone_id} found target at {self.position}")
+            if event_log.level <= INFO:
+                event_log.emit('drone.target_found', self.drone_id, INFO, position=self.position)
             self.found_targets.append(self.position)
             environment.remove_target(self.position)
             return True
         return False
 
+    def _scan_footprint(self, environment):
+        """Collect every target the sensor detects around the current position"""
+        found = False
+        for target in self.sensor.scan(environment, self.position):
+            if environment.remove_target(target):
+                if event_log.level <= INFO:
+                    event_log.emit('drone.target_found', self.drone_id, INFO, position=target)
+                self.found_targets.append(target)
+                found = True
+        return found
+
+    def snapshot(self):
+        """Capture the drone's mutable state (immutable copies, safe to share between forks)"""
+        return {
+            'position': self.position,
+            'battery': self.battery,
+            'path_history': tuple(self.path_history),
+            'found_targets': tuple(self.found_targets),
+            'waypoints': tuple(self.waypoints),
+            'current_waypoint_index': self.current_waypoint_index,
+            'total_distance': self.total_distance,
+            'sensor_rng': self.sensor.rng.bit_generator.state if self.sensor is not None else None
+        }
+
+    def restore(self, snapshot):
+        """Return to a state captured by snapshot()"""
+        self.position = snapshot['position']
+        self.battery = snapshot['battery']
+        self.path_history = list(snapshot['path_history'])
+        self.found_targets = list(snapshot['found_targets'])
+        self.waypoints = list(snapshot['waypoints'])
+        self.current_waypoint_index = snapshot['current_waypoint_index']
+        self.total_distance = snapshot['total_distance']
+        if self.sensor is not None and snapshot['sensor_rng'] is not None:
+            self.sensor.rng.bit_generator.state = snapshot['sensor_rng']
+
     def check_battery_status(self):
         """Return current battery status level"""
         if self.battery <= 0:
@@ -59,14 +103,17 @@ class RescueDrone:
     def get_next_waypoint_position(self, current_position):
         """Calculate next position toward current waypoint"""
         if self.current_waypoint_index >= len(self.waypoints):
-            print("✅ Mission complete - all waypoints visited")
+            if event_log.level <= INFO:
+                event_log.emit('drone.waypoints_complete', self.drone_id, INFO)
             return None
 
         target = self.waypoints[self.current_waypoint_index]
 
         # Advance to next waypoint if current reached
         if current_position == target:
-            print(f"📍 Reached waypoint {self.current_waypoint_index + 1}")
+            if event_log.level <= INFO:
+                event_log.emit('drone.waypoint_reached', self.drone_id, INFO,
+                               waypoint_number=self.current_waypoint_index + 1, position=target)
             self.current_waypoint_index += 1
             return self.get_next_waypoint_position(current_position)
 
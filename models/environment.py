@@ -1,28 +1,143 @@
+import copy
+import heapq
+import itertools
+from collections import OrderedDict
+
 import numpy as np
 
+from models.nfz_index import NFZIndex
+
+# Set bits per byte value, for popcounts over the packed NFZ occupancy
+_POPCOUNT = np.array([bin(value).count('1') for value in range(256)], dtype=np.uint8)
+
 
 class SearchEnvironment:
     """Manages the simulation environment including grid, targets, and No-Fly Zones"""
 
-    def __init__(self, grid_size=(20, 20)):
+    # Default memory budget for cached BFS distance fields (int32, one per goal)
+    DEFAULT_DISTANCE_FIELD_BUDGET = 64 * 1024 * 1024
+
+    # Unique id per instance so caches never confuse two environments
+    _instance_ids = itertools.count(1)
+
+    # Versions are unique across all environments, so forks that share an
+    # environment_id still get distinct cache keys once their NFZs diverge
+    _versions = itertools.count(1)
+
+    def __init__(self, grid_size=(20, 20), distance_field_budget=DEFAULT_DISTANCE_FIELD_BUDGET):
         self.grid_size = grid_size
         self.rows, self.cols = grid_size
+        self.environment_id = next(SearchEnvironment._instance_ids)
+        self.version = 0  # Bumped on every NFZ change so derived routes can be invalidated
 
         # NumPy-optimized data structures
         self.nfz_mask = np.zeros(grid_size, dtype=bool)  # True where NFZs exist
-        self.targets = []  # Keep as list for compatibility, but could use NumPy later
+
+        # Bit-packed copy of nfz_mask (8 cells per byte, little-endian bits) for compact
+        # row/column access, plus NFZ statistics maintained as rectangles are added
+        self.nfz_bits = np.zeros((self.rows, (self.cols + 7) // 8), dtype=np.uint8)
+        self.nfz_cells = 0
+        self._nfz_bounds = None  # (min_row, min_col, max_row, max_col) of covered cells
+
+        # Target index: bitmap for O(1) lookups plus per-position CSV metadata
+        self.target_mask = np.zeros(grid_size, dtype=bool)
+        self._target_info = {}  # (row, col) -> (target_id, priority)
+
+        # Summed-area table over target_mask for O(1) window counts (built lazily)
+        self._target_sat = None
+        self._target_sat_removals = 0  # Targets removed since the table was built
 
         # Backward compatibility
         self.nfz_rectangles = []  # Keep for reference, but use mask for calculations
+        self.nfz_index = NFZIndex(grid_size)  # Bucket grid over nfz_rectangles (ids = list index)
+
+        # Time-activated NFZs: rectangles with active_from / active_until steps are
+        # switched on and off by update_nfz_schedule(); nfz_changes lets incremental
+        # planners repair only the regions that changed
+        self.nfz_step = 0
+        self._nfz_schedule = []  # Heap of (step, sequence, action, nfz_data)
+        self._nfz_schedule_sequence = itertools.count()
+        self.nfz_changes = []  # (version, (top, left, bottom, right))
+
+        # Content hash of the compiled scenario this layout was loaded from (see
+        # load_nfz_layout); cache keys use it until the layout is changed
+        self.content_hash = None
+        self._content_version = None
 
-    def add_target(self, position):
-        """Add target to environment at specified position"""
-        self.targets.append(position)
+        # Per-goal BFS distance fields, kept in LRU order within the memory budget
+        self.distance_field_budget = distance_field_budget
+        self._distance_fields = OrderedDict()
+
+    @property
+    def targets(self):
+        """Remaining target positions in insertion order (builds a list - prefer the index methods)"""
+        return list(self._target_info)
+
+    def add_target(self, position, target_id=None, priority=None):
+        """Add target to environment at specified position (ValueError if outside the grid)"""
+        position = (int(position[0]), int(position[1]))
+        if not (0 <= position[0] < self.rows and 0 <= position[1] < self.cols):
+            raise ValueError(f"Target position {position} is outside the {self.rows}x{self.cols} grid")
+        self._writable('target_mask')[position] = True
+        self._target_info[position] = (target_id, priority)
+        self._target_sat = None
+
+    def add_targets(self, positions, target_ids=None, priorities=None):
+        """Bulk-add targets from an (n, 2) array of positions (ValueError if any is outside the grid)"""
+        positions = np.asarray(positions, dtype=np.int64).reshape(-1, 2)
+        check_target_bounds(positions, self.rows, self.cols)
+        count = len(positions)
+        target_ids = [None] * count if target_ids is None else _as_list(target_ids)
+        priorities = [None] * count if priorities is None else _as_list(priorities)
+
+        self._writable('target_mask')[positions[:, 0], positions[:, 1]] = True
+        self._target_info.update(zip(map(tuple, positions.tolist()), zip(target_ids, priorities)))
+        self._target_sat = None
+
+    def remove_targets(self, positions):
+        """Bulk-remove targets; returns a boolean array marking which positions held a target"""
+        positions = np.asarray(positions, dtype=np.int64).reshape(-1, 2)
+        removed = self.target_mask[positions[:, 0], positions[:, 1]].copy()
+        hits = positions[removed]
+        if len(hits):
+            self._writable('target_mask')[hits[:, 0], hits[:, 1]] = False
+        for position in map(tuple, hits.tolist()):
+            self._target_info.pop(position, None)
+        self._target_sat_removals += len(hits)
+        return removed
+
+    def get_target_info(self, position):
+        """Return the stored target_id/priority for a target position, or None"""
+        info = self._target_info.get(tuple(position))
+        if info is None:
+            return None
+        return {'target_id': info[0], 'priority': info[1]}
+
+    def count_targets(self):
+        """Number of targets remaining"""
+        return len(self._target_info)
 
     def add_nfz_rectangle(self, nfz_data):
-        """Add No-Fly Zone rectangle to environment and update NFZ mask"""
-        # Add to list for backward compatibility
+        """Add No-Fly Zone rectangle to environment and update NFZ mask
+
+        Rectangles with a future 'active_from' step are held back until
+        update_nfz_schedule() reaches it; an 'active_until' step schedules removal.
+        """
+        active_from, active_until = nfz_data.get('active_from'), nfz_data.get('active_until')
+        if active_from is not None and active_from > self.nfz_step:
+            self._schedule_nfz(active_from, 'activate', nfz_data)
+            return
+        if active_until is not None:
+            if active_until <= self.nfz_step:
+                return  # Already expired
+            self._schedule_nfz(active_until, 'deactivate', nfz_data)
+
+        # Add to list for backward compatibility, and to the spatial index
         self.nfz_rectangles.append(nfz_data)
+        if self.nfz_index.frozen:
+            self.nfz_index = self.nfz_index.copy()
+        self.nfz_index.insert(len(self.nfz_rectangles) - 1,
+                              *nfz_data['top_left'], *nfz_data['bottom_right'])
 
         # Update NumPy mask for fast collision detection
         top_row, left_col = nfz_data['top_left']
@@ -34,8 +149,218 @@ class SearchEnvironment:
         bottom_row = min(self.rows - 1, bottom_row)
         right_col = min(self.cols - 1, right_col)
 
-        # Mark NFZ area in the mask
-        self.nfz_mask[top_row:bottom_row + 1, left_col:right_col + 1] = True
+        # Mark NFZ area in the mask, counting only cells no earlier NFZ covered
+        if top_row <= bottom_row and left_col <= right_col:
+            area = self.nfz_mask[top_row:bottom_row + 1, left_col:right_col + 1]
+            self.nfz_cells += area.size - int(np.count_nonzero(area))
+            self._writable('nfz_mask')[top_row:bottom_row + 1, left_col:right_col + 1] = True
+            self._update_nfz_bits(top_row, left_col, bottom_row, right_col)
+            if self._nfz_bounds is None:
+                self._nfz_bounds = (top_row, left_col, bottom_row, right_col)
+            else:
+                min_row, min_col, max_row, max_col = self._nfz_bounds
+                self._nfz_bounds = (min(min_row, top_row), min(min_col, left_col),
+                                    max(max_row, bottom_row), max(max_col, right_col))
+
+        # Mask changed - every cached distance field and route is stale
+        self._nfz_changed(top_row, left_col, bottom_row, right_col)
+
+    def remove_nfz_rectangle(self, nfz_data):
+        """Remove an active NFZ rectangle (matched by identity); returns False if it isn't active"""
+        index = next((i for i, nfz in enumerate(self.nfz_rectangles) if nfz is nfz_data), None)
+        if index is None:
+            return False
+        del self.nfz_rectangles[index]
+
+        # Ids are list positions, so the index is rebuilt (removals are rare)
+        self.nfz_index = NFZIndex(self.grid_size, self.nfz_index.bucket_size)
+        for rect_id, nfz in enumerate(self.nfz_rectangles):
+            self.nfz_index.insert(rect_id, *nfz['top_left'], *nfz['bottom_right'])
+
+        top_row, left_col = max(0, nfz_data['top_left'][0]), max(0, nfz_data['top_left'][1])
+        bottom_row = min(self.rows - 1, nfz_data['bottom_right'][0])
+        right_col = min(self.cols - 1, nfz_data['bottom_right'][1])
+        if top_row <= bottom_row and left_col <= right_col:
+            # Clear the area, then repaint whatever other NFZs still cover inside it
+            mask = self._writable('nfz_mask')
+            area = mask[top_row:bottom_row + 1, left_col:right_col + 1]
+            covered_before = int(np.count_nonzero(area))
+            area[:] = False
+            for rect_id in self.nfz_index.query_window(top_row, left_col, bottom_row, right_col):
+                top, left, bottom, right = self.nfz_index.bounds[rect_id]
+                mask[max(top, top_row):min(bottom, bottom_row) + 1, max(left, left_col):min(right, right_col) + 1] = True
+            self.nfz_cells += int(np.count_nonzero(area)) - covered_before
+            self._update_nfz_bits(top_row, left_col, bottom_row, right_col)
+
+            bounds = list(self.nfz_index.bounds.values())
+            self._nfz_bounds = (min(b[0] for b in bounds), min(b[1] for b in bounds),
+                                max(b[2] for b in bounds), max(b[3] for b in bounds)) if bounds else None
+
+        self._nfz_changed(top_row, left_col, bottom_row, right_col)
+        return True
+
+    def load_nfz_layout(self, nfz_mask, nfz_bits, nfz_rectangles, content_hash=None):
+        """Adopt a precompiled NFZ layout (e.g. memory-mapped from a scenario bundle) without repainting
+
+        The arrays are used as-is and treated as shared, so the first change copies
+        them. Rectangles whose schedule says they are not active yet are queued
+        exactly as add_nfz_rectangle() would; the mask must hold the active ones.
+        """
+        self.nfz_mask = nfz_mask
+        self.nfz_bits = nfz_bits
+        self.nfz_mask.flags.writeable = False
+        self.nfz_bits.flags.writeable = False
+        self.nfz_rectangles = []
+        self.nfz_index = NFZIndex(self.grid_size, self.nfz_index.bucket_size)
+        for nfz_data in nfz_rectangles:
+            active_from, active_until = nfz_data.get('active_from'), nfz_data.get('active_until')
+            if active_from is not None and active_from > self.nfz_step:
+                self._schedule_nfz(active_from, 'activate', nfz_data)
+                continue
+            if active_until is not None:
+                if active_until <= self.nfz_step:
+                    continue
+                self._schedule_nfz(active_until, 'deactivate', nfz_data)
+            self.nfz_rectangles.append(nfz_data)
+            self.nfz_index.insert(len(self.nfz_rectangles) - 1, *nfz_data['top_left'], *nfz_data['bottom_right'])
+
+        self.nfz_cells = self.count_nfz_in_rows(0, self.rows - 1)
+        bounds = list(self.nfz_index.bounds.values())
+        self._nfz_bounds = (min(b[0] for b in bounds), min(b[1] for b in bounds),
+                            max(b[2] for b in bounds), max(b[3] for b in bounds)) if bounds else None
+        self._nfz_changed(0, 0, self.rows - 1, self.cols - 1)
+        self.content_hash = content_hash
+        self._content_version = self.version
+
+    def update_nfz_schedule(self, step):
+        """Apply NFZ activations/deactivations due by step; returns how many were applied - O(1) if none"""
+        self.nfz_step = step
+        applied = 0
+        while self._nfz_schedule and self._nfz_schedule[0][0] <= step:
+            _, _, action, nfz_data = heapq.heappop(self._nfz_schedule)
+            if action == 'activate':
+                self.add_nfz_rectangle(nfz_data)
+            else:
+                self.remove_nfz_rectangle(nfz_data)
+            applied += 1
+        return applied
+
+    def nfz_changes_since(self, version):
+        """Rectangles (top, left, bottom, right) whose NFZ cells changed after version"""
+        return [region for changed_version, region in self.nfz_changes if changed_version > version]
+
+    def _schedule_nfz(self, step, action, nfz_data):
+        heapq.heappush(self._nfz_schedule, (step, next(self._nfz_schedule_sequence), action, nfz_data))
+
+    def _nfz_changed(self, top_row, left_col, bottom_row, right_col):
+        """New version for a mask change; cached distance fields are dropped"""
+        self.version = next(SearchEnvironment._versions)
+        self._distance_fields.clear()
+        if top_row <= bottom_row and left_col <= right_col:
+            self.nfz_changes.append((self.version, (top_row, left_col, bottom_row, right_col)))
+
+    def _update_nfz_bits(self, top_row, left_col, bottom_row, right_col):
+        """Repack the bytes of nfz_bits that cover the changed rectangle"""
+        first_byte, last_byte = left_col // 8, right_col // 8
+        columns = slice(first_byte * 8, min((last_byte + 1) * 8, self.cols))
+        packed = np.packbits(self.nfz_mask[top_row:bottom_row + 1, columns], axis=1, bitorder='little')
+        self._writable('nfz_bits')[top_row:bottom_row + 1, first_byte:last_byte + 1] = packed
+
+    def nfz_row(self, row):
+        """Bool NFZ occupancy of one grid row, unpacked from nfz_bits"""
+        return np.unpackbits(self.nfz_bits[row], count=self.cols, bitorder='little').view(bool)
+
+    def nfz_column(self, col):
+        """Bool NFZ occupancy of one grid column, read from nfz_bits"""
+        return ((self.nfz_bits[:, col >> 3] >> (col & 7)) & 1).view(bool)
+
+    def count_nfz_in_rows(self, top, bottom):
+        """NFZ cells in the inclusive row band - popcount over the packed rows"""
+        return int(_POPCOUNT[self.nfz_bits[top:bottom + 1]].sum(dtype=np.int64))
+
+    def cache_key(self):
+        """Return a key identifying this environment's current NFZ layout
+
+        While the layout is still the one loaded from a compiled scenario, the key is
+        that scenario's content hash, so every environment (and every run) built from
+        the same bundle shares cached routes.
+        """
+        if self.content_hash is not None and self.version == self._content_version:
+            return (self.content_hash, 0)
+        return (self.environment_id, self.version)
+
+    def nfz_rectangles_on_segment(self, start, end):
+        """NFZ rectangles the straight segment between two cells passes through"""
+        return [self.nfz_rectangles[i] for i in self.nfz_index.query_segment(start, end)]
+
+    def nfz_rectangles_in_window(self, top, left, bottom, right):
+        """NFZ rectangles overlapping the inclusive window"""
+        return [self.nfz_rectangles[i] for i in self.nfz_index.query_window(top, left, bottom, right)]
+
+    def nearest_nfz(self, position, max_distance=None):
+        """Return (nfz rectangle, Manhattan distance) of the closest NFZ, or None"""
+        nearest = self.nfz_index.nearest(position, max_distance)
+        if nearest is None:
+            return None
+        return self.nfz_rectangles[nearest[0]], nearest[1]
+
+    def snapshot(self):
+        """Capture NFZs and targets; the masks are shared copy-on-write rather than copied"""
+        # Freezing the masks makes the next writer (this environment or a fork) copy first
+        self.nfz_mask.flags.writeable = False
+        self.nfz_bits.flags.writeable = False
+        self.target_mask.flags.writeable = False
+        self.nfz_index.frozen = True
+        return {
+            'version': self.version,
+            'nfz_mask': self.nfz_mask,
+            'nfz_bits': self.nfz_bits,
+            'nfz_cells': self.nfz_cells,
+            'nfz_bounds': self._nfz_bounds,
+            'nfz_rectangles': tuple(self.nfz_rectangles),
+            'nfz_index': self.nfz_index,
+            'nfz_step': self.nfz_step,
+            'nfz_schedule': tuple(self._nfz_schedule),
+            'nfz_changes': tuple(self.nfz_changes),
+            'target_mask': self.target_mask,
+            'target_info': dict(self._target_info),
+            'distance_fields': OrderedDict(self._distance_fields)
+        }
+
+    def restore(self, snapshot):
+        """Return to a state captured by snapshot()"""
+        self.version = snapshot['version']
+        self.nfz_mask = snapshot['nfz_mask']
+        self.nfz_bits = snapshot['nfz_bits']
+        self.nfz_cells = snapshot['nfz_cells']
+        self._nfz_bounds = snapshot['nfz_bounds']
+        self.nfz_rectangles = list(snapshot['nfz_rectangles'])
+        self.nfz_index = snapshot['nfz_index']
+        self.nfz_step = snapshot['nfz_step']
+        self._nfz_schedule = list(snapshot['nfz_schedule'])
+        self.nfz_changes = list(snapshot['nfz_changes'])
+        self.target_mask = snapshot['target_mask']
+        self._target_info = dict(snapshot['target_info'])
+        self._target_sat = None
+        self._target_sat_removals = 0
+        self._distance_fields = OrderedDict(snapshot['distance_fields'])
+
+    def fork(self, snapshot=None):
+        """New environment branched from snapshot (default: the current state)
+
+        Keeps this environment_id, so routes cached before the branch point stay shared.
+        """
+        forked = copy.copy(self)
+        forked.restore(snapshot or self.snapshot())
+        return forked
+
+    def _writable(self, name):
+        """Copy-on-write: give this environment its own copy of a mask shared by a snapshot"""
+        array = getattr(self, name)
+        if not array.flags.writeable:
+            array = array.copy()
+            setattr(self, name, array)
+        return array
 
     def is_valid_position(self, position):
         """Check if position is within grid bounds and not in any NFZ - O(1) with NumPy!"""
@@ -49,23 +374,65 @@ class SearchEnvironment:
         return not self.nfz_mask[row, col]
 
     def has_target(self, position):
-        """Check if target exists at specified position"""
-        return position in self.targets
+        """Check if target exists at specified position - O(1) bitmap lookup"""
+        row, col = position
+        return 0 <= row < self.rows and 0 <= col < self.cols and bool(self.target_mask[row, col])
 
     def remove_target(self, position):
         """Remove target from environment when collected"""
-        if position in self.targets:
-            self.targets.remove(position)
+        if self.has_target(position):
+            self._writable('target_mask')[position[0], position[1]] = False
+            self._target_info.pop((position[0], position[1]), None)
+            self._target_sat_removals += 1
             return True
         return False
 
+    def count_targets_in_window(self, top, left, bottom, right):
+        """Upper bound on targets inside the inclusive window - O(1) via summed-area table
+
+        Accepts scalars or equal-length arrays of bounds (clipped to the grid). The
+        count is exact unless targets were removed since the table was built; a zero
+        is always exact, which makes this a constant-time "no target nearby" test.
+        """
+        sat = self._get_target_sat()
+        top = np.clip(top, 0, self.rows)
+        left = np.clip(left, 0, self.cols)
+        bottom = np.clip(np.asarray(bottom) + 1, 0, self.rows)
+        right = np.clip(np.asarray(right) + 1, 0, self.cols)
+        count = sat[bottom, right] - sat[top, right] - sat[bottom, left] + sat[top, left]
+        return count if np.ndim(count) else int(count)
+
+    def any_target_in_window(self, top, left, bottom, right):
+        """Exact test for any target inside the inclusive window"""
+        if self.count_targets_in_window(top, left, bottom, right) == 0:
+            return False
+        if self._target_sat_removals == 0:
+            return True
+        top, left = max(top, 0), max(left, 0)
+        return bool(self.target_mask[top:bottom + 1, left:right + 1].any())
+
+    def target_window(self, top, left, bottom, right):
+        """Bool bitmap (a view) of targets inside the inclusive window"""
+        return self.target_mask[top:bottom + 1, left:right + 1]
+
+    def _get_target_sat(self):
+        """Return the summed-area table, rebuilding it after additions or many removals"""
+        sat = self._target_sat
+        if sat is None or self._target_sat_removals * 4 > sat[-1, -1]:
+            sat = np.zeros((self.rows + 1, self.cols + 1), dtype=np.int64)
+            np.cumsum(self.target_mask, axis=0, out=sat[1:, 1:])
+            np.cumsum(sat[1:, 1:], axis=1, out=sat[1:, 1:])
+            self._target_sat = sat
+            self._target_sat_removals = 0
+        return sat
+
     def get_environment_stats(self):
         """Return environment statistics"""
         return {
             'grid_size': f"{self.rows}x{self.cols}",
-            'targets_remaining': len(self.targets),
+            'targets_remaining': self.count_targets(),
             'nfz_count': len(self.nfz_rectangles),
-            'nfz_coverage': f"{np.sum(self.nfz_mask) / (self.rows * self.cols) * 100:.1f}%"  # New stat!
+            'nfz_coverage': f"{self.nfz_cells / (self.rows * self.cols) * 100:.1f}%"  # O(1), kept up to date
         }
 
     # NEW: NumPy-powered utility methods
@@ -96,22 +463,101 @@ class SearchEnvironment:
         return False
 
     def get_nfz_bounds(self):
-        """Get bounding box of all NFZs (useful for path planning)"""
-        if not np.any(self.nfz_mask):  # No NFZs
+        """Get bounding box of all NFZs (useful for path planning) - O(1), maintained incrementally"""
+        if self._nfz_bounds is None:  # No NFZs
+            return None
+
+        min_row, min_col, max_row, max_col = self._nfz_bounds
+        return {
+            'min_row': min_row,
+            'max_row': max_row,
+            'min_col': min_col,
+            'max_col': max_col
+        }
+
+    # Distance-field cache for O(1) next-step lookups toward fixed goals
+    def get_distance_field(self, goal):
+        """Return int32 grid of shortest 4-connected step counts to goal (-1 = unreachable)"""
+        goal = tuple(goal)
+        field = self._distance_fields.get(goal)
+        if field is not None:
+            self._distance_fields.move_to_end(goal)
+            return field
+
+        field = self.compute_distance_field(goal)
+        self._distance_fields[goal] = field
+
+        # Evict least recently used fields beyond the memory budget (always keep the newest)
+        max_fields = max(1, self.distance_field_budget // field.nbytes)
+        while len(self._distance_fields) > max_fields:
+            self._distance_fields.popitem(last=False)
+        return field
+
+    def get_next_step_toward(self, position, goal):
+        """Return the neighbor one step closer to goal via its distance field, or None"""
+        field = self.get_distance_field(goal)
+        row, col = position
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
             return None
 
-        # Find the bounds of all NFZ areas
-        nfz_rows, nfz_cols = np.where(self.nfz_mask)
-        if len(nfz_rows) == 0:
+        distance = field[row, col]
+        if distance <= 0:
+            return None  # Already at goal or unreachable
+
+        for neighbor in ((row + 1, col), (row - 1, col), (row, col + 1), (row, col - 1)):
+            n_row, n_col = neighbor
+            if 0 <= n_row < self.rows and 0 <= n_col < self.cols and field[n_row, n_col] == distance - 1:
+                return neighbor
+        return None
+
+    def get_route_from_field(self, position, goal):
+        """Follow the distance-field gradient from position to goal (position excluded)"""
+        field = self.get_distance_field(goal)
+        row, col = position
+        if not (0 <= row < self.rows and 0 <= col < self.cols) or field[row, col] < 0:
             return None
 
+        route = []
+        current = tuple(position)
+        for _ in range(int(field[row, col])):
+            current = self.get_next_step_toward(current, goal)
+            route.append(current)
+        return route
+
+    def get_distance_field_stats(self):
+        """Return distance-field cache usage"""
         return {
-            'min_row': np.min(nfz_rows),
-            'max_row': np.max(nfz_rows),
-            'min_col': np.min(nfz_cols),
-            'max_col': np.max(nfz_cols)
+            'fields_cached': len(self._distance_fields),
+            'bytes_used': sum(field.nbytes for field in self._distance_fields.values()),
+            'budget_bytes': self.distance_field_budget
         }
 
+    def compute_distance_field(self, goal):
+        """Breadth-first flood fill from goal over free cells, one vectorized wavefront per distance (uncached)"""
+        field = np.full(self.grid_size, -1, dtype=np.int32)
+        if not self.is_valid_position(goal):
+            return field
+
+        field[goal] = 0
+        frontier_rows = np.array([goal[0]], dtype=np.int64)
+        frontier_cols = np.array([goal[1]], dtype=np.int64)
+        distance = 0
+
+        while frontier_rows.size:
+            distance += 1
+            rows = np.concatenate((frontier_rows + 1, frontier_rows - 1, frontier_rows, frontier_rows))
+            cols = np.concatenate((frontier_cols, frontier_cols, frontier_cols + 1, frontier_cols - 1))
+
+            inside = (rows >= 0) & (rows < self.rows) & (cols >= 0) & (cols < self.cols)
+            rows, cols = rows[inside], cols[inside]
+
+            fresh = (field[rows, cols] < 0) & ~self.nfz_mask[rows, cols]
+            flat = np.unique(rows[fresh] * self.cols + cols[fresh])
+            frontier_rows, frontier_cols = np.divmod(flat, self.cols)
+            field[frontier_rows, frontier_cols] = distance
+
+        return field
+
     # Visualization helper
     def get_environment_grid(self):
         """Return a 2D grid representation for visualization"""
@@ -121,12 +567,20 @@ class SearchEnvironment:
         grid[self.nfz_mask] = 1
 
         # Mark targets as 2
-        for target in self.targets:
-            row, col = target
-            if 0 <= row < self.rows and 0 <= col < self.cols:
-                grid[row, col] = 2
+        grid[self.target_mask] = 2
 
         return grid
 
 
+def check_target_bounds(positions, rows, cols):
+    """Raise ValueError naming the first of an (n, 2) position array that lies outside the grid"""
+    outside = (positions[:, 0] < 0) | (positions[:, 0] >= rows) | (positions[:, 1] < 0) | (positions[:, 1] >= cols)
+    if np.any(outside):
+        first = tuple(positions[np.argmax(outside)].tolist())
+        raise ValueError(f"Target position {first} is outside the {rows}x{cols} grid "
+                         f"({int(np.count_nonzero(outside))} of {len(positions)} targets out of bounds)")
+
 
+def _as_list(values):
+    """Convert an array-like column to a plain Python list"""
+    return values.tolist() if isinstance(values, np.ndarray) else list(values)
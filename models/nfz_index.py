@@ -0,0 +1,198 @@
+import math
+
+
+class NFZIndex:
+    """Uniform bucket grid over NFZ rectangles for segment, nearest and window queries
+
+    Each rectangle id is listed in every bucket its (clipped, inclusive) cell bounds
+    overlap, so a query only looks at the rectangles in the buckets it touches.
+    Rectangle ids are whatever the caller uses - SearchEnvironment passes the index
+    into its nfz_rectangles list.
+    """
+
+    DEFAULT_BUCKET_SIZE = 16
+
+    def __init__(self, grid_size, bucket_size=DEFAULT_BUCKET_SIZE):
+        self.rows, self.cols = grid_size
+        self.bucket_size = bucket_size
+        self.bounds = {}   # rect id -> (top, left, bottom, right)
+        self.buckets = {}  # (bucket_row, bucket_col) -> [rect id, ...]
+        self.frozen = False  # Set while shared by a snapshot; copy() before inserting
+
+    def __len__(self):
+        return len(self.bounds)
+
+    def copy(self):
+        """Independent index with the same rectangles"""
+        index = NFZIndex((self.rows, self.cols), self.bucket_size)
+        index.bounds = dict(self.bounds)
+        index.buckets = {key: list(ids) for key, ids in self.buckets.items()}
+        return index
+
+    def insert(self, rect_id, top, left, bottom, right):
+        """Add a rectangle by inclusive cell bounds (clipped to the grid; empty ones are ignored)"""
+        if self.frozen:
+            raise ValueError("NFZIndex is shared by a snapshot - insert into a copy()")
+        top, left = max(top, 0), max(left, 0)
+        bottom, right = min(bottom, self.rows - 1), min(right, self.cols - 1)
+        if top > bottom or left > right:
+            return
+        self.bounds[rect_id] = (top, left, bottom, right)
+        size = self.bucket_size
+        for bucket_row in range(top // size, bottom // size + 1):
+            for bucket_col in range(left // size, right // size + 1):
+                self.buckets.setdefault((bucket_row, bucket_col), []).append(rect_id)
+
+    def query_window(self, top, left, bottom, right):
+        """Ids of rectangles overlapping the inclusive window, in insertion order"""
+        size = self.bucket_size
+        top, left = max(top, 0), max(left, 0)
+        bottom, right = min(bottom, self.rows - 1), min(right, self.cols - 1)
+        found = set()
+        for bucket_row in range(top // size, bottom // size + 1):
+            for bucket_col in range(left // size, right // size + 1):
+                for rect_id in self.buckets.get((bucket_row, bucket_col), ()):
+                    if rect_id in found:
+                        continue
+                    rect_top, rect_left, rect_bottom, rect_right = self.bounds[rect_id]
+                    if rect_top <= bottom and top <= rect_bottom and rect_left <= right and left <= rect_right:
+                        found.add(rect_id)
+        return sorted(found)
+
+    def query_segment(self, start, end):
+        """Ids of rectangles the straight segment between two cell centres passes through
+
+        Rectangles are treated as the solid union of their cells, so a segment that
+        crosses one without an endpoint inside it is still reported.
+        """
+        found = set()
+        checked = set()
+        for bucket in self._buckets_on_segment(start, end):
+            for rect_id in self.buckets.get(bucket, ()):
+                if rect_id in checked:
+                    continue
+                checked.add(rect_id)
+                if segment_intersects_rectangle(start, end, *self.bounds[rect_id]):
+                    found.add(rect_id)
+        return sorted(found)
+
+    def nearest(self, position, max_distance=None):
+        """Return (rect id, Manhattan distance to its closest cell) of the nearest rectangle, or None
+
+        Searches rings of buckets outward and stops once no unvisited bucket can
+        hold anything closer than the best rectangle found so far.
+        """
+        if not self.bounds:
+            return None
+        row, col = position
+        size = self.bucket_size
+        center_row, center_col = row // size, col // size
+        max_ring = max(self.rows, self.cols) // size + 1
+        if max_distance is not None:
+            max_ring = min(max_ring, max_distance // size + 1)
+
+        best = None
+        checked = set()
+        for ring in range(max_ring + 1):
+            # Every cell of a bucket in this ring is at least this far away
+            if best is not None and best[1] < (ring - 1) * size + 1:
+                break
+            for bucket in _ring(center_row, center_col, ring):
+                for rect_id in self.buckets.get(bucket, ()):
+                    if rect_id in checked:
+                        continue
+                    checked.add(rect_id)
+                    distance = _distance_to_rectangle(row, col, *self.bounds[rect_id])
+                    if best is None or (distance, rect_id) < best[::-1]:
+                        best = (rect_id, distance)
+
+        if best is None or (max_distance is not None and best[1] > max_distance):
+            return None
+        return best
+
+    def _buckets_on_segment(self, start, end):
+        """Buckets crossed by the segment, by a grid traversal over bucket coordinates"""
+        size = self.bucket_size
+        # Work in bucket units; cell (r, c) spans [r - 0.5, r + 0.5] around its centre
+        row0, col0 = (start[0] + 0.5) / size, (start[1] + 0.5) / size
+        row1, col1 = (end[0] + 0.5) / size, (end[1] + 0.5) / size
+        bucket_row, bucket_col = math.floor(row0), math.floor(col0)
+        last_row, last_col = math.floor(row1), math.floor(col1)
+
+        step_row = 1 if row1 > row0 else -1
+        step_col = 1 if col1 > col0 else -1
+        delta_row, delta_col = abs(row1 - row0), abs(col1 - col0)
+        # Parameter t in [0, 1] at which the segment crosses the next bucket boundary
+        if delta_row:
+            next_row = ((bucket_row + (step_row > 0)) - row0) / (row1 - row0)
+            t_delta_row = 1 / delta_row
+        else:
+            next_row = t_delta_row = math.inf
+        if delta_col:
+            next_col = ((bucket_col + (step_col > 0)) - col0) / (col1 - col0)
+            t_delta_col = 1 / delta_col
+        else:
+            next_col = t_delta_col = math.inf
+
+        yield bucket_row, bucket_col
+        remaining = abs(last_row - bucket_row) + abs(last_col - bucket_col)  # Guards float drift
+        while (bucket_row, bucket_col) != (last_row, last_col) and remaining > 0:
+            if next_row < next_col:
+                bucket_row += step_row
+                next_row += t_delta_row
+                remaining -= 1
+            elif next_col < next_row:
+                bucket_col += step_col
+                next_col += t_delta_col
+                remaining -= 1
+            else:
+                # Passing exactly through a bucket corner touches both side buckets
+                yield bucket_row + step_row, bucket_col
+                yield bucket_row, bucket_col + step_col
+                bucket_row += step_row
+                bucket_col += step_col
+                next_row += t_delta_row
+                next_col += t_delta_col
+                remaining -= 2
+            yield bucket_row, bucket_col
+
+
+def segment_intersects_rectangle(start, end, top, left, bottom, right):
+    """True if the segment between two cell centres touches any cell of the inclusive rectangle
+
+    Liang-Barsky clipping against the rectangle's outer edges (cells are unit squares).
+    """
+    row0, col0 = start
+    delta_row, delta_col = end[0] - row0, end[1] - col0
+    t_enter, t_exit = 0.0, 1.0
+    for origin, delta, low, high in ((row0, delta_row, top - 0.5, bottom + 0.5),
+                                     (col0, delta_col, left - 0.5, right + 0.5)):
+        if delta == 0:
+            if origin < low or origin > high:
+                return False
+            continue
+        t_low, t_high = (low - origin) / delta, (high - origin) / delta
+        if t_low > t_high:
+            t_low, t_high = t_high, t_low
+        t_enter, t_exit = max(t_enter, t_low), min(t_exit, t_high)
+        if t_enter > t_exit:
+            return False
+    return True
+
+
+def _distance_to_rectangle(row, col, top, left, bottom, right):
+    """Manhattan distance from a cell to the closest cell of an inclusive rectangle"""
+    return max(top - row, 0, row - bottom) + max(left - col, 0, col - right)
+
+
+def _ring(center_row, center_col, ring):
+    """Bucket keys at Chebyshev distance ring from the centre bucket"""
+    if ring == 0:
+        yield center_row, center_col
+        return
+    for col in range(center_col - ring, center_col + ring + 1):
+        yield center_row - ring, col
+        yield center_row + ring, col
+    for row in range(center_row - ring + 1, center_row + ring):
+        yield row, center_col - ring
+        yield row, center_col + ring
@@ -0,0 +1,62 @@
+import numpy as np
+
+
+class SensorFootprint:
+    """Camera footprint around a drone with a probability-of-detection model"""
+
+    SHAPES = ('square', 'circle')
+
+    def __init__(self, radius=0, shape='square', detection_probability=1.0, edge_probability=None, seed=None):
+        if shape not in self.SHAPES:
+            raise ValueError(f"Unknown sensor shape '{shape}', expected one of {self.SHAPES}")
+        if radius < 0:
+            raise ValueError("Sensor radius must be non-negative")
+
+        self.radius = int(radius)
+        self.shape = shape
+        self.detection_probability = detection_probability
+        self.edge_probability = edge_probability  # None = same probability across the footprint
+        self.rng = np.random.default_rng(seed)
+
+        # Precomputed (2r+1, 2r+1) footprint mask and per-cell detection probabilities
+        offsets = np.arange(-self.radius, self.radius + 1)
+        distance = np.hypot(offsets[:, None], offsets[None, :])
+        if shape == 'circle':
+            self.kernel = distance <= self.radius
+        else:
+            self.kernel = np.ones(distance.shape, dtype=bool)
+
+        if edge_probability is None or self.radius == 0:
+            self.probabilities = np.full(distance.shape, detection_probability, dtype=float)
+        else:
+            # Linear fall-off from the centre to edge_probability at the footprint radius
+            fraction = np.minimum(distance / self.radius, 1.0)
+            self.probabilities = detection_probability + (edge_probability - detection_probability) * fraction
+
+    def window(self, environment, position):
+        """Return the footprint's bounding window (top, left, bottom, right) clipped to the grid"""
+        row, col = position
+        return (max(row - self.radius, 0), max(col - self.radius, 0),
+                min(row + self.radius, environment.rows - 1), min(col + self.radius, environment.cols - 1))
+
+    def scan(self, environment, position):
+        """Return the target positions detected from position (targets are not removed)"""
+        top, left, bottom, right = self.window(environment, position)
+
+        # O(1) summed-area-table rejection - the common case when no target is near
+        if environment.count_targets_in_window(top, left, bottom, right) == 0:
+            return []
+
+        # Single vectorized window query restricted to the footprint shape
+        row, col = position
+        kernel_rows = slice(top - row + self.radius, bottom - row + self.radius + 1)
+        kernel_cols = slice(left - col + self.radius, right - col + self.radius + 1)
+        hits = environment.target_window(top, left, bottom, right) & self.kernel[kernel_rows, kernel_cols]
+        hit_rows, hit_cols = np.nonzero(hits)
+        if hit_rows.size == 0:
+            return []
+
+        # Bernoulli trial per candidate target
+        probabilities = self.probabilities[kernel_rows, kernel_cols][hit_rows, hit_cols]
+        detected = self.rng.random(hit_rows.size) < probabilities
+        return list(zip((hit_rows[detected] + top).tolist(), (hit_cols[detected] + left).tolist()))
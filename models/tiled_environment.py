@@ -0,0 +1,429 @@
+import copy
+import heapq
+import itertools
+
+import numpy as np
+
+from models.environment import SearchEnvironment, check_target_bounds
+from models.nfz_index import NFZIndex
+
+
+class TiledSearchEnvironment:
+    """Sparse SearchEnvironment for very large grids
+
+    The grid is split into fixed-size square tiles. NFZ rectangles stay symbolic:
+    tiles they fully cover are only recorded in a set, and partially covered tiles
+    keep a list of pending rectangles until a query first touches them, at which
+    point a tile-sized bitmap is painted. Empty tiles never allocate anything.
+    Exposes the SearchEnvironment API used by the navigator and engine; the dense
+    grids needed by distance fields, FleetEngine and the distance matrix are not
+    available here.
+    """
+
+    DEFAULT_TILE_SIZE = 256
+
+    def __init__(self, grid_size=(20, 20), tile_size=DEFAULT_TILE_SIZE):
+        self.grid_size = grid_size
+        self.rows, self.cols = grid_size
+        self.tile_size = tile_size
+        self.environment_id = next(SearchEnvironment._instance_ids)
+        self.version = 0  # Bumped on every NFZ change so derived routes can be invalidated
+
+        # NFZs: every rectangle as given, plus its clipped inclusive bounds
+        self.nfz_rectangles = []
+        self._nfz_bounds = []  # (top, left, bottom, right)
+        self.nfz_index = NFZIndex(grid_size)  # Bucket grid over nfz_rectangles (ids = list index)
+
+        # Time-activated NFZs, as in SearchEnvironment
+        self.nfz_step = 0
+        self._nfz_schedule = []  # Heap of (step, sequence, action, nfz_data)
+        self._nfz_schedule_sequence = itertools.count()
+        self.nfz_changes = []  # (version, (top, left, bottom, right))
+
+        # Tile state, keyed by (tile_row, tile_col)
+        self._full_tiles = set()  # Entirely inside an NFZ - no bitmap needed
+        self._pending = {}        # Tile-local rectangles not painted yet
+        self._tiles = {}          # Materialized bool bitmaps
+
+        # Targets: per-position CSV metadata plus per-tile position sets for window queries
+        self._target_info = {}   # (row, col) -> (target_id, priority)
+        self._tile_targets = {}  # (tile_row, tile_col) -> {(row, col), ...}
+
+    @property
+    def targets(self):
+        """Remaining target positions in insertion order (builds a list - prefer the index methods)"""
+        return list(self._target_info)
+
+    def add_target(self, position, target_id=None, priority=None):
+        """Add target to environment at specified position (ValueError if outside the grid)"""
+        position = (int(position[0]), int(position[1]))
+        if not (0 <= position[0] < self.rows and 0 <= position[1] < self.cols):
+            raise ValueError(f"Target position {position} is outside the {self.rows}x{self.cols} grid")
+        self._target_info[position] = (target_id, priority)
+        self._tile_targets.setdefault(self._tile_of(*position), set()).add(position)
+
+    def add_targets(self, positions, target_ids=None, priorities=None):
+        """Bulk-add targets from an (n, 2) array of positions (ValueError if any is outside the grid)"""
+        positions = np.asarray(positions, dtype=np.int64).reshape(-1, 2)
+        check_target_bounds(positions, self.rows, self.cols)
+        positions = positions.tolist()
+        count = len(positions)
+        target_ids = [None] * count if target_ids is None else list(target_ids)
+        priorities = [None] * count if priorities is None else list(priorities)
+        for position, target_id, priority in zip(positions, target_ids, priorities):
+            self.add_target(position, target_id, priority)
+
+    def remove_targets(self, positions):
+        """Bulk-remove targets; returns a boolean array marking which positions held a target"""
+        positions = np.asarray(positions, dtype=np.int64).reshape(-1, 2).tolist()
+        return np.array([self.remove_target(position) for position in positions], dtype=bool)
+
+    def get_target_info(self, position):
+        """Return the stored target_id/priority for a target position, or None"""
+        info = self._target_info.get(tuple(position))
+        if info is None:
+            return None
+        return {'target_id': info[0], 'priority': info[1]}
+
+    def count_targets(self):
+        """Number of targets remaining"""
+        return len(self._target_info)
+
+    def has_target(self, position):
+        """Check if target exists at specified position - O(1) dict lookup"""
+        return (position[0], position[1]) in self._target_info
+
+    def remove_target(self, position):
+        """Remove target from environment when collected"""
+        position = (position[0], position[1])
+        if position not in self._target_info:
+            return False
+        del self._target_info[position]
+        tile = self._tile_of(*position)
+        tile_targets = self._tile_targets[tile]
+        tile_targets.discard(position)
+        if not tile_targets:
+            del self._tile_targets[tile]
+        return True
+
+    def count_targets_in_window(self, top, left, bottom, right):
+        """Exact number of targets inside the inclusive window (scalar bounds)"""
+        return len(self._targets_in_window(top, left, bottom, right))
+
+    def any_target_in_window(self, top, left, bottom, right):
+        """Exact test for any target inside the inclusive window"""
+        return bool(self._targets_in_window(top, left, bottom, right))
+
+    def target_window(self, top, left, bottom, right):
+        """Dense bool bitmap of targets inside the inclusive window"""
+        window = np.zeros((bottom - top + 1, right - left + 1), dtype=bool)
+        for row, col in self._targets_in_window(top, left, bottom, right):
+            window[row - top, col - left] = True
+        return window
+
+    def add_nfz_rectangle(self, nfz_data):
+        """Add No-Fly Zone rectangle; tiles are only painted once a query touches them
+
+        Honours 'active_from' / 'active_until' steps like SearchEnvironment.add_nfz_rectangle.
+        """
+        active_from, active_until = nfz_data.get('active_from'), nfz_data.get('active_until')
+        if active_from is not None and active_from > self.nfz_step:
+            self._schedule_nfz(active_from, 'activate', nfz_data)
+            return
+        if active_until is not None:
+            if active_until <= self.nfz_step:
+                return  # Already expired
+            self._schedule_nfz(active_until, 'deactivate', nfz_data)
+
+        self.nfz_rectangles.append(nfz_data)
+        if self.nfz_index.frozen:
+            self.nfz_index = self.nfz_index.copy()
+        self.nfz_index.insert(len(self.nfz_rectangles) - 1,
+                              *nfz_data['top_left'], *nfz_data['bottom_right'])
+
+        top_row, left_col = nfz_data['top_left']
+        bottom_row, right_col = nfz_data['bottom_right']
+        top_row = max(0, top_row)
+        left_col = max(0, left_col)
+        bottom_row = min(self.rows - 1, bottom_row)
+        right_col = min(self.cols - 1, right_col)
+        self._nfz_changed(top_row, left_col, bottom_row, right_col)
+        if top_row > bottom_row or left_col > right_col:
+            return
+        self._nfz_bounds.append((top_row, left_col, bottom_row, right_col))
+        self._paint_tiles(top_row, left_col, bottom_row, right_col)
+
+    def remove_nfz_rectangle(self, nfz_data):
+        """Remove an active NFZ rectangle (matched by identity); returns False if it isn't active
+
+        Tiles and the index are rebuilt from the remaining (still symbolic) rectangles.
+        """
+        index = next((i for i, nfz in enumerate(self.nfz_rectangles) if nfz is nfz_data), None)
+        if index is None:
+            return False
+        del self.nfz_rectangles[index]
+
+        self.nfz_index = NFZIndex(self.grid_size, self.nfz_index.bucket_size)
+        self._nfz_bounds = []
+        self._full_tiles, self._pending, self._tiles = set(), {}, {}
+        for rect_id, nfz in enumerate(self.nfz_rectangles):
+            self.nfz_index.insert(rect_id, *nfz['top_left'], *nfz['bottom_right'])
+            bounds = self.nfz_index.bounds.get(rect_id)
+            if bounds is not None:
+                self._nfz_bounds.append(bounds)
+                self._paint_tiles(*bounds)
+
+        top_row, left_col = max(0, nfz_data['top_left'][0]), max(0, nfz_data['top_left'][1])
+        bottom_row = min(self.rows - 1, nfz_data['bottom_right'][0])
+        right_col = min(self.cols - 1, nfz_data['bottom_right'][1])
+        self._nfz_changed(top_row, left_col, bottom_row, right_col)
+        return True
+
+    def update_nfz_schedule(self, step):
+        """Apply NFZ activations/deactivations due by step; returns how many were applied - O(1) if none"""
+        self.nfz_step = step
+        applied = 0
+        while self._nfz_schedule and self._nfz_schedule[0][0] <= step:
+            _, _, action, nfz_data = heapq.heappop(self._nfz_schedule)
+            if action == 'activate':
+                self.add_nfz_rectangle(nfz_data)
+            else:
+                self.remove_nfz_rectangle(nfz_data)
+            applied += 1
+        return applied
+
+    def nfz_changes_since(self, version):
+        """Rectangles (top, left, bottom, right) whose NFZ cells changed after version"""
+        return [region for changed_version, region in self.nfz_changes if changed_version > version]
+
+    def _schedule_nfz(self, step, action, nfz_data):
+        heapq.heappush(self._nfz_schedule, (step, next(self._nfz_schedule_sequence), action, nfz_data))
+
+    def _nfz_changed(self, top_row, left_col, bottom_row, right_col):
+        self.version = next(SearchEnvironment._versions)
+        if top_row <= bottom_row and left_col <= right_col:
+            self.nfz_changes.append((self.version, (top_row, left_col, bottom_row, right_col)))
+
+    def _paint_tiles(self, top_row, left_col, bottom_row, right_col):
+        """Record a clipped rectangle as full tiles, painted tiles, or pending tile rectangles"""
+        size = self.tile_size
+        for tile_row in range(top_row // size, bottom_row // size + 1):
+            tile_top = tile_row * size
+            local_top = max(top_row - tile_top, 0)
+            local_bottom = min(bottom_row - tile_top, size - 1)
+            full_rows = local_top == 0 and local_bottom >= min(size, self.rows - tile_top) - 1
+
+            for tile_col in range(left_col // size, right_col // size + 1):
+                tile_left = tile_col * size
+                local_left = max(left_col - tile_left, 0)
+                local_right = min(right_col - tile_left, size - 1)
+                key = (tile_row, tile_col)
+                if key in self._full_tiles:
+                    continue
+
+                if full_rows and local_left == 0 and local_right >= min(size, self.cols - tile_left) - 1:
+                    self._full_tiles.add(key)
+                    self._pending.pop(key, None)
+                    self._tiles.pop(key, None)
+                elif key in self._tiles:
+                    self._writable_tile(key)[local_top:local_bottom + 1, local_left:local_right + 1] = True
+                else:
+                    self._pending.setdefault(key, []).append((local_top, local_left, local_bottom, local_right))
+
+    def cache_key(self):
+        """Return a key identifying this environment's current NFZ layout"""
+        return (self.environment_id, self.version)
+
+    def nfz_rectangles_on_segment(self, start, end):
+        """NFZ rectangles the straight segment between two cells passes through"""
+        return [self.nfz_rectangles[i] for i in self.nfz_index.query_segment(start, end)]
+
+    def nfz_rectangles_in_window(self, top, left, bottom, right):
+        """NFZ rectangles overlapping the inclusive window"""
+        return [self.nfz_rectangles[i] for i in self.nfz_index.query_window(top, left, bottom, right)]
+
+    def nearest_nfz(self, position, max_distance=None):
+        """Return (nfz rectangle, Manhattan distance) of the closest NFZ, or None"""
+        nearest = self.nfz_index.nearest(position, max_distance)
+        if nearest is None:
+            return None
+        return self.nfz_rectangles[nearest[0]], nearest[1]
+
+    def snapshot(self):
+        """Capture NFZs and targets; tile bitmaps are shared copy-on-write rather than copied"""
+        for tile in self._tiles.values():
+            tile.flags.writeable = False
+        self.nfz_index.frozen = True
+        return {
+            'version': self.version,
+            'nfz_rectangles': tuple(self.nfz_rectangles),
+            'nfz_bounds': tuple(self._nfz_bounds),
+            'nfz_index': self.nfz_index,
+            'nfz_step': self.nfz_step,
+            'nfz_schedule': tuple(self._nfz_schedule),
+            'nfz_changes': tuple(self.nfz_changes),
+            'full_tiles': frozenset(self._full_tiles),
+            'pending': {key: tuple(rects) for key, rects in self._pending.items()},
+            'tiles': dict(self._tiles),
+            'target_info': dict(self._target_info)
+        }
+
+    def restore(self, snapshot):
+        """Return to a state captured by snapshot()"""
+        self.version = snapshot['version']
+        self.nfz_rectangles = list(snapshot['nfz_rectangles'])
+        self._nfz_bounds = list(snapshot['nfz_bounds'])
+        self.nfz_index = snapshot['nfz_index']
+        self.nfz_step = snapshot['nfz_step']
+        self._nfz_schedule = list(snapshot['nfz_schedule'])
+        self.nfz_changes = list(snapshot['nfz_changes'])
+        self._full_tiles = set(snapshot['full_tiles'])
+        self._pending = {key: list(rects) for key, rects in snapshot['pending'].items()}
+        self._tiles = dict(snapshot['tiles'])
+        self._target_info = dict(snapshot['target_info'])
+        self._tile_targets = {}
+        for position in self._target_info:
+            self._tile_targets.setdefault(self._tile_of(*position), set()).add(position)
+
+    def fork(self, snapshot=None):
+        """New environment branched from snapshot (default: the current state)"""
+        forked = copy.copy(self)
+        forked.restore(snapshot or self.snapshot())
+        return forked
+
+    def is_valid_position(self, position):
+        """Check if position is within grid bounds and not in NFZ - O(1) per call"""
+        row, col = position
+        if not (0 <= row < self.rows and 0 <= col < self.cols):
+            return False
+        key = (row // self.tile_size, col // self.tile_size)
+        if key in self._full_tiles:
+            return False
+        tile = self._tiles.get(key)
+        if tile is None:
+            if key not in self._pending:
+                return True
+            tile = self._materialize(key)
+        return not tile[row % self.tile_size, col % self.tile_size]
+
+    def get_valid_neighbors(self, position):
+        """Get all valid neighboring positions"""
+        row, col = position
+        neighbors = [
+            (row + 1, col),  # down
+            (row - 1, col),  # up
+            (row, col + 1),  # right
+            (row, col - 1),  # left
+        ]
+        return [pos for pos in neighbors if self.is_valid_position(pos)]
+
+    def distance_between(self, pos1, pos2):
+        """Calculate Manhattan distance between two positions"""
+        return abs(pos2[0] - pos1[0]) + abs(pos2[1] - pos1[1])
+
+    def is_position_in_nfz(self, position):
+        """Fast check if position is in any NFZ (useful for visualization)"""
+        row, col = position
+        return 0 <= row < self.rows and 0 <= col < self.cols and not self.is_valid_position(position)
+
+    def get_nfz_bounds(self):
+        """Get bounding box of all NFZs (useful for path planning)"""
+        if not self._nfz_bounds:
+            return None
+        bounds = np.array(self._nfz_bounds)
+        return {
+            'min_row': bounds[:, 0].min(),
+            'max_row': bounds[:, 2].max(),
+            'min_col': bounds[:, 1].min(),
+            'max_col': bounds[:, 3].max()
+        }
+
+    def get_environment_stats(self):
+        """Return environment statistics"""
+        return {
+            'grid_size': f"{self.rows}x{self.cols}",
+            'targets_remaining': self.count_targets(),
+            'nfz_count': len(self.nfz_rectangles),
+            'nfz_coverage': f"{self._nfz_area() / (self.rows * self.cols) * 100:.1f}%"
+        }
+
+    def get_tile_stats(self):
+        """Return how many tiles are full, pending, or materialized, and their memory use"""
+        return {
+            'tile_size': self.tile_size,
+            'tiles_full': len(self._full_tiles),
+            'tiles_pending': len(self._pending),
+            'tiles_materialized': len(self._tiles),
+            'bytes_used': sum(tile.nbytes for tile in self._tiles.values())
+        }
+
+    def get_nfz_window(self, top, left, bottom, right):
+        """Dense bool NFZ bitmap for the inclusive window, painted from the symbolic rectangles"""
+        window = np.zeros((bottom - top + 1, right - left + 1), dtype=bool)
+        for nfz_top, nfz_left, nfz_bottom, nfz_right in self._nfz_bounds:
+            row_start, row_end = max(nfz_top, top), min(nfz_bottom, bottom)
+            col_start, col_end = max(nfz_left, left), min(nfz_right, right)
+            if row_start <= row_end and col_start <= col_end:
+                window[row_start - top:row_end - top + 1, col_start - left:col_end - left + 1] = True
+        return window
+
+    # Visualization helper
+    def get_environment_grid(self, window=None):
+        """Return a 2D grid (0 empty, 1 NFZ, 2 target) for window=(top, left, bottom, right)
+
+        Defaults to the whole grid, which is only sensible for grids that fit in memory.
+        """
+        top, left, bottom, right = window or (0, 0, self.rows - 1, self.cols - 1)
+        grid = self.get_nfz_window(top, left, bottom, right).astype(int)
+        grid[self.target_window(top, left, bottom, right)] = 2
+        return grid
+
+    def _tile_of(self, row, col):
+        return (row // self.tile_size, col // self.tile_size)
+
+    def _materialize(self, key):
+        """Paint a tile's pending rectangles into a fresh bitmap"""
+        tile = np.zeros((self.tile_size, self.tile_size), dtype=bool)
+        for top, left, bottom, right in self._pending.pop(key):
+            tile[top:bottom + 1, left:right + 1] = True
+        self._tiles[key] = tile
+        return tile
+
+    def _writable_tile(self, key):
+        """Copy-on-write: give this environment its own copy of a tile shared by a snapshot"""
+        tile = self._tiles[key]
+        if not tile.flags.writeable:
+            tile = self._tiles[key] = tile.copy()
+        return tile
+
+    def _targets_in_window(self, top, left, bottom, right):
+        """Target positions inside the inclusive window, gathered from the overlapping tiles"""
+        top, left = max(top, 0), max(left, 0)
+        bottom, right = min(bottom, self.rows - 1), min(right, self.cols - 1)
+        found = []
+        if top > bottom or left > right or not self._tile_targets:
+            return found
+        size = self.tile_size
+        for tile_row in range(top // size, bottom // size + 1):
+            for tile_col in range(left // size, right // size + 1):
+                for row, col in self._tile_targets.get((tile_row, tile_col), ()):
+                    if top <= row <= bottom and left <= col <= right:
+                        found.append((row, col))
+        return found
+
+    def _nfz_area(self):
+        """Exact union area of the NFZ rectangles via coordinate compression"""
+        if not self._nfz_bounds:
+            return 0
+        bounds = np.array(self._nfz_bounds, dtype=np.int64)
+        row_edges = np.unique(np.concatenate((bounds[:, 0], bounds[:, 2] + 1)))
+        col_edges = np.unique(np.concatenate((bounds[:, 1], bounds[:, 3] + 1)))
+        covered = np.zeros((len(row_edges) - 1, len(col_edges) - 1), dtype=bool)
+        row_start = np.searchsorted(row_edges, bounds[:, 0])
+        row_end = np.searchsorted(row_edges, bounds[:, 2] + 1)
+        col_start = np.searchsorted(col_edges, bounds[:, 1])
+        col_end = np.searchsorted(col_edges, bounds[:, 3] + 1)
+        for r0, r1, c0, c1 in zip(row_start.tolist(), row_end.tolist(), col_start.tolist(), col_end.tolist()):
+            covered[r0:r1, c0:c1] = True
+        cell_areas = np.diff(row_edges)[:, None] * np.diff(col_edges)[None, :]
+        return int(cell_areas[covered].sum())
@@ -0,0 +1,52 @@
+import argparse
+import json
+
+from utils.data_loader import load_mission_data, load_targets_data, load_nfz_data, load_waypoints_data, \
+    load_drone_starts
+from simulation.batch import generate_variants, run_batch, summarize, summarize_by, format_summary_table
+
+
+def main():
+    """Headless Monte Carlo batch runner - no plotting, no per-step output"""
+    parser = argparse.ArgumentParser(description="Run many mission variants across all CPU cores")
+    parser.add_argument('--count', type=int, default=1000, help="number of mission variants")
+    parser.add_argument('--seed', type=int, default=0, help="random seed for variant generation")
+    parser.add_argument('--workers', type=int, default=None, help="worker processes (default: all cores)")
+    parser.add_argument('--max-steps', type=int, default=200, help="step limit per mission")
+    parser.add_argument('--mode', default='cascade', help="navigator mode (cascade, astar, field)")
+    parser.add_argument('--output', help="write per-mission results and summaries to this JSON file")
+    args = parser.parse_args()
+
+    mission = load_mission_data('data/missions.csv')
+    if not mission:
+        return
+
+    drone_starts = load_drone_starts('data/drone_starts.csv')
+    if not drone_starts:
+        drone_starts = [{'drone_id': 1, 'start_position': mission['start_position'], 'color': 'blue'}]
+
+    variants = generate_variants(
+        mission, drone_starts,
+        load_targets_data('data/targets.csv'),
+        load_nfz_data('data/nfz.csv'),
+        load_waypoints_data('data/waypoints.csv'),
+        count=args.count, seed=args.seed, max_steps=args.max_steps, mode=args.mode
+    )
+
+    results = run_batch(variants, max_workers=args.workers)
+    summary = summarize(results)
+    by_split = summarize_by(results, 'split')
+
+    print(f"Missions: {len(results)}")
+    print(format_summary_table(summary))
+    for split, split_summary in by_split.items():
+        print(f"\nSplit: {split}")
+        print(format_summary_table(split_summary))
+
+    if args.output:
+        with open(args.output, 'w') as file:
+            json.dump({'summary': summary, 'by_split': by_split, 'results': results}, file, indent=2)
+
+
+if __name__ == "__main__":
+    main()
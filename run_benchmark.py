@@ -0,0 +1,78 @@
+import argparse
+import json
+import sys
+
+import matplotlib
+
+matplotlib.use('Agg')  # Rendering is timed off-screen
+
+from simulation.benchmark import run_benchmarks, compare_results, format_comparison, settings_mismatches, \
+    DEFAULT_SIZES, DEFAULT_THRESHOLD, DEFAULT_RENDER_MAX_SIZE
+
+
+def main():
+    """Benchmark the hot paths, or compare a run against a stored baseline"""
+    parser = argparse.ArgumentParser(description="Time navigator, environment, engine and renderer hot paths")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    run = commands.add_parser('run', help="run the benchmarks and write JSON results")
+    run.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES), help="grid sizes")
+    run.add_argument('--repeats', type=int, default=5, help="timed repeats per benchmark")
+    run.add_argument('--steps', type=int, default=50, help="mission steps for navigation/step timings")
+    run.add_argument('--seed', type=int, default=0, help="scenario generator seed")
+    run.add_argument('--mode', default='cascade', help="navigator mode (cascade, astar, field, dstar)")
+    run.add_argument('--render-max-size', type=int, default=DEFAULT_RENDER_MAX_SIZE,
+                     help="largest grid to time rendering on")
+    run.add_argument('--output', default='benchmark.json', help="results file")
+    run.add_argument('--baseline', help="also compare against this results file")
+    run.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD, help="regression threshold")
+    run.add_argument('--force', action='store_true', help="compare even if the run settings differ")
+
+    compare = commands.add_parser('compare', help="compare two results files")
+    compare.add_argument('baseline', help="baseline results file")
+    compare.add_argument('current', help="results file to check")
+    compare.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                         help="relative slowdown flagged as a regression (0.2 = 20%%)")
+    compare.add_argument('--force', action='store_true', help="compare even if the run settings differ")
+    args = parser.parse_args()
+
+    if args.command == 'run':
+        results = run_benchmarks(args.sizes, args.repeats, args.seed, args.steps, args.render_max_size, args.mode)
+        with open(args.output, 'w') as file:
+            json.dump(results, file, indent=2)
+        print(f"📊 {len(results['benchmarks'])} benchmarks written to {args.output}")
+        if not args.baseline:
+            return 0
+        current = results
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+    else:
+        with open(args.baseline) as file:
+            baseline = json.load(file)
+        with open(args.current) as file:
+            current = json.load(file)
+
+    mismatches = settings_mismatches(baseline, current)
+    if mismatches:
+        details = ', '.join(f"{name}: {before} vs {after}" for name, before, after in mismatches)
+        if not args.force:
+            print(f"❌ Results are not comparable ({details}) - rerun with matching settings or pass --force")
+            return 1
+        print(f"⚠️ Comparing results with different settings ({details})")
+
+    rows = compare_results(baseline, current, args.threshold)
+    print(format_comparison(rows))
+    regressions = [row[0] for row in rows if row[4] == 'regression']
+    missing = [row[0] for row in rows if row[4] == 'missing']
+    if regressions:
+        print(f"\n❌ {len(regressions)} regression(s): {', '.join(regressions)}")
+    if missing:
+        print(f"\n❌ {len(missing)} baseline benchmark(s) missing: {', '.join(missing)}")
+    if regressions or missing:
+        return 1
+    print("\n✅ No regressions")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
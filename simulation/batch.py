@@ -0,0 +1,189 @@
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from algorithms.waypoint import WaypointNavigator
+from models.drone import RescueDrone
+from models.environment import SearchEnvironment
+from simulation.engine import SimulationEngine
+
+# Ways of dividing the waypoint list between drones
+WAYPOINT_SPLITS = ('half', 'round_robin', 'chunks', 'full')
+
+# Mission statistics summarized across a batch
+SUMMARY_METRICS = ('steps', 'targets_found', 'targets_remaining', 'battery_remaining', 'active_drones', 'wall_time')
+
+
+def split_waypoints(waypoints, num_drones, split):
+    """Divide the waypoint list between drones according to the split strategy"""
+    if split == 'full' or num_drones == 1:
+        return [list(waypoints) for _ in range(num_drones)]
+    if split == 'half' and num_drones == 2:
+        half = len(waypoints) // 2
+        return [waypoints[:half], waypoints[half:]]
+    if split == 'round_robin':
+        return [waypoints[i::num_drones] for i in range(num_drones)]
+
+    # 'chunks' (and 'half' for fleets other than two): contiguous equal-sized blocks
+    bounds = np.linspace(0, len(waypoints), num_drones + 1).astype(int)
+    return [waypoints[bounds[i]:bounds[i + 1]] for i in range(num_drones)]
+
+
+def generate_variants(mission, drone_starts, targets, nfz_rectangles, waypoints, count, seed=0,
+                      battery_range=(200, 600), max_steps=200, mode='cascade'):
+    """Build mission variants with randomized starts, NFZ layouts, batteries and waypoint splits"""
+    rng = np.random.default_rng(seed)
+    rows, cols = mission['grid_size']
+    variants = []
+
+    for variant_id in range(count):
+        # NFZ layout: drop some zones and jitter the rest by up to two cells
+        layout = []
+        for nfz in nfz_rectangles:
+            if rng.random() < 0.2:
+                continue
+            shift_row, shift_col = (int(v) for v in rng.integers(-2, 3, size=2))
+            layout.append({
+                'nfz_id': nfz['nfz_id'],
+                'top_left': (nfz['top_left'][0] + shift_row, nfz['top_left'][1] + shift_col),
+                'bottom_right': (nfz['bottom_right'][0] + shift_row, nfz['bottom_right'][1] + shift_col),
+                'type': nfz['type']
+            })
+
+        # Start positions: keep the configured start or pick a random cell outside the layout
+        blocked = _layout_mask(mission['grid_size'], layout)
+        starts = []
+        for drone in drone_starts:
+            position = drone['start_position']
+            if rng.random() < 0.5 or blocked[position]:
+                free_cells = np.argwhere(~blocked)
+                position = tuple(int(v) for v in free_cells[rng.integers(len(free_cells))])
+            starts.append({**drone, 'start_position': position})
+
+        variants.append({
+            'variant_id': variant_id,
+            'grid_size': (rows, cols),
+            'drone_starts': starts,
+            'targets': [dict(target) for target in targets],
+            'nfz_rectangles': layout,
+            'waypoints': [dict(waypoint) for waypoint in waypoints],
+            'battery': int(rng.integers(battery_range[0], battery_range[1] + 1)),
+            'split': str(rng.choice(WAYPOINT_SPLITS)),
+            'max_steps': max_steps,
+            'mode': mode
+        })
+
+    return variants
+
+
+def build_simulation(variant):
+    """Create environment, drones, navigators and engine for one mission variant"""
+    environment = SearchEnvironment(grid_size=variant['grid_size'])
+    targets = variant['targets']
+    environment.add_targets(
+        [target['position'] for target in targets],
+        target_ids=[target['target_id'] for target in targets],
+        priorities=[target['priority'] for target in targets]
+    )
+    for nfz in variant['nfz_rectangles']:
+        environment.add_nfz_rectangle(nfz)
+
+    drone_starts = variant['drone_starts']
+    assignments = split_waypoints(variant['waypoints'], len(drone_starts), variant['split'])
+
+    drones = []
+    navigators = []
+    for drone_config, drone_waypoints in zip(drone_starts, assignments):
+        drone = RescueDrone(
+            start_position=drone_config['start_position'],
+            battery=variant['battery'],
+            drone_id=drone_config['drone_id'],
+            color=drone_config['color']
+        )
+        drone.set_waypoints(drone_waypoints)
+        drones.append(drone)
+        navigators.append(WaypointNavigator(
+            grid_size=variant['grid_size'],
+            start_position=drone.position,
+            environment=environment,
+            drone=drone,
+            mode=variant.get('mode', 'cascade')
+        ))
+
+    return SimulationEngine(drones, environment, navigators)
+
+
+def run_mission(variant):
+    """Run one mission variant headlessly and return its final statistics"""
+    started = time.perf_counter()
+
+    # The event log is disabled by default, so workers produce no output
+    simulation = build_simulation(variant)
+    for _ in range(variant['max_steps']):
+        if not simulation.run_step():
+            break
+
+    result = simulation.get_mission_stats()
+    result['variant_id'] = variant['variant_id']
+    result['split'] = variant['split']
+    result['battery_budget'] = variant['battery']
+    result['wall_time'] = time.perf_counter() - started
+    return result
+
+
+def run_batch(variants, max_workers=None, chunksize=None):
+    """Run mission variants across a process pool (one worker per core by default)"""
+    max_workers = max_workers or os.cpu_count() or 1
+    if max_workers == 1:
+        return [run_mission(variant) for variant in variants]
+
+    # Batch several variants per task so small missions don't drown in IPC overhead
+    chunksize = chunksize or max(1, len(variants) // (max_workers * 4))
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        return list(executor.map(run_mission, variants, chunksize=chunksize))
+
+
+def summarize(results, metrics=SUMMARY_METRICS, percentiles=(5, 50, 95)):
+    """Aggregate per-mission results into mean/min/max and percentile rows per metric"""
+    summary = {}
+    for metric in metrics:
+        values = np.array([result[metric] for result in results], dtype=float)
+        if values.size == 0:
+            continue
+        row = {'mean': float(values.mean()), 'min': float(values.min()), 'max': float(values.max())}
+        for pct, value in zip(percentiles, np.percentile(values, percentiles)):
+            row[f'p{pct}'] = float(value)
+        summary[metric] = row
+
+    completed = [result['mission_completed'] for result in results]
+    summary['completion_rate'] = sum(completed) / len(completed) if completed else 0.0
+    return summary
+
+
+def summarize_by(results, key, metrics=SUMMARY_METRICS):
+    """Summarize results separately for each value of key (e.g. 'split')"""
+    groups = {}
+    for result in results:
+        groups.setdefault(result[key], []).append(result)
+    return {value: summarize(group, metrics) for value, group in sorted(groups.items())}
+
+
+def format_summary_table(summary):
+    """Render a summary from summarize() as a fixed-width text table"""
+    stat_names = [name for name in next((row for row in summary.values() if isinstance(row, dict)), {})]
+    lines = [f"{'metric':<20}" + ''.join(f"{name:>12}" for name in stat_names)]
+    for metric, row in summary.items():
+        if isinstance(row, dict):
+            lines.append(f"{metric:<20}" + ''.join(f"{row[name]:>12.2f}" for name in stat_names))
+    lines.append(f"{'completion_rate':<20}{summary['completion_rate']:>12.2%}")
+    return "\n".join(lines)
+
+
+def _layout_mask(grid_size, nfz_rectangles):
+    """NFZ mask for a layout, built the same way SearchEnvironment builds it"""
+    environment = SearchEnvironment(grid_size=grid_size)
+    for nfz in nfz_rectangles:
+        environment.add_nfz_rectangle(nfz)
+    return environment.nfz_mask
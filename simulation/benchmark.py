@@ -0,0 +1,238 @@
+import datetime
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import numpy as np
+
+from algorithms.route_cache import RouteCache
+from algorithms.waypoint import WaypointNavigator
+from models.drone import RescueDrone
+from simulation.batch import split_waypoints
+from simulation.engine import SimulationEngine
+from utils.scenario_bundle import build_environment
+from utils.scenario_generator import generate_scenario
+
+# Grid sizes benchmarked by default, smallest first
+DEFAULT_SIZES = (50, 200, 1000)
+
+# Relative slowdown of a benchmark's median that compare_results() flags as a regression
+DEFAULT_THRESHOLD = 0.2
+
+# Rendering builds a full matplotlib figure, so larger grids are skipped by default
+DEFAULT_RENDER_MAX_SIZE = 200
+
+# Run settings that must match for two results files to be comparable
+COMPARABLE_SETTINGS = ('mode', 'seed', 'steps', 'sizes')
+
+
+def run_benchmarks(sizes=DEFAULT_SIZES, repeats=5, seed=0, steps=50, render_max_size=DEFAULT_RENDER_MAX_SIZE,
+                   mode='cascade'):
+    """Time the hot paths on generated scenarios of each size; returns a JSON-ready dict
+
+    Every benchmark is keyed '<name>[<size>]' and reports per-call seconds
+    (median, mean, min, p95) over its samples, so results from different
+    machines or commits can be compared with compare_results().
+    """
+    results = {}
+    for size in sizes:
+        scenario = generate_scenario(size, nfz_density=0.2, clustering=0.5, num_targets=max(20, size // 5),
+                                     num_waypoints=max(8, size // 25), num_drones=4, seed=seed)
+        rng = np.random.default_rng(seed)
+        environment = build_environment(scenario)
+        cells = [tuple(cell) for cell in rng.integers(0, size, size=(10000, 2)).tolist()]
+
+        results[f'is_valid_position[{size}]'] = _time_batches(
+            lambda: [environment.is_valid_position(cell) for cell in cells], len(cells), repeats)
+        results[f'has_target[{size}]'] = _time_batches(
+            lambda: [environment.has_target(cell) for cell in cells], len(cells), repeats)
+        results[f'find_safe_route_to_waypoint[{size}]'] = _time_route_planning(scenario, mode, repeats)
+        results[f'get_next_position[{size}]'] = _time_navigation(scenario, mode, steps)
+        results[f'run_step[{size}]'] = _time_steps(scenario, mode, steps)
+        if size <= render_max_size:
+            results[f'create_plot[{size}]'] = _time_rendering(scenario, mode, repeats)
+
+    return {'metadata': get_environment_metadata(sizes, repeats, seed, steps, mode), 'benchmarks': results}
+
+
+def compare_results(baseline, current, threshold=DEFAULT_THRESHOLD):
+    """Compare two run_benchmarks() results by median time per call
+
+    Returns rows of (name, baseline median, current median, ratio, status) where
+    status is 'regression' when current is more than threshold slower, 'improved'
+    when more than threshold faster, 'ok' otherwise, and 'new' / 'missing' for
+    benchmarks only one side has.
+    """
+    rows = []
+    base, cur = baseline['benchmarks'], current['benchmarks']
+    for name in list(base) + [name for name in cur if name not in base]:
+        if name not in cur or name not in base:
+            rows.append((name, base.get(name, {}).get('median'), cur.get(name, {}).get('median'), None,
+                         'missing' if name not in cur else 'new'))
+            continue
+        before, after = base[name]['median'], cur[name]['median']
+        ratio = after / before if before else float('inf')
+        if ratio > 1 + threshold:
+            status = 'regression'
+        elif ratio < 1 - threshold:
+            status = 'improved'
+        else:
+            status = 'ok'
+        rows.append((name, before, after, ratio, status))
+    return rows
+
+
+def settings_mismatches(baseline, current):
+    """COMPARABLE_SETTINGS that differ between two results files, as (name, baseline value, current value)"""
+    base, cur = baseline.get('metadata', {}), current.get('metadata', {})
+    return [(name, base.get(name), cur.get(name)) for name in COMPARABLE_SETTINGS
+            if base.get(name) != cur.get(name)]
+
+
+def format_comparison(rows):
+    """Render compare_results() rows as a fixed-width text table"""
+    lines = [f"{'benchmark':<40}{'baseline':>14}{'current':>14}{'ratio':>9}  status"]
+    for name, before, after, ratio, status in rows:
+        lines.append(f"{name:<40}{_format_seconds(before):>14}{_format_seconds(after):>14}"
+                     f"{'' if ratio is None else f'{ratio:.2f}x':>9}  {status}")
+    return "\n".join(lines)
+
+
+def get_environment_metadata(sizes, repeats, seed, steps, mode):
+    """Machine, library and commit details stored alongside benchmark results"""
+    import matplotlib
+    return {
+        'timestamp': datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        'python': sys.version.split()[0],
+        'implementation': platform.python_implementation(),
+        'numpy': np.__version__,
+        'matplotlib': matplotlib.__version__,
+        'platform': platform.platform(),
+        'processor': platform.processor() or platform.machine(),
+        'cpu_count': os.cpu_count(),
+        'git_commit': _git_commit(),
+        'sizes': list(sizes),
+        'repeats': repeats,
+        'seed': seed,
+        'steps': steps,
+        'mode': mode
+    }
+
+
+def _build_engine(scenario, mode, route_cache):
+    """Fresh engine over a generated scenario (drones split the waypoints round-robin)"""
+    environment = build_environment(scenario)
+    size = int(scenario['grid_size'][0])
+    waypoints = [{'waypoint_id': waypoint_id, 'position': tuple(position)} for waypoint_id, position
+                 in zip(scenario['waypoint_id'].tolist(), scenario['waypoint_position'].tolist())]
+    starts = scenario['drone_start'].tolist()
+    drones, navigators = [], []
+    for drone_id, start, drone_waypoints in zip(scenario['drone_id'].tolist(), starts,
+                                                split_waypoints(waypoints, len(starts), 'round_robin')):
+        drone = RescueDrone(start_position=tuple(start), battery=size * 10, drone_id=drone_id)
+        drone.set_waypoints(drone_waypoints)
+        drones.append(drone)
+        navigators.append(WaypointNavigator(environment.grid_size, drone.position, environment=environment,
+                                            drone=drone, mode=mode, route_cache=route_cache))
+    return SimulationEngine(drones, environment, navigators)
+
+
+def _time_batches(function, calls, repeats):
+    """Per-call stats from timing `repeats` batches of `calls` calls each"""
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        function()
+        samples.append((time.perf_counter() - started) / calls)
+    return _summarize(samples)
+
+
+def _time_route_planning(scenario, mode, repeats):
+    """Cold (uncached) route planning from each drone's start to each of its waypoints"""
+    samples = []
+    for _ in range(repeats):
+        engine = _build_engine(scenario, mode, route_cache=None)
+        for drone, navigator in zip(engine.drones, engine.navigators):
+            for index in range(len(drone.waypoints)):
+                drone.current_waypoint_index = index
+                started = time.perf_counter()
+                navigator._find_safe_route_to_waypoint(drone.position)
+                samples.append(time.perf_counter() - started)
+    return _summarize(samples)
+
+
+def _time_navigation(scenario, mode, steps):
+    """Each navigator call made while replaying the engine's move loop"""
+    engine = _build_engine(scenario, mode, RouteCache())
+    samples = []
+    for _ in range(steps):
+        for drone, navigator in zip(engine.drones, engine.navigators):
+            started = time.perf_counter()
+            next_position = navigator.get_next_position(drone.position)
+            samples.append(time.perf_counter() - started)
+            if next_position is not None and engine.environment.is_valid_position(next_position):
+                drone.move_to(next_position)
+                drone.scan_area(engine.environment)
+    return _summarize(samples)
+
+
+def _time_steps(scenario, mode, steps):
+    """Whole SimulationEngine.run_step calls, stopping early if the mission ends"""
+    engine = _build_engine(scenario, mode, RouteCache())
+    samples = []
+    for _ in range(steps):
+        started = time.perf_counter()
+        should_continue = engine.run_step()
+        samples.append(time.perf_counter() - started)
+        if not should_continue:
+            break
+    return _summarize(samples)
+
+
+def _time_rendering(scenario, mode, repeats):
+    """SimulationPlotter._create_plot plus one canvas draw, after a few mission steps"""
+    import matplotlib.pyplot as plt
+    from visualization.plotter import SimulationPlotter
+
+    engine = _build_engine(scenario, mode, RouteCache())
+    for _ in range(5):
+        engine.run_step()
+    plotter = SimulationPlotter(grid_size=engine.environment.grid_size)
+    samples = []
+    for _ in range(repeats):
+        started = time.perf_counter()
+        fig, _ = plotter._create_plot("Benchmark", engine.drones, engine.environment, "Benchmark")
+        fig.canvas.draw()
+        samples.append(time.perf_counter() - started)
+        plt.close(fig)
+    return _summarize(samples)
+
+
+def _summarize(samples):
+    values = np.array(samples, dtype=float)
+    return {
+        'samples': int(values.size),
+        'median': float(np.median(values)),
+        'mean': float(values.mean()),
+        'min': float(values.min()),
+        'p95': float(np.percentile(values, 95))
+    }
+
+
+def _format_seconds(seconds):
+    if seconds is None:
+        return '-'
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f"{seconds / scale:.2f} {unit}"
+    return f"{seconds / 1e-9:.1f} ns"
+
+
+def _git_commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], capture_output=True, text=True,
+                              check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
@@ -1,16 +1,111 @@
+import copy
+import time
+
+from algorithms.reservation import ReservationTable, plan_legs
+from simulation.metrics import FleetAggregates, StepMetrics
+from simulation.profiling import PhaseTimer, PROFILERS
+from utils.event_log import event_log, INFO, WARNING
+
+
 class SimulationEngine:
     """Controls the simulation execution and mission progress"""
 
-    def __init__(self, drones, environment, navigators):
+    # How reserved legs are planned: one drone at a time in fleet order, or jointly by
+    # conflict-based search when only a few drones need a new leg in the same step
+    COORDINATION_MODES = (None, 'prioritized', 'cbs')
+
+    def __init__(self, drones, environment, navigators, coordination=None):
+        if coordination not in self.COORDINATION_MODES:
+            raise ValueError(f"Unknown coordination '{coordination}', expected one of {self.COORDINATION_MODES}")
+
         self.drones = drones if isinstance(drones, list) else [drones]
         self.environment = environment
         self.navigators = navigators if isinstance(navigators, list) else [navigators]
         self.mission_completed = False
         self.step_count = 0
+        self.step_hooks = []  # Callables invoked with the engine after every step
+
+        # Fleet totals updated per move, so stats cost O(1) however many drones fly
+        self.fleet = FleetAggregates(self.drones)
+        self.step_metrics = None  # StepMetrics (rolling latency / step rate) once enabled
+
+        # Optional instrumentation, both off by default (every timed call site checks for None)
+        self.phase_timer = None  # PhaseTimer while timing is enabled
+        self.profiler = None     # StepProfiler / SamplingProfiler while profiling
+
+        # Collision-free mode: every drone moves along space-time reserved legs
+        self.coordination = coordination
+        self.reservations = ReservationTable() if coordination else None
+        if self.reservations is not None:
+            for drone, navigator in zip(self.drones, self.navigators):
+                navigator.reservations = self.reservations
+                self.reservations.park(drone.drone_id, drone.position, self.step_count)
+
+    def add_step_hook(self, hook):
+        """Register hook(engine) to run after each step (recorders, renderers, ...)"""
+        self.step_hooks.append(hook)
+
+    def enable_metrics(self, enabled=True, window_seconds=60.0):
+        """Switch rolling step-latency and step-rate metrics on or off (see simulation.metrics.MetricsServer)"""
+        self.step_metrics = StepMetrics(window_seconds) if enabled else None
+
+    def enable_timing(self, enabled=True):
+        """Switch per-phase/per-drone step timing on (fresh histograms) or off"""
+        self.phase_timer = PhaseTimer() if enabled else None
+
+    def start_profiling(self, kind='cprofile', **options):
+        """Profile run_step from now on with 'cprofile' or the low-overhead 'sampling' profiler"""
+        if kind not in PROFILERS:
+            raise ValueError(f"Unknown profiler '{kind}', expected one of {tuple(PROFILERS)}")
+        self.stop_profiling()
+        self.profiler = PROFILERS[kind](**options)
+
+    def stop_profiling(self):
+        """Stop profiling; returns the final profile report (None if not profiling)"""
+        profiler, self.profiler = self.profiler, None
+        if profiler is None:
+            return None
+        profiler.stop()
+        return profiler.get_stats()
 
     def run_step(self):
         """Execute one simulation step for all drones"""
+        timer, profiler, step_metrics = self.phase_timer, self.profiler, self.step_metrics
+        if timer is None and profiler is None and step_metrics is None:
+            should_continue = self._advance_drones()
+            for hook in self.step_hooks:
+                hook(self)
+            return should_continue
+
+        if profiler is not None:
+            profiler.step_started()
+        started = time.perf_counter()
+        should_continue = self._advance_drones()
+        for hook in self.step_hooks:
+            if timer is None:
+                hook(self)
+            else:
+                timer.call(f'hook:{_hook_name(hook)}', None, hook, self)
+        elapsed = time.perf_counter() - started
+        if timer is not None:
+            timer.record('step', None, elapsed)
+        if step_metrics is not None:
+            step_metrics.step_finished(elapsed)
+        if profiler is not None:
+            profiler.step_finished()
+        return should_continue
+
+    def _advance_drones(self):
+        """Move every drone once and update mission completion"""
         self.step_count += 1
+        event_log.step = self.step_count
+        self.environment.update_nfz_schedule(self.step_count)  # Time-activated NFZs
+        timer = self.phase_timer
+        if self.reservations is not None:
+            if timer is None:
+                self._plan_reserved_legs()
+            else:
+                timer.call('plan_legs', None, self._plan_reserved_legs)
         all_drones_completed = True
         any_drone_moved = False
 
@@ -18,21 +113,32 @@ class SimulationEngine:
         for i, drone in enumerate(self.drones):
             navigator = self.navigators[i]
 
-            next_position = navigator.get_next_position(drone.position)
+            if timer is None:
+                next_position = navigator.get_next_position(drone.position)
+            else:
+                next_position = timer.call('navigate', drone.drone_id, navigator.get_next_position, drone.position)
 
             if next_position is None:
-                print(f"✅ Drone {drone.drone_id} completed its mission")
+                if event_log.level <= INFO:
+                    event_log.emit('engine.drone_completed', drone.drone_id, INFO)
                 continue  # This drone is done, but others might still be working
 
             all_drones_completed = False  # At least one drone still working
 
             if self.environment.is_valid_position(next_position):
-                drone.move_to(next_position)
-                drone.scan_area(self.environment)
+                battery, distance, found = drone.battery, drone.total_distance, len(drone.found_targets)
+                if timer is None:
+                    drone.move_to(next_position)
+                    drone.scan_area(self.environment)
+                else:
+                    timer.call('move', drone.drone_id, drone.move_to, next_position)
+                    timer.call('scan', drone.drone_id, drone.scan_area, self.environment)
+                self.fleet.record(drone, battery, distance, found)
                 any_drone_moved = True
 
                 if drone.check_battery_status() == "critical":
-                    print(f"🔋 Drone {drone.drone_id} critical battery - mission terminated")
+                    if event_log.level <= WARNING:
+                        event_log.emit('engine.critical_battery', drone.drone_id, WARNING, battery=drone.battery)
                     # Don't set mission_completed=True yet - other drones may continue
             else:
                 # Drone tried to move to invalid position, but still active
@@ -40,22 +146,108 @@ class SimulationEngine:
 
         # Mission complete only when ALL drones are done
         if all_drones_completed:
-            print("✅ All drones completed mission")
+            if event_log.level <= INFO:
+                event_log.emit('engine.mission_completed', level=INFO)
             self.mission_completed = True
             return False
 
         return any_drone_moved  # Continue if any drone is still active
 
+    def _plan_reserved_legs(self):
+        """Drop expired reservations, then plan a leg for every drone that has used up its last one"""
+        self.reservations.advance(self.step_count)
+        legs = []
+        waiting = []
+        for drone, navigator in zip(self.drones, self.navigators):
+            if navigator.needs_leg():
+                goal = navigator.next_leg_goal(drone.position)
+                if goal is not None:
+                    legs.append((drone.drone_id, drone.position, goal))
+                    waiting.append((drone, navigator))
+        if not legs:
+            return
+
+        routes = plan_legs(self.environment, self.reservations, legs, self.step_count, method=self.coordination)
+        for drone, navigator in waiting:
+            navigator.assign_leg(routes[drone.drone_id], drone.position)
+
+    def snapshot(self):
+        """Capture drones, navigators and environment so the mission can be restored or forked
+
+        Snapshots are immutable and cheap: the environment masks are shared copy-on-write.
+        """
+        return {
+            'step_count': self.step_count,
+            'mission_completed': self.mission_completed,
+            'environment': self.environment.snapshot(),
+            'drones': [drone.snapshot() for drone in self.drones],
+            'navigators': [navigator.snapshot() for navigator in self.navigators],
+            'reservations': self.reservations.snapshot() if self.reservations is not None else None
+        }
+
+    def restore(self, snapshot):
+        """Rewind (or fast-forward) this engine to a snapshot of the same mission"""
+        self.step_count = snapshot['step_count']
+        self.mission_completed = snapshot['mission_completed']
+        self.environment.restore(snapshot['environment'])
+        for drone, state in zip(self.drones, snapshot['drones']):
+            drone.restore(state)
+        for navigator, state in zip(self.navigators, snapshot['navigators']):
+            navigator.restore(state)
+        if self.reservations is not None and snapshot['reservations'] is not None:
+            self.reservations.restore(snapshot['reservations'])
+        self.fleet.recount(self.drones)
+
+    def fork(self, snapshot=None):
+        """Independent engine branched from snapshot (default: now) for what-if runs
+
+        The fork gets its own drones, navigators and sensors; step hooks are not copied.
+        """
+        snapshot = snapshot or self.snapshot()
+        environment = self.environment.fork(snapshot['environment'])
+        sensors = {}  # Drones sharing a sensor keep sharing one copy of it
+        drones = []
+        for drone in self.drones:
+            forked = copy.copy(drone)
+            if drone.sensor is not None:
+                forked.sensor = copy.deepcopy(drone.sensor, sensors)
+            drones.append(forked)
+        navigators = [navigator.fork(drone, environment) for navigator, drone in zip(self.navigators, drones)]
+
+        engine = SimulationEngine(drones, environment, navigators, coordination=self.coordination)
+        engine.restore(snapshot)
+        return engine
+
     def get_mission_stats(self):
-        """Return current mission statistics"""
-        total_targets_found = sum(len(drone.found_targets) for drone in self.drones)
-        total_battery = sum(drone.battery for drone in self.drones)
+        """Return current mission statistics (plus 'timing' / 'profile' while instrumented)"""
+        stats = {
+            'steps': self.step_count,
+            'targets_found': self.fleet.targets_found,
+            'targets_remaining': self.environment.count_targets(),
+            'battery_remaining': self.fleet.battery,
+            'mission_completed': self.mission_completed,
+            'active_drones': self.fleet.active_drones
+        }
+        if self.phase_timer is not None:
+            stats['timing'] = self.phase_timer.get_stats()
+        if self.profiler is not None:
+            stats['profile'] = self.profiler.get_stats()
+        return stats
 
+    def get_fleet_metrics(self):
+        """Live fleet aggregates (what MetricsServer exports) - O(1) per call"""
         return {
             'steps': self.step_count,
-            'targets_found': total_targets_found,
-            'targets_remaining': len(self.environment.targets),
-            'battery_remaining': total_battery,
+            'targets_found': self.fleet.targets_found,
+            'targets_remaining': self.environment.count_targets(),
+            'battery_remaining': self.fleet.battery,
+            'active_drones': self.fleet.active_drones,
+            'distance_traveled': self.fleet.distance,
             'mission_completed': self.mission_completed,
-            'active_drones': len([d for d in self.drones if d.battery > 0])
-        }
\ No newline at end of file
+            'steps_per_second': self.step_metrics.steps_per_second() if self.step_metrics is not None else 0.0
+        }
+
+
+def _hook_name(hook):
+    """Readable name for a step hook (function, bound method or callable object)"""
+    return getattr(hook, '__qualname__', None) or type(hook).__qualname__
@@ -0,0 +1,318 @@
+import numpy as np
+
+from algorithms.astar import AStarPlanner
+from algorithms.route_cache import RouteCache, shared_route_cache
+from models.drone import RescueDrone
+from utils.event_log import event_log, INFO
+
+
+class FleetEngine:
+    """Vectorized struct-of-arrays engine that steps a whole drone fleet with array operations"""
+
+    def __init__(self, environment, start_positions, waypoint_lists, battery=2000,
+                 drone_ids=None, colors=None, record_paths=False, route_cache=shared_route_cache, sensor=None):
+        self.environment = environment
+        self.sensor = sensor  # Fleet-wide SensorFootprint, or None for exact-cell scanning
+        self.planner = AStarPlanner(environment)
+        self.route_cache = route_cache
+        self._bypass = {}  # drone index -> remaining bypass cells (reversed)
+        self.num_drones = len(start_positions)
+        n = self.num_drones
+
+        # Fleet state - one row per drone
+        self.positions = np.array(start_positions, dtype=np.int64).reshape(n, 2)
+        self.battery = np.broadcast_to(np.asarray(battery, dtype=np.int64), (n,)).copy()
+        self.waypoint_index = np.zeros(n, dtype=np.int64)
+        self.total_distance = np.zeros(n, dtype=np.int64)
+        self.active = np.ones(n, dtype=bool)
+
+        # Waypoints padded to a (drones, max_waypoints, 2) array
+        self.waypoint_counts = np.zeros(n, dtype=np.int64)
+        self.waypoints = np.zeros((n, 0, 2), dtype=np.int64)
+        for i, waypoint_list in enumerate(waypoint_lists):
+            self._store_waypoints(i, waypoint_list)
+
+        self.drone_ids = list(drone_ids) if drone_ids is not None else list(range(1, n + 1))
+        self.colors = list(colors) if colors is not None else ['blue'] * n
+
+        # Rarely-updated per-drone Python state
+        self.found_targets = [[] for _ in range(n)]
+        self.record_paths = record_paths
+        self.path_history = [[tuple(pos)] for pos in self.positions.tolist()] if record_paths else None
+
+        self.step_count = 0
+        self.mission_completed = False
+        self.step_hooks = []  # Callables invoked with the engine after every step
+        self._refresh_active()
+
+        # RescueDrone-compatible views over the arrays above
+        self.drones = [FleetDroneView(self, i) for i in range(n)]
+
+    @classmethod
+    def from_drones(cls, drones, environment, record_paths=True):
+        """Build a fleet from existing RescueDrone objects"""
+        return cls(
+            environment,
+            [drone.position for drone in drones],
+            [drone.waypoints for drone in drones],
+            battery=[drone.battery for drone in drones],
+            drone_ids=[drone.drone_id for drone in drones],
+            colors=[drone.color for drone in drones],
+            record_paths=record_paths
+        )
+
+    def add_step_hook(self, hook):
+        """Register hook(engine) to run after each step (recorders, renderers, ...)"""
+        self.step_hooks.append(hook)
+
+    def run_step(self):
+        """Advance every active drone one cell toward its current waypoint"""
+        should_continue = self._advance_fleet()
+        for hook in self.step_hooks:
+            hook(self)
+        return should_continue
+
+    def _advance_fleet(self):
+        """Vectorized move of the whole fleet"""
+        self.step_count += 1
+        event_log.step = self.step_count
+        self.environment.update_nfz_schedule(self.step_count)  # Time-activated NFZs
+        self._advance_reached_waypoints()
+
+        movers = np.flatnonzero(self.active)
+        if movers.size == 0:
+            self.mission_completed = True
+            return False
+
+        positions = self.positions[movers]
+        goals = self.waypoints[movers, self.waypoint_index[movers]]
+        direction = np.sign(goals - positions)
+
+        # Prioritize row movement, as RescueDrone.get_next_waypoint_position does
+        row_first = direction.copy()
+        row_first[direction[:, 0] != 0, 1] = 0
+        candidates = positions + row_first
+        valid = self._valid_mask(candidates)
+
+        # Row step blocked - try the column step instead
+        retry = ~valid & (direction[:, 0] != 0) & (direction[:, 1] != 0)
+        if np.any(retry):
+            column_step = positions[retry] + np.column_stack((np.zeros(retry.sum(), dtype=np.int64),
+                                                               direction[retry, 1]))
+            column_valid = self._valid_mask(column_step)
+            retry_idx = np.flatnonzero(retry)
+            candidates[retry_idx[column_valid]] = column_step[column_valid]
+            valid[retry_idx[column_valid]] = True
+
+        # Drones already following a bypass route take its next cell, unless an NFZ
+        # switched on over it since it was planned - those replan below
+        if self._bypass:
+            followers = np.fromiter(self._bypass, dtype=np.int64, count=len(self._bypass))
+            slots = np.searchsorted(movers, followers)
+            for drone, k in zip(followers.tolist(), slots.tolist()):
+                route = self._bypass[drone]
+                if k >= movers.size or movers[k] != drone:
+                    del self._bypass[drone]  # Drone finished or ran out of battery
+                    continue
+                if not self.environment.is_valid_position(route[-1]):
+                    del self._bypass[drone]
+                    valid[k] = False
+                    continue
+                candidates[k] = route.pop()
+                valid[k] = True
+                if not route:
+                    del self._bypass[drone]
+
+        # Still blocked - plan an A* bypass around the NFZ (shared through the route cache)
+        for k in np.flatnonzero(~valid):
+            drone = movers[k]
+            route = self._plan_bypass(tuple(positions[k].tolist()), tuple(goals[k].tolist()))
+            if not route:
+                self.waypoint_index[drone] += 1  # Unreachable waypoint - skip it
+                continue
+            candidates[k] = route[0]
+            valid[k] = True
+            if len(route) > 1:
+                self._bypass[drone] = route[:0:-1]  # Reversed remainder, consumed with pop()
+
+        moved = movers[valid]
+        new_positions = candidates[valid]
+        self.positions[moved] = new_positions
+        self.battery[moved] -= 1
+        self.total_distance[moved] += 1
+
+        if self.record_paths:
+            for drone, pos in zip(moved.tolist(), new_positions.tolist()):
+                self.path_history[drone].append(tuple(pos))
+
+        if self.sensor is None:
+            # Target hits via bitmap lookup
+            hits = self.environment.target_mask[new_positions[:, 0], new_positions[:, 1]]
+            if np.any(hits):
+                for drone, pos in zip(moved[hits].tolist(), new_positions[hits].tolist()):
+                    self._collect_target(drone, tuple(pos))
+        else:
+            self._scan_footprints(moved, new_positions)
+
+        self._refresh_active()
+        return True
+
+    def get_mission_stats(self):
+        """Return current mission statistics (same keys as SimulationEngine)"""
+        return {
+            'steps': self.step_count,
+            'targets_found': sum(len(found) for found in self.found_targets),
+            'targets_remaining': self.environment.count_targets(),
+            'battery_remaining': int(self.battery.sum()),
+            'mission_completed': self.mission_completed,
+            'active_drones': int(np.count_nonzero(self.battery > 0))
+        }
+
+    def _advance_reached_waypoints(self):
+        """Move waypoint indices past any waypoint the drone is standing on"""
+        candidates = np.flatnonzero(self.active)
+        while candidates.size:
+            goals = self.waypoints[candidates, self.waypoint_index[candidates]]
+            reached = np.all(self.positions[candidates] == goals, axis=1)
+            candidates = candidates[reached]
+            self.waypoint_index[candidates] += 1
+            candidates = candidates[self.waypoint_index[candidates] < self.waypoint_counts[candidates]]
+        self._refresh_active()
+
+    def _plan_bypass(self, start, goal):
+        """Plan (or fetch from the route cache) an NFZ-avoiding route to goal"""
+        if self.route_cache is None:
+            return self.planner.plan(start, goal)
+
+        key = RouteCache.make_key(self.environment, 'astar', start, goal)
+        route = self.route_cache.get(key)
+        if route is None:
+            route = self.planner.plan(start, goal) or []
+            self.route_cache.put(key, route)
+        return route
+
+    def _refresh_active(self):
+        """Drone is active while it has battery and waypoints left"""
+        self.active = (self.battery > 0) & (self.waypoint_index < self.waypoint_counts)
+
+    def _valid_mask(self, positions):
+        """Vectorized is_valid_position: bounds check plus NFZ mask fancy indexing"""
+        rows, cols = positions[:, 0], positions[:, 1]
+        inside = (rows >= 0) & (rows < self.environment.rows) & (cols >= 0) & (cols < self.environment.cols)
+        valid = inside.copy()
+        valid[inside] = ~self.environment.nfz_mask[rows[inside], cols[inside]]
+        return valid
+
+    def _scan_footprints(self, drones, positions):
+        """Footprint scan: vectorized summed-area-table counts, detailed scan only near targets"""
+        radius = self.sensor.radius
+        rows, cols = positions[:, 0], positions[:, 1]
+        counts = self.environment.count_targets_in_window(rows - radius, cols - radius,
+                                                          rows + radius, cols + radius)
+        nearby = counts > 0
+        for drone, pos in zip(drones[nearby].tolist(), positions[nearby].tolist()):
+            for target in self.sensor.scan(self.environment, pos):
+                self._collect_target(drone, target)
+
+    def _collect_target(self, drone, position):
+        """Record a found target and remove it from the bitmap and environment"""
+        if not self.environment.remove_target(position):
+            return False  # Another drone collected it this step
+        self.found_targets[drone].append(position)
+        if event_log.level <= INFO:
+            event_log.emit('drone.target_found', self.drone_ids[drone], INFO, position=position)
+        return True
+
+    def _store_waypoints(self, drone, waypoint_list):
+        """Write one drone's waypoints into the padded array, growing it if needed"""
+        points = [wp['position'] if isinstance(wp, dict) else wp for wp in waypoint_list]
+        if len(points) > self.waypoints.shape[1]:
+            padded = np.zeros((self.num_drones, len(points), 2), dtype=np.int64)
+            padded[:, :self.waypoints.shape[1]] = self.waypoints
+            self.waypoints = padded
+        if points:
+            self.waypoints[drone, :len(points)] = points
+        self.waypoint_counts[drone] = len(points)
+        self.waypoint_index[drone] = 0
+        self._bypass.pop(drone, None)
+
+
+class FleetDroneView(RescueDrone):
+    """RescueDrone API backed by one row of a FleetEngine's arrays"""
+
+    def __init__(self, fleet, index):
+        # Deliberately skip RescueDrone.__init__ - all state lives in the fleet arrays
+        self.fleet = fleet
+        self.index = index
+
+    @property
+    def drone_id(self):
+        return self.fleet.drone_ids[self.index]
+
+    @property
+    def color(self):
+        return self.fleet.colors[self.index]
+
+    @property
+    def position(self):
+        return tuple(self.fleet.positions[self.index].tolist())
+
+    @position.setter
+    def position(self, value):
+        self.fleet.positions[self.index] = value
+
+    @property
+    def battery(self):
+        return int(self.fleet.battery[self.index])
+
+    @battery.setter
+    def battery(self, value):
+        self.fleet.battery[self.index] = value
+
+    @property
+    def total_distance(self):
+        return int(self.fleet.total_distance[self.index])
+
+    @total_distance.setter
+    def total_distance(self, value):
+        self.fleet.total_distance[self.index] = value
+
+    @property
+    def current_waypoint_index(self):
+        return int(self.fleet.waypoint_index[self.index])
+
+    @current_waypoint_index.setter
+    def current_waypoint_index(self, value):
+        self.fleet.waypoint_index[self.index] = value
+
+    @property
+    def waypoints(self):
+        count = self.fleet.waypoint_counts[self.index]
+        return [tuple(wp) for wp in self.fleet.waypoints[self.index, :count].tolist()]
+
+    @property
+    def path_history(self):
+        if self.fleet.path_history is None:
+            return [self.position]  # Paths not recorded - only the current position is known
+        return self.fleet.path_history[self.index]
+
+    @property
+    def found_targets(self):
+        return self.fleet.found_targets[self.index]
+
+    @property
+    def sensor(self):
+        return self.fleet.sensor
+
+    def set_waypoints(self, waypoint_list):
+        """Assign waypoints for navigation mission"""
+        self.fleet._store_waypoints(self.index, waypoint_list)
+        self.fleet._refresh_active()
+
+    def scan_area(self, environment):
+        """Scan current position (or the fleet sensor footprint), crediting targets to this row"""
+        if self.sensor is None:
+            return self.fleet._collect_target(self.index, self.position)
+        found = [self.fleet._collect_target(self.index, target)
+                 for target in self.sensor.scan(environment, self.position)]
+        return any(found)
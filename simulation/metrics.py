@@ -0,0 +1,194 @@
+import bisect
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Step-latency histogram bucket upper bounds in seconds (Prometheus 'le' labels)
+LATENCY_BUCKETS = (0.0001, 0.00025, 0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+PROMETHEUS_CONTENT_TYPE = 'text/plain; version=0.0.4; charset=utf-8'
+
+
+class FleetAggregates:
+    """Fleet totals kept up to date from per-move deltas instead of re-summed over every drone"""
+
+    def __init__(self, drones):
+        self.recount(drones)
+
+    def recount(self, drones):
+        """Full O(n) recount - after construction, restore, or editing drones outside run_step"""
+        self.targets_found = sum(len(drone.found_targets) for drone in drones)
+        self.battery = sum(drone.battery for drone in drones)
+        self.active_drones = sum(1 for drone in drones if drone.battery > 0)
+        self.distance = sum(drone.total_distance for drone in drones)
+
+    def record(self, drone, battery_before, distance_before, found_before):
+        """Apply one drone's changes since (battery, total_distance, found count) were read"""
+        self.battery += drone.battery - battery_before
+        self.distance += drone.total_distance - distance_before
+        self.targets_found += len(drone.found_targets) - found_before
+        if (battery_before > 0) != (drone.battery > 0):
+            self.active_drones += 1 if drone.battery > 0 else -1
+
+
+class RollingHistogram:
+    """Histogram over the last window_seconds, kept as a ring of per-slot bucket counts
+
+    Observations only touch the current slot; slots older than the window are
+    cleared as time moves on, so memory and cost stay constant however long the
+    run is.
+    """
+
+    def __init__(self, window_seconds=60.0, slots=12, buckets=LATENCY_BUCKETS, clock=time.monotonic):
+        self.window_seconds = window_seconds
+        self.slot_seconds = window_seconds / slots
+        self.buckets = buckets
+        self.clock = clock
+        self._counts = [[0] * (len(buckets) + 1) for _ in range(slots)]  # Last: slower than every bucket
+        self._sums = [0.0] * slots
+        self._slot_ids = [None] * slots  # Absolute slot number each ring entry currently holds
+        self._lock = threading.Lock()
+
+    def observe(self, value):
+        slot_id = int(self.clock() / self.slot_seconds)
+        index = slot_id % len(self._counts)
+        with self._lock:
+            if self._slot_ids[index] != slot_id:
+                self._counts[index] = [0] * (len(self.buckets) + 1)
+                self._sums[index] = 0.0
+                self._slot_ids[index] = slot_id
+            self._counts[index][bisect.bisect_left(self.buckets, value)] += 1
+            self._sums[index] += value
+
+    def snapshot(self):
+        """Return (cumulative bucket counts incl. +Inf, sum, count) over the window"""
+        oldest = int(self.clock() / self.slot_seconds) - len(self._counts) + 1
+        totals = [0] * (len(self.buckets) + 1)
+        total_sum = 0.0
+        with self._lock:
+            for counts, slot_sum, slot_id in zip(self._counts, self._sums, self._slot_ids):
+                if slot_id is None or slot_id < oldest:
+                    continue
+                totals = [a + b for a, b in zip(totals, counts)]
+                total_sum += slot_sum
+        cumulative, running = [], 0
+        for count in totals:
+            running += count
+            cumulative.append(running)
+        return cumulative, total_sum, running
+
+
+class StepMetrics:
+    """Rolling step latency and step rate for an engine (see SimulationEngine.enable_metrics)"""
+
+    def __init__(self, window_seconds=60.0, clock=time.monotonic):
+        self.clock = clock
+        self.window_seconds = window_seconds
+        self.latency = RollingHistogram(window_seconds, clock=clock)
+        self._finished = deque()  # Step completion times inside the window
+
+    def step_finished(self, seconds):
+        now = self.clock()
+        self.latency.observe(seconds)
+        self._finished.append(now)
+        cutoff = now - self.window_seconds
+        while self._finished[0] < cutoff:
+            self._finished.popleft()
+
+    def steps_per_second(self):
+        """Steps completed per second over the rolling window"""
+        finished = list(self._finished)
+        if len(finished) < 2:
+            return 0.0
+        elapsed = finished[-1] - finished[0]
+        return (len(finished) - 1) / elapsed if elapsed > 0 else 0.0
+
+
+def render_prometheus(engine, prefix='drone_mission'):
+    """Prometheus text exposition of an engine's fleet aggregates and rolling step latency"""
+    metrics = engine.get_fleet_metrics()
+    lines = []
+
+    def sample(name, kind, help_text, value):
+        lines.append(f"# HELP {prefix}_{name} {help_text}")
+        lines.append(f"# TYPE {prefix}_{name} {kind}")
+        lines.append(f"{prefix}_{name} {value}")
+
+    sample('steps_total', 'counter', "Simulation steps executed", metrics['steps'])
+    sample('targets_found_total', 'counter', "Targets found by the fleet", metrics['targets_found'])
+    sample('targets_remaining', 'gauge', "Targets still in the environment", metrics['targets_remaining'])
+    sample('battery_remaining', 'gauge', "Battery summed over all drones", metrics['battery_remaining'])
+    sample('active_drones', 'gauge', "Drones with battery left", metrics['active_drones'])
+    sample('distance_total', 'counter', "Grid cells flown by the fleet", metrics['distance_traveled'])
+    sample('completed', 'gauge', "1 once every drone has finished", int(metrics['mission_completed']))
+    sample('steps_per_second', 'gauge', "Steps per second over the rolling window", metrics['steps_per_second'])
+
+    step_metrics = engine.step_metrics
+    if step_metrics is not None:
+        cumulative, total, count = step_metrics.latency.snapshot()
+        name = f"{prefix}_step_latency_seconds"
+        lines.append(f"# HELP {name} run_step latency over the last {step_metrics.window_seconds:g}s")
+        lines.append(f"# TYPE {name} histogram")
+        for bound, value in zip(step_metrics.latency.buckets, cumulative):
+            lines.append(f'{name}_bucket{{le="{bound:g}"}} {value}')
+        lines.append(f'{name}_bucket{{le="+Inf"}} {cumulative[-1]}')
+        lines.append(f"{name}_sum {total}")
+        lines.append(f"{name}_count {count}")
+    return "\n".join(lines) + "\n"
+
+
+class MetricsServer:
+    """Serves an engine's metrics as Prometheus text at http://host:port/metrics from a daemon thread
+
+    Scrapes only read the engine's running aggregates, so watching a long
+    headless run adds no per-step work beyond the engine's step metrics.
+    """
+
+    def __init__(self, engine, host='127.0.0.1', port=9100, prefix='drone_mission'):
+        self.engine = engine
+        self.prefix = prefix
+        if engine.step_metrics is None:
+            engine.enable_metrics()
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/metrics', '/'):
+                    self.send_error(404)
+                    return
+                body = render_prometheus(server.engine, server.prefix).encode()
+                self.send_response(200)
+                self.send_header('Content-Type', PROMETHEUS_CONTENT_TYPE)
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format, *args):
+                pass  # Keep scrapes out of the simulation's console output
+
+        self._httpd = ThreadingHTTPServer((host, port), Handler)
+        self._thread = None
+
+    @property
+    def address(self):
+        """(host, port) actually bound - port 0 picks a free one"""
+        return self._httpd.server_address[:2]
+
+    def start(self):
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name='metrics-server', daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
@@ -0,0 +1,183 @@
+import bisect
+import cProfile
+import io
+import pstats
+import sys
+import threading
+import time
+from collections import Counter
+
+# Histogram bucket upper bounds in seconds: 1us to 10s, about three buckets per decade
+BUCKET_BOUNDS = tuple(round(10 ** (exponent / 3), 9) for exponent in range(-18, 4))
+
+
+class PhaseHistogram:
+    """Count, total, max and log-bucketed histogram of one phase's durations"""
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+        self.buckets = [0] * (len(BUCKET_BOUNDS) + 1)  # Last bucket: slower than every bound
+
+    def add(self, seconds):
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+        self.buckets[bisect.bisect_left(BUCKET_BOUNDS, seconds)] += 1
+
+    def percentile(self, percent):
+        """Upper bound of the bucket holding the given percentile (max for the overflow bucket)"""
+        if not self.count:
+            return 0.0
+        rank = percent / 100 * self.count
+        seen = 0
+        for index, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank and count:
+                return min(BUCKET_BOUNDS[index], self.max) if index < len(BUCKET_BOUNDS) else self.max
+        return self.max
+
+    def get_stats(self):
+        histogram = {f'<={bound:g}s': count for bound, count in zip(BUCKET_BOUNDS, self.buckets) if count}
+        if self.buckets[-1]:
+            histogram[f'>{BUCKET_BOUNDS[-1]:g}s'] = self.buckets[-1]
+        return {
+            'count': self.count,
+            'total': self.total,
+            'mean': self.total / self.count if self.count else 0.0,
+            'max': self.max,
+            'p50': self.percentile(50),
+            'p95': self.percentile(95),
+            'p99': self.percentile(99),
+            'histogram': histogram
+        }
+
+
+class PhaseTimer:
+    """Per-phase and per-drone duration histograms for SimulationEngine steps"""
+
+    def __init__(self):
+        self.phases = {}  # phase -> PhaseHistogram
+        self.drones = {}  # drone_id -> {phase: PhaseHistogram}
+
+    def call(self, phase, drone_id, function, *args):
+        """Run function(*args), charge its duration to phase (and drone_id if given), return its result"""
+        started = time.perf_counter()
+        result = function(*args)
+        self.record(phase, drone_id, time.perf_counter() - started)
+        return result
+
+    def record(self, phase, drone_id, seconds):
+        histogram = self.phases.get(phase)
+        if histogram is None:
+            histogram = self.phases[phase] = PhaseHistogram()
+        histogram.add(seconds)
+        if drone_id is not None:
+            per_drone = self.drones.setdefault(drone_id, {})
+            histogram = per_drone.get(phase)
+            if histogram is None:
+                histogram = per_drone[phase] = PhaseHistogram()
+            histogram.add(seconds)
+
+    def get_stats(self):
+        """Return {'phases': {phase: stats}, 'drones': {drone_id: {phase: stats}}}"""
+        return {
+            'phases': {phase: histogram.get_stats() for phase, histogram in self.phases.items()},
+            'drones': {drone_id: {phase: histogram.get_stats() for phase, histogram in phases.items()}
+                       for drone_id, phases in self.drones.items()}
+        }
+
+
+class StepProfiler:
+    """cProfile switched on only while SimulationEngine.run_step is executing"""
+
+    kind = 'cprofile'
+
+    def __init__(self):
+        self.profile = cProfile.Profile()
+        self.steps = 0  # Profiled steps - pstats refuses a profile with no data
+
+    def step_started(self):
+        self.profile.enable()
+
+    def step_finished(self):
+        self.profile.disable()
+        self.steps += 1
+
+    def stop(self):
+        pass
+
+    def get_stats(self, limit=20):
+        """Top functions by cumulative time, as pstats text ('' before the first profiled step)"""
+        if not self.steps:
+            return ''
+        output = io.StringIO()
+        pstats.Stats(self.profile, stream=output).sort_stats('cumulative').print_stats(limit)
+        return output.getvalue()
+
+
+class SamplingProfiler:
+    """Background thread sampling the simulation thread's stack every interval seconds
+
+    Much lower overhead than cProfile: the simulation thread is never traced,
+    only its current frame is inspected from the sampler thread.
+    """
+
+    kind = 'sampling'
+
+    def __init__(self, interval=0.005, thread_id=None):
+        self.interval = interval
+        self.thread_id = thread_id or threading.get_ident()
+        self.samples = 0
+        self.functions = Counter()  # 'file:first_line(function)' of the innermost frame -> samples
+        self.stacks = Counter()     # Same, counted once for every frame on the stack
+        self._in_step = False
+        self._stopped = threading.Event()
+        self._thread = threading.Thread(target=self._run, name='simulation-sampler', daemon=True)
+        self._thread.start()
+
+    def step_started(self):
+        self._in_step = True
+
+    def step_finished(self):
+        self._in_step = False
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+
+    def get_stats(self, limit=20):
+        """Most sampled functions: self (innermost frame) and cumulative (anywhere on the stack)"""
+        return {
+            'samples': self.samples,
+            'interval': self.interval,
+            'self': self.functions.most_common(limit),
+            'cumulative': self.stacks.most_common(limit)
+        }
+
+    def _run(self):
+        while not self._stopped.wait(self.interval):
+            if not self._in_step:
+                continue
+            frame = sys._current_frames().get(self.thread_id)
+            if frame is None:
+                continue
+            self.samples += 1
+            self.functions[_describe(frame)] += 1
+            seen = set()
+            while frame is not None:
+                name = _describe(frame)
+                if name not in seen:
+                    seen.add(name)
+                    self.stacks[name] += 1
+                frame = frame.f_back
+
+
+PROFILERS = {'cprofile': StepProfiler, 'sampling': SamplingProfiler}
+
+
+def _describe(frame):
+    code = frame.f_code
+    return f"{code.co_filename}:{code.co_firstlineno}({code.co_name})"
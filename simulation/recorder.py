@@ -0,0 +1,185 @@
+import os
+import struct
+
+import numpy as np
+
+# Fixed-width record per drone per step
+STATE_DTYPE = np.dtype([
+    ('step', '<i4'),
+    ('drone_id', '<i4'),
+    ('row', '<i4'),
+    ('col', '<i4'),
+    ('battery', '<i4'),
+    ('waypoint_index', '<i4'),
+    ('targets_found', '<i4'),
+])
+
+# One record per collected target, stored in the sidecar ".events" file
+EVENT_DTYPE = np.dtype([
+    ('step', '<i4'),
+    ('drone_id', '<i4'),
+    ('row', '<i4'),
+    ('col', '<i4'),
+])
+
+MAGIC = b'DRTRAJ01'
+_HEADER = struct.Struct('<8sii')  # magic, num_drones, first step
+
+
+class TrajectoryRecorder:
+    """Appends per-step fleet state to a chunked binary trajectory file
+
+    Attach with ``engine.add_step_hook(recorder.record)``. Each step writes one
+    STATE_DTYPE record per drone, so step k lives at a fixed file offset. That
+    needs consecutive step numbers: after SimulationEngine.restore() rewinds or
+    skips steps, record() raises ValueError - start a new recorder (file) there.
+    """
+
+    def __init__(self, file_path, drones, chunk_steps=1024):
+        self.file_path = file_path
+        self.drone_ids = np.array([drone.drone_id for drone in drones], dtype='<i4')
+        self.num_drones = len(self.drone_ids)
+        self.chunk = np.zeros((chunk_steps, self.num_drones), dtype=STATE_DTYPE)
+        self.chunk_fill = 0
+        self.steps_recorded = 0
+        self.first_step = None
+        self._found_counts = [len(drone.found_targets) for drone in drones]
+
+        self._file = open(file_path, 'wb')
+        self._events = open(file_path + '.events', 'wb')
+
+    def record(self, engine):
+        """Step hook: capture the fleet state after engine.run_step()"""
+        if self.first_step is None:
+            self.first_step = engine.step_count
+            self._write_header()
+        elif engine.step_count != self.first_step + self.steps_recorded:
+            raise ValueError(f"Step {engine.step_count} does not follow step "
+                             f"{self.first_step + self.steps_recorded - 1} in {self.file_path} - "
+                             f"start a new TrajectoryRecorder after restoring a snapshot")
+
+        if hasattr(engine, 'positions'):
+            self._record_fleet(engine)
+        else:
+            self._record_drones(engine.step_count, engine.drones)
+
+        self.chunk_fill += 1
+        self.steps_recorded += 1
+        if self.chunk_fill == len(self.chunk):
+            self.flush()
+
+    def flush(self):
+        """Write buffered steps to disk"""
+        if self.chunk_fill:
+            self._file.write(self.chunk[:self.chunk_fill].tobytes())
+            self.chunk_fill = 0
+        self._file.flush()
+        self._events.flush()
+
+    def close(self):
+        """Flush and close the trajectory files"""
+        if self._file.closed:
+            return
+        if self.first_step is None:
+            self.first_step = 0
+            self._write_header()
+        self.flush()
+        self._file.close()
+        self._events.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def _write_header(self):
+        self._file.write(_HEADER.pack(MAGIC, self.num_drones, self.first_step))
+        self._file.write(self.drone_ids.tobytes())
+
+    def _record_drones(self, step, drones):
+        row = self.chunk[self.chunk_fill]
+        row['step'] = step
+        row['drone_id'] = self.drone_ids
+        row['row'] = [drone.position[0] for drone in drones]
+        row['col'] = [drone.position[1] for drone in drones]
+        row['battery'] = [drone.battery for drone in drones]
+        row['waypoint_index'] = [drone.current_waypoint_index for drone in drones]
+        row['targets_found'] = [len(drone.found_targets) for drone in drones]
+        for i, drone in enumerate(drones):
+            found = drone.found_targets
+            if len(found) > self._found_counts[i]:
+                self._write_events(step, self.drone_ids[i], found[self._found_counts[i]:])
+                self._found_counts[i] = len(found)
+
+    def _record_fleet(self, fleet):
+        """Vectorized capture straight from a FleetEngine's arrays"""
+        row = self.chunk[self.chunk_fill]
+        row['step'] = fleet.step_count
+        row['drone_id'] = self.drone_ids
+        row['row'] = fleet.positions[:, 0]
+        row['col'] = fleet.positions[:, 1]
+        row['battery'] = fleet.battery
+        row['waypoint_index'] = fleet.waypoint_index
+        counts = np.fromiter((len(found) for found in fleet.found_targets), dtype=np.int64, count=self.num_drones)
+        row['targets_found'] = counts
+        for i in np.flatnonzero(counts > self._found_counts).tolist():
+            self._write_events(fleet.step_count, self.drone_ids[i], fleet.found_targets[i][self._found_counts[i]:])
+            self._found_counts[i] = int(counts[i])
+
+    def _write_events(self, step, drone_id, positions):
+        events = np.zeros(len(positions), dtype=EVENT_DTYPE)
+        events['step'] = step
+        events['drone_id'] = drone_id
+        events['row'], events['col'] = np.asarray(positions, dtype=np.int64).reshape(-1, 2).T
+        self._events.write(events.tobytes())
+
+
+class TrajectoryReader:
+    """Memory-mapped reader for files written by TrajectoryRecorder - O(1) seek to any step"""
+
+    def __init__(self, file_path):
+        with open(file_path, 'rb') as file:
+            magic, self.num_drones, self.first_step = _HEADER.unpack(file.read(_HEADER.size))
+            if magic != MAGIC:
+                raise ValueError(f"{file_path} is not a trajectory file")
+            self.drone_ids = np.frombuffer(file.read(4 * self.num_drones), dtype='<i4')
+
+        offset = _HEADER.size + 4 * self.num_drones
+        records = np.memmap(file_path, dtype=STATE_DTYPE, mode='r', offset=offset)
+        self.states = records.reshape(-1, self.num_drones)  # (steps, drones)
+        events_path = file_path + '.events'
+        if os.path.exists(events_path) and os.path.getsize(events_path):
+            self.events = np.memmap(events_path, dtype=EVENT_DTYPE, mode='r')
+        else:
+            self.events = np.zeros(0, dtype=EVENT_DTYPE)
+
+    @property
+    def num_steps(self):
+        return len(self.states)
+
+    def get_step(self, step):
+        """Return the (drones,) record array for a simulation step"""
+        index = step - self.first_step
+        if not 0 <= index < self.num_steps:
+            raise IndexError(f"Step {step} not recorded")
+        state = self.states[index]
+        if self.num_drones and state[0]['step'] != step:
+            raise ValueError(f"Step numbers in the trajectory are not consecutive (found {state[0]['step']} "
+                             f"where {step} belongs)")
+        return state
+
+    def positions(self, step):
+        """Return an (drones, 2) array of positions at a step"""
+        state = self.get_step(step)
+        return np.column_stack((state['row'], state['col']))
+
+    def drone_track(self, drone_id):
+        """Return the (steps,) record column for one drone"""
+        column = int(np.flatnonzero(self.drone_ids == drone_id)[0])
+        return self.states[:, column]
+
+    def events_for_step(self, step):
+        """Target collection events recorded at a step (events are stored in step order)"""
+        steps = self.events['step']
+        return self.events[np.searchsorted(steps, step, 'left'):np.searchsorted(steps, step, 'right')]
@@ -0,0 +1,169 @@
+import csv
+import io
+
+import numpy as np
+
+TEXT_DTYPE = np.dtype('U32')  # Fixed-width text columns (longer values are truncated)
+MISSING_INT = -1
+DEFAULT_CHUNK_BYTES = 16 * 1024 * 1024
+
+# Column schemas: name -> (dtype, required)
+TARGET_COLUMNS = {
+    'target_id': (np.dtype(np.int64), True),
+    'row': (np.dtype(np.int32), True),
+    'col': (np.dtype(np.int32), True),
+    'priority': (TEXT_DTYPE, True),
+}
+
+WAYPOINT_COLUMNS = {
+    'waypoint_id': (np.dtype(np.int64), True),
+    'row': (np.dtype(np.int32), True),
+    'col': (np.dtype(np.int32), True),
+    'priority': (TEXT_DTYPE, True),
+}
+
+# active_from / active_until are optional; missing or empty values load as -1
+NFZ_COLUMNS = {
+    'nfz_id': (np.dtype(np.int64), True),
+    'top_left_row': (np.dtype(np.int32), True),
+    'top_left_col': (np.dtype(np.int32), True),
+    'bottom_right_row': (np.dtype(np.int32), True),
+    'bottom_right_col': (np.dtype(np.int32), True),
+    'type': (TEXT_DTYPE, True),
+    'active_from': (np.dtype(np.int32), False),
+    'active_until': (np.dtype(np.int32), False),
+}
+
+
+class MalformedRowError(ValueError):
+    """A CSV data row that does not match the schema"""
+
+    def __init__(self, file_path, line_number, reason):
+        super().__init__(f"{file_path}:{line_number}: {reason}")
+        self.file_path = file_path
+        self.line_number = line_number
+        self.reason = reason
+
+
+def iter_csv_chunks(file_path, columns, chunk_bytes=DEFAULT_CHUNK_BYTES, errors='raise', malformed=None):
+    """Stream a CSV file as dicts of NumPy column arrays, one dict per ~chunk_bytes of input
+
+    Each block of whole lines is parsed by NumPy's C reader, so memory stays
+    bounded by the chunk size however large the file is. A block that fails to
+    parse is re-read row by row to find its bad rows: they raise MalformedRowError
+    with their 1-based line number, or with errors='skip' are dropped and appended
+    to the malformed list as (line_number, reason).
+    """
+    if errors not in ('raise', 'skip'):
+        raise ValueError("errors must be 'raise' or 'skip'")
+
+    with open(file_path, 'rb') as file:
+        header = [name.strip() for name in file.readline().decode('utf-8-sig').strip().split(',')]
+        missing = [name for name, (_, required) in columns.items() if required and name not in header]
+        if missing:
+            raise MalformedRowError(file_path, 1, f"missing columns {missing}")
+
+        parser = _BlockParser(file_path, columns, header, errors, malformed)
+        line_number = 2  # Line of the first row in the next block
+        remainder = b''
+        while True:
+            block = file.read(chunk_bytes)
+            data = remainder + block
+            remainder = b''
+            if block:
+                cut = data.rfind(b'\n') + 1
+                data, remainder = data[:cut], data[cut:]
+            if data:
+                yield parser.parse(data, line_number)
+                line_number += data.count(b'\n')
+            if not block:
+                break
+
+
+def load_csv_columns(file_path, columns, chunk_bytes=DEFAULT_CHUNK_BYTES, errors='raise', malformed=None):
+    """Load a whole CSV file into one dict of NumPy column arrays"""
+    chunks = list(iter_csv_chunks(file_path, columns, chunk_bytes, errors, malformed))
+    if not chunks:
+        return {name: np.empty(0, dtype=dtype) for name, (dtype, _) in columns.items()}
+    return {name: np.concatenate([chunk[name] for chunk in chunks]) for name in columns}
+
+
+def load_targets_columns(file_path, **options):
+    """Targets as columns: target_id, row, col, priority"""
+    return load_csv_columns(file_path, TARGET_COLUMNS, **options)
+
+
+def load_waypoints_columns(file_path, **options):
+    """Waypoints as columns: waypoint_id, row, col, priority"""
+    return load_csv_columns(file_path, WAYPOINT_COLUMNS, **options)
+
+
+def load_nfz_columns(file_path, **options):
+    """NFZ rectangles as columns (active_from / active_until are -1 when absent)"""
+    return load_csv_columns(file_path, NFZ_COLUMNS, **options)
+
+
+class _BlockParser:
+    """Parses newline-terminated blocks of CSV rows into column arrays"""
+
+    def __init__(self, file_path, columns, header, errors, malformed):
+        self.file_path = file_path
+        self.columns = columns
+        self.header = header
+        self.errors = errors
+        self.malformed = malformed
+        # Columns not in the schema are still read (as text) so the field count is checked
+        self.dtype = [(f'f{index}', columns[name][0] if name in columns else TEXT_DTYPE)
+                      for index, name in enumerate(header)]
+
+    def parse(self, data, first_line):
+        try:
+            table = np.loadtxt(io.BytesIO(data), delimiter=',', quotechar='"', dtype=self.dtype,
+                               ndmin=1, encoding='utf-8')
+        except ValueError:
+            return self._parse_rows(data, first_line)
+        return {name: (table[f'f{self.header.index(name)}'] if name in self.header
+                       else np.full(len(table), MISSING_INT, dtype=dtype))
+                for name, (dtype, _) in self.columns.items()}
+
+    def _parse_rows(self, data, first_line):
+        """Row-by-row parse of a block that has bad rows (or empty optional values)"""
+        values = {name: [] for name in self.columns}
+        reasons = {}
+        reader = csv.reader(io.StringIO(data.decode('utf-8', errors='replace'), newline=''))
+        for row in reader:
+            line = first_line + reader.line_num - 1
+            if not row:
+                continue
+            if len(row) != len(self.header):
+                reasons[line] = f"expected {len(self.header)} fields, found {len(row)}"
+                continue
+            fields = dict(zip(self.header, (field.strip() for field in row)))
+            parsed = {}
+            for name, (dtype, required) in self.columns.items():
+                value = fields.get(name, '')
+                if dtype.kind == 'U':
+                    parsed[name] = value
+                    continue
+                if value == '' and not required:
+                    parsed[name] = MISSING_INT
+                    continue
+                try:
+                    parsed[name] = int(value)
+                except ValueError:
+                    reasons[line] = f"bad integer {value!r} in column '{name}'"
+                    break
+                if not np.iinfo(dtype).min <= parsed[name] <= np.iinfo(dtype).max:
+                    reasons[line] = f"integer {value} out of range in column '{name}'"
+                    break
+            else:
+                for name, value in parsed.items():
+                    values[name].append(value)
+
+        if reasons:
+            if self.errors == 'raise':
+                line = min(reasons)
+                raise MalformedRowError(self.file_path, line, reasons[line])
+            if self.malformed is not None:
+                self.malformed.extend(sorted(reasons.items()))
+        return {name: np.array(values[name], dtype=dtype) for name, (dtype, _) in self.columns.items()}
@@ -75,6 +75,11 @@ def load_nfz_data(file_path):
                     'bottom_right': (int(row['bottom_right_row']), int(row['bottom_right_col'])),
                     'type': row['type']
                 }
+                # Optional schedule columns: steps the NFZ switches on / off
+                if row.get('active_from'):
+                    nfz['active_from'] = int(row['active_from'])
+                if row.get('active_until'):
+                    nfz['active_until'] = int(row['active_until'])
                 nfz_rectangles.append(nfz)
             return nfz_rectangles
 
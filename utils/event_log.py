@@ -0,0 +1,151 @@
+import json
+import time
+from collections import deque
+
+# Event levels (higher = more important); OFF disables the log entirely
+DEBUG = 10
+INFO = 20
+WARNING = 30
+OFF = 100
+
+LEVEL_NAMES = {DEBUG: 'debug', INFO: 'info', WARNING: 'warning'}
+
+# Console rendering for known event kinds
+CONSOLE_TEMPLATES = {
+    'drone.move': "🚁 Drone {drone_id} moved to {position} | Battery: {battery}",
+    'drone.target_found': "🎯 Drone {drone_id} found target at {position}",
+    'drone.waypoint_reached': "📍 Reached waypoint {waypoint_number}",
+    'drone.waypoints_complete': "✅ Mission complete - all waypoints visited",
+    'nav.stuck': "🔄 Detected stuck condition, using direct pathfinding",
+    'nav.blocked': "🚧 Path blocked to {position}, calculating safe route...",
+    'nav.route_search': "🎯 Finding safe route from {start} to waypoint {goal}",
+    'nav.no_route': "🚨 No safe route found, moving to next waypoint",
+    'nav.holding': "⏳ Drone {drone_id} holding at {position} - no conflict-free route yet",
+    'engine.drone_completed': "✅ Drone {drone_id} completed its mission",
+    'engine.critical_battery': "🔋 Drone {drone_id} critical battery - mission terminated",
+    'engine.mission_completed': "✅ All drones completed mission",
+}
+
+
+class Event:
+    """A single structured simulation event"""
+
+    __slots__ = ('step', 'drone_id', 'kind', 'level', 'payload', 'timestamp')
+
+    def __init__(self, step, drone_id, kind, level, payload):
+        self.step = step
+        self.drone_id = drone_id
+        self.kind = kind
+        self.level = level
+        self.payload = payload
+        self.timestamp = time.time()
+
+    def to_dict(self):
+        """Return a JSON-serializable representation"""
+        return {
+            'step': self.step,
+            'drone_id': self.drone_id,
+            'kind': self.kind,
+            'level': LEVEL_NAMES.get(self.level, self.level),
+            'payload': self.payload,
+            'timestamp': self.timestamp
+        }
+
+
+class NullSink:
+    """Discards events (they still land in the ring buffer)"""
+
+    def write(self, event):
+        pass
+
+    def close(self):
+        pass
+
+
+class ConsoleSink:
+    """Prints events in the simulation's human-readable console format"""
+
+    def write(self, event):
+        template = CONSOLE_TEMPLATES.get(event.kind)
+        if template is None:
+            print(f"[{event.kind}] step={event.step} drone={event.drone_id} {event.payload}")
+        else:
+            print(template.format(drone_id=event.drone_id, **event.payload))
+
+    def close(self):
+        pass
+
+
+class JsonLinesSink:
+    """Appends one JSON object per event to a file"""
+
+    def __init__(self, file_path):
+        self.file = open(file_path, 'a')
+
+    def write(self, event):
+        self.file.write(json.dumps(event.to_dict(), default=_json_default) + "\n")
+
+    def close(self):
+        self.file.close()
+
+
+class EventLog:
+    """Level-gated event stream with a bounded ring buffer and pluggable sinks
+
+    Hot-path callers should check ``event_log.level <= LEVEL`` before emitting
+    so that a disabled log costs a single attribute comparison.
+    """
+
+    def __init__(self, level=OFF, capacity=10000, sinks=None):
+        self.level = level
+        self.step = 0  # Current simulation step, maintained by the engine
+        self.buffer = deque(maxlen=capacity)
+        self.sinks = list(sinks) if sinks else []
+
+    def configure(self, level=None, sinks=None, capacity=None):
+        """Change level, replace sinks (closing the old ones) or resize the ring buffer"""
+        if level is not None:
+            self.level = level
+        if sinks is not None:
+            for sink in self.sinks:
+                sink.close()
+            self.sinks = list(sinks)
+        if capacity is not None:
+            self.buffer = deque(self.buffer, maxlen=capacity)
+
+    def emit(self, kind, drone_id=None, level=INFO, **payload):
+        """Record an event if its level passes the gate"""
+        if level < self.level:
+            return None
+
+        event = Event(self.step, drone_id, kind, level, payload)
+        self.buffer.append(event)
+        for sink in self.sinks:
+            sink.write(event)
+        return event
+
+    def recent(self, kind=None, drone_id=None):
+        """Return buffered events, optionally filtered by kind and drone"""
+        return [event for event in self.buffer
+                if (kind is None or event.kind == kind) and (drone_id is None or event.drone_id == drone_id)]
+
+    def clear(self):
+        """Drop all buffered events"""
+        self.buffer.clear()
+
+    def close(self):
+        """Close all sinks"""
+        for sink in self.sinks:
+            sink.close()
+        self.sinks = []
+
+
+def _json_default(value):
+    """Serialize NumPy scalars and other non-JSON values"""
+    if hasattr(value, 'item'):
+        return value.item()
+    return str(value)
+
+
+# Process-wide event log - disabled until configured (see main.py)
+event_log = EventLog()
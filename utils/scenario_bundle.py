@@ -0,0 +1,250 @@
+import argparse
+import hashlib
+import os
+import zipfile
+
+import numpy as np
+
+from models.environment import SearchEnvironment
+from utils.columnar_loader import load_nfz_columns, load_targets_columns, load_waypoints_columns, MISSING_INT
+from utils.data_loader import load_mission_data, load_drone_starts
+
+# CSV files a scenario directory holds (their mtimes are recorded to detect stale bundles)
+SOURCE_FILES = ('missions.csv', 'drone_starts.csv', 'targets.csv', 'nfz.csv', 'waypoints.csv')
+
+BUNDLE_NAME = 'scenario.npz'
+
+
+def compile_scenario(data_dir, output_path=None):
+    """Compile a CSV scenario directory into one uncompressed .npz bundle; returns its content hash
+
+    The bundle holds the mission, drone starts, targets, waypoints and NFZ
+    rectangles as column arrays, plus the painted NFZ mask and its bit-packed
+    copy, so loading needs no parsing or painting. The content hash covers every
+    array, so two bundles with the same scenario get the same hash however their
+    CSVs were formatted.
+    """
+    output_path = output_path or os.path.join(data_dir, BUNDLE_NAME)
+    mission = load_mission_data(os.path.join(data_dir, 'missions.csv'))
+    if not mission:
+        raise ValueError(f"No mission configuration in {data_dir}")
+    drone_starts = load_drone_starts(os.path.join(data_dir, 'drone_starts.csv')) or \
+        [{'drone_id': 1, 'start_position': mission['start_position'], 'color': 'blue'}]
+    targets = load_targets_columns(os.path.join(data_dir, 'targets.csv'))
+    waypoints = load_waypoints_columns(os.path.join(data_dir, 'waypoints.csv'))
+    nfz = load_nfz_columns(os.path.join(data_dir, 'nfz.csv'))
+
+    arrays = {
+        'mission_id': np.array(mission['mission_id'], dtype=np.int64),
+        'mission_start': np.array(mission['start_position'], dtype=np.int32),
+        'grid_size': np.array(mission['grid_size'], dtype=np.int32),
+        'targets_to_find': np.array(mission['targets_to_find'], dtype=np.int64),
+        'drone_id': np.array([drone['drone_id'] for drone in drone_starts], dtype=np.int64),
+        'drone_start': np.array([drone['start_position'] for drone in drone_starts], dtype=np.int32).reshape(-1, 2),
+        'drone_color': np.array([drone['color'] for drone in drone_starts], dtype=str),
+        'target_id': targets['target_id'],
+        'target_position': np.column_stack((targets['row'], targets['col'])),
+        'target_priority': _trimmed(targets['priority']),
+        'waypoint_id': waypoints['waypoint_id'],
+        'waypoint_position': np.column_stack((waypoints['row'], waypoints['col'])),
+        'waypoint_priority': _trimmed(waypoints['priority']),
+        'nfz_id': nfz['nfz_id'],
+        'nfz_bounds': np.column_stack((nfz['top_left_row'], nfz['top_left_col'],
+                                       nfz['bottom_right_row'], nfz['bottom_right_col'])),
+        'nfz_type': _trimmed(nfz['type']),
+        'nfz_active': np.column_stack((nfz['active_from'], nfz['active_until'])),
+    }
+
+    source_mtimes = [_mtime(os.path.join(data_dir, name)) for name in SOURCE_FILES]
+    return write_bundle(arrays, output_path, source_mtimes)
+
+
+def write_bundle(arrays, output_path, source_mtimes=()):
+    """Save scenario arrays (in compile_scenario's layout) as a bundle; returns its content hash
+
+    The NFZ mask and bits are painted from the rectangles unless arrays already
+    holds them (e.g. from the procedural generator).
+    """
+    arrays = dict(arrays)
+    if 'nfz_mask' not in arrays:
+        # Paint the mask exactly as a live environment would (scheduled NFZs included)
+        environment = SearchEnvironment(grid_size=tuple(int(v) for v in arrays['grid_size']))
+        for nfz_data in _nfz_records(arrays):
+            environment.add_nfz_rectangle(nfz_data)
+        arrays['nfz_mask'] = environment.nfz_mask
+        arrays['nfz_bits'] = environment.nfz_bits
+
+    content_hash = _content_hash(arrays)
+    arrays['content_hash'] = np.array(content_hash)
+    arrays['source_mtimes'] = np.array(source_mtimes, dtype=np.float64)
+    np.savez(output_path, **arrays)
+    return content_hash
+
+
+class ScenarioBundle:
+    """A compiled scenario opened with every array memory-mapped straight from the .npz file"""
+
+    def __init__(self, file_path):
+        self.file_path = file_path
+        self.arrays = _memmap_npz(file_path)
+        self.content_hash = str(self.arrays['content_hash'])
+        self.grid_size = tuple(int(v) for v in self.arrays['grid_size'])
+
+    def __getitem__(self, name):
+        return self.arrays[name]
+
+    def mission(self):
+        """Mission configuration in load_mission_data() form"""
+        return {
+            'mission_id': int(self.arrays['mission_id']),
+            'start_position': tuple(int(v) for v in self.arrays['mission_start']),
+            'grid_size': self.grid_size,
+            'targets_to_find': int(self.arrays['targets_to_find'])
+        }
+
+    def drone_starts(self):
+        """Drone starts in load_drone_starts() form"""
+        return [{'drone_id': drone_id, 'start_position': tuple(position), 'color': color}
+                for drone_id, position, color in zip(self.arrays['drone_id'].tolist(),
+                                                     self.arrays['drone_start'].tolist(),
+                                                     self.arrays['drone_color'].tolist())]
+
+    def targets(self):
+        """Targets in load_targets_data() form"""
+        return _point_records('target_id', self.arrays['target_id'], self.arrays['target_position'],
+                              self.arrays['target_priority'])
+
+    def waypoints(self):
+        """Waypoints in load_waypoints_data() form"""
+        return _point_records('waypoint_id', self.arrays['waypoint_id'], self.arrays['waypoint_position'],
+                              self.arrays['waypoint_priority'])
+
+    def nfz_rectangles(self):
+        """NFZ rectangles in load_nfz_data() form"""
+        return _nfz_records(self.arrays)
+
+    def build_environment(self, **options):
+        """SearchEnvironment with this scenario's targets and NFZs, keyed by the content hash
+
+        The NFZ mask and bits are the memory-mapped arrays themselves (copied only
+        if the layout later changes), and the environment's cache_key() is the
+        content hash until then.
+        """
+        return build_environment(self.arrays, content_hash=self.content_hash, **options)
+
+    def is_fresh(self, data_dir):
+        """True if no source CSV in data_dir changed since the bundle was compiled (or it has no CSVs)"""
+        recorded = self.arrays['source_mtimes'].tolist()
+        return not recorded or recorded == [_mtime(os.path.join(data_dir, name)) for name in SOURCE_FILES]
+
+
+def build_environment(arrays, content_hash=None, **options):
+    """SearchEnvironment from scenario arrays (a bundle's, or a generated scenario) without repainting NFZs"""
+    environment = SearchEnvironment(grid_size=tuple(int(v) for v in arrays['grid_size']), **options)
+    environment.add_targets(arrays['target_position'], target_ids=arrays['target_id'],
+                            priorities=arrays['target_priority'])
+    environment.load_nfz_layout(arrays['nfz_mask'], arrays['nfz_bits'], _nfz_records(arrays),
+                                content_hash=content_hash)
+    return environment
+
+
+def load_scenario(file_path):
+    """Open a compiled scenario bundle"""
+    return ScenarioBundle(file_path)
+
+
+def load_fresh_scenario(data_dir, file_path=None):
+    """The compiled bundle for data_dir if it exists and is up to date with the CSVs, else None"""
+    file_path = file_path or os.path.join(data_dir, BUNDLE_NAME)
+    if not os.path.exists(file_path):
+        return None
+    bundle = ScenarioBundle(file_path)
+    if not bundle.is_fresh(data_dir):
+        print(f"⚠️ {file_path} is older than the CSVs in {data_dir} - recompile it; reading CSVs instead")
+        return None
+    return bundle
+
+
+def _memmap_npz(file_path):
+    """Map every member of an uncompressed .npz as a read-only array without reading it"""
+    arrays = {}
+    with zipfile.ZipFile(file_path) as archive, open(file_path, 'rb') as file:
+        for info in archive.infolist():
+            if info.compress_type != zipfile.ZIP_STORED:
+                raise ValueError(f"{file_path} member {info.filename} is compressed - cannot memory-map it")
+            # Local file header: fixed 30 bytes, then the name and extra field
+            file.seek(info.header_offset + 26)
+            name_length, extra_length = np.frombuffer(file.read(4), dtype='<u2').tolist()
+            file.seek(info.header_offset + 30 + name_length + extra_length)
+            version = np.lib.format.read_magic(file)
+            read_header = np.lib.format.read_array_header_1_0 if version == (1, 0) \
+                else np.lib.format.read_array_header_2_0
+            shape, fortran_order, dtype = read_header(file)
+            name = info.filename[:-len('.npy')]
+            if dtype.hasobject:
+                raise ValueError(f"{file_path} member {name} holds Python objects")
+            if 0 in shape or not shape:
+                # Scalars and empty arrays: nothing worth mapping
+                count = int(np.prod(shape))
+                arrays[name] = np.frombuffer(file.read(count * dtype.itemsize), dtype=dtype, count=count).reshape(shape)
+            else:
+                arrays[name] = np.memmap(file, dtype=dtype, mode='r', offset=file.tell(), shape=shape,
+                                         order='F' if fortran_order else 'C')
+    return arrays
+
+
+def _content_hash(arrays):
+    """SHA-256 over every array's name, dtype, shape and bytes, in name order
+
+    Text arrays are hashed at the width their longest value needs, so the same
+    scenario hashes the same whichever code path chose its string widths.
+    """
+    digest = hashlib.sha256()
+    for name in sorted(arrays):
+        array = np.ascontiguousarray(arrays[name])
+        if array.dtype.kind == 'U':
+            array = _trimmed(array)
+        digest.update(f"{name}:{array.dtype.str}:{array.shape};".encode())
+        digest.update(array.tobytes())
+    return digest.hexdigest()
+
+
+def _nfz_records(arrays):
+    nfz_rectangles = []
+    for nfz_id, bounds, nfz_type, active in zip(arrays['nfz_id'].tolist(), arrays['nfz_bounds'].tolist(),
+                                                arrays['nfz_type'].tolist(), arrays['nfz_active'].tolist()):
+        nfz = {'nfz_id': nfz_id, 'top_left': tuple(bounds[:2]), 'bottom_right': tuple(bounds[2:]), 'type': nfz_type}
+        if active[0] != MISSING_INT:
+            nfz['active_from'] = active[0]
+        if active[1] != MISSING_INT:
+            nfz['active_until'] = active[1]
+        nfz_rectangles.append(nfz)
+    return nfz_rectangles
+
+
+def _point_records(id_name, ids, positions, priorities):
+    return [{id_name: point_id, 'position': tuple(position), 'priority': priority}
+            for point_id, position, priority in zip(ids.tolist(), positions.tolist(), priorities.tolist())]
+
+
+def _trimmed(text):
+    """Text column at the width its longest value needs"""
+    return text.astype(f'U{max(int(np.char.str_len(text).max()), 1)}') if text.size else text
+
+
+def _mtime(path):
+    return os.path.getmtime(path) if os.path.exists(path) else -1.0
+
+
+def main():
+    """Compile a scenario directory: python -m utils.scenario_bundle data [data/scenario.npz]"""
+    parser = argparse.ArgumentParser(description="Compile a CSV scenario directory into a binary bundle")
+    parser.add_argument('data_dir', help="directory with missions.csv, targets.csv, nfz.csv, ...")
+    parser.add_argument('output', nargs='?', help=f"bundle path (default: <data_dir>/{BUNDLE_NAME})")
+    args = parser.parse_args()
+    content_hash = compile_scenario(args.data_dir, args.output)
+    print(f"✅ Compiled {args.output or os.path.join(args.data_dir, BUNDLE_NAME)} ({content_hash[:12]})")
+
+
+if __name__ == "__main__":
+    main()
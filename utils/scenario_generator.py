@@ -0,0 +1,224 @@
+import argparse
+import os
+import time
+
+import numpy as np
+
+from utils.scenario_bundle import BUNDLE_NAME, SOURCE_FILES, write_bundle
+
+NFZ_TYPES = ('building', 'forest', 'water')
+PRIORITIES = ('high', 'medium', 'low')
+DRONE_COLORS = ('blue', 'red', 'green', 'orange', 'purple', 'brown', 'pink', 'gray', 'olive', 'cyan')
+
+# Mean area of a rectangle whose sides are each a U(0.4, 1) fraction of its block
+_MEAN_FILL = 0.7 ** 2
+# Blocks per coarse cell of the clustering noise
+_CLUSTER_BLOCKS = 8
+
+
+def generate_scenario(grid_size=100, nfz_density=0.2, clustering=0.5, num_targets=20, num_waypoints=20,
+                      num_drones=2, block_size=16, seed=0):
+    """Seeded random scenario as arrays in the scenario bundle layout (see write_scenario_csv)
+
+    The grid is cut into block_size blocks whose first row and column are open
+    streets, and each block holds at most one NFZ rectangle. Any cell outside a
+    block's rectangle can fly straight to the block border, so every free cell -
+    and so every drone start, target and waypoint - is reachable from every other.
+    nfz_density is the target fraction of NFZ cells (at most about the block
+    interior fraction); clustering from 0 (blocks chosen independently) to 1
+    (NFZs clumped into districts) blends block noise with smooth coarse noise.
+    Everything is vectorized, so a 10000x10000 map takes a few seconds.
+    """
+    if block_size < 3:
+        raise ValueError("block_size must be at least 3")
+    rng = np.random.default_rng(seed)
+    rows = cols = int(grid_size)
+    block_rows = block_cols = -(-rows // block_size)
+
+    # Inclusive interior of each block: below/right of its street, clear of the last grid row/column
+    first = np.arange(block_rows) * block_size + 1
+    last = np.minimum(first + block_size - 2, rows - 2)
+    extent = np.maximum(last - first + 1, 0)
+    interior_fraction = (block_size - 1) ** 2 / block_size ** 2
+
+    # Which blocks get an NFZ, and how much of the block it fills
+    share = nfz_density / interior_fraction
+    if share <= _MEAN_FILL:
+        block_share, low = share / _MEAN_FILL, 0.4
+    else:
+        block_share, low = 1.0, float(np.clip(2 * np.sqrt(min(share, 1.0)) - 1, 0.4, 1.0))
+    score = (1 - clustering) * rng.random((block_rows, block_cols)) + \
+        clustering * _smooth_noise(rng, block_rows, block_cols)
+    selected = score >= np.quantile(score, 1 - block_share) if block_share < 1 else np.ones_like(score, bool)
+    selected &= (extent[:, None] > 0) & (extent[None, :] > 0)
+
+    heights = np.maximum(np.rint(rng.uniform(low, 1.0, selected.shape) * extent[:, None]), 1).astype(np.int64)
+    widths = np.maximum(np.rint(rng.uniform(low, 1.0, selected.shape) * extent[None, :]), 1).astype(np.int64)
+    heights, widths = np.minimum(heights, extent[:, None]), np.minimum(widths, extent[None, :])
+    top_offsets = (rng.random(selected.shape) * (extent[:, None] - heights + 1)).astype(np.int64)
+    left_offsets = (rng.random(selected.shape) * (extent[None, :] - widths + 1)).astype(np.int64)
+
+    # Paint every block at once on a (block_rows, block_size, block_cols, block_size) view
+    offsets = np.arange(block_size)
+    bottom_offsets = np.where(selected, top_offsets + heights, 0)  # Exclusive; empty when not selected
+    right_offsets = np.where(selected, left_offsets + widths, 0)
+    in_rows = (offsets[None, :, None, None] >= 1 + top_offsets[:, None, :, None]) & \
+        (offsets[None, :, None, None] < 1 + bottom_offsets[:, None, :, None])
+    in_cols = (offsets[None, None, None, :] >= 1 + left_offsets[:, None, :, None]) & \
+        (offsets[None, None, None, :] < 1 + right_offsets[:, None, :, None])
+    padded = block_rows * block_size
+    nfz_mask = np.ascontiguousarray((in_rows & in_cols).reshape(padded, padded)[:rows, :cols])
+
+    block_row, block_col = np.nonzero(selected)
+    tops = first[block_row] + top_offsets[selected]
+    lefts = first[block_col] + left_offsets[selected]
+    nfz_bounds = np.column_stack((tops, lefts, tops + heights[selected] - 1,
+                                  lefts + widths[selected] - 1)).astype(np.int32)
+    num_nfz = len(nfz_bounds)
+
+    drone_cells = _sample_free_cells(rng, nfz_mask, num_drones)
+    target_cells = _sample_free_cells(rng, nfz_mask, num_targets)
+    waypoint_cells = _sample_free_cells(rng, nfz_mask, num_waypoints)
+    drone_start = np.column_stack(np.divmod(drone_cells, cols)).astype(np.int32).reshape(-1, 2)
+
+    return {
+        'mission_id': np.array(seed, dtype=np.int64),
+        'mission_start': drone_start[0] if num_drones else np.zeros(2, dtype=np.int32),
+        'grid_size': np.array((rows, cols), dtype=np.int32),
+        'targets_to_find': np.array(num_targets, dtype=np.int64),
+        'drone_id': np.arange(1, num_drones + 1, dtype=np.int64),
+        'drone_start': drone_start,
+        'drone_color': np.array(DRONE_COLORS)[np.arange(num_drones) % len(DRONE_COLORS)],
+        'target_id': np.arange(1, num_targets + 1, dtype=np.int64),
+        'target_position': np.column_stack(np.divmod(target_cells, cols)).astype(np.int32).reshape(-1, 2),
+        'target_priority': np.array(PRIORITIES)[rng.integers(len(PRIORITIES), size=num_targets)],
+        'waypoint_id': np.arange(1, num_waypoints + 1, dtype=np.int64),
+        'waypoint_position': np.column_stack(np.divmod(waypoint_cells, cols)).astype(np.int32).reshape(-1, 2),
+        'waypoint_priority': np.array(PRIORITIES)[rng.integers(len(PRIORITIES), size=num_waypoints)],
+        'nfz_id': np.arange(1, num_nfz + 1, dtype=np.int64),
+        'nfz_bounds': nfz_bounds.reshape(-1, 4),
+        'nfz_type': np.array(NFZ_TYPES)[rng.integers(len(NFZ_TYPES), size=num_nfz)],
+        'nfz_active': np.full((num_nfz, 2), -1, dtype=np.int32),
+        'nfz_mask': nfz_mask,
+        'nfz_bits': np.packbits(nfz_mask, axis=1, bitorder='little'),
+    }
+
+
+def write_scenario_csv(scenario, data_dir):
+    """Write a generated scenario as the five CSV files utils/data_loader.py reads"""
+    os.makedirs(data_dir, exist_ok=True)
+    rows, _ = scenario['grid_size'].tolist()
+    start = scenario['mission_start'].tolist()
+    _write_csv(os.path.join(data_dir, 'missions.csv'),
+               'mission_id,start_row,start_col,grid_size,targets_to_find,num_drones',
+               [[int(scenario['mission_id'])], [start[0]], [start[1]], [rows],
+                [int(scenario['targets_to_find'])], [len(scenario['drone_id'])]])
+    _write_csv(os.path.join(data_dir, 'drone_starts.csv'), 'drone_id,start_row,start_col,color',
+               [scenario['drone_id'], scenario['drone_start'][:, 0], scenario['drone_start'][:, 1],
+                scenario['drone_color']])
+    for prefix, file_name in (('target', 'targets.csv'), ('waypoint', 'waypoints.csv')):
+        positions = scenario[f'{prefix}_position']
+        _write_csv(os.path.join(data_dir, file_name), f'{prefix}_id,row,col,priority',
+                   [scenario[f'{prefix}_id'], positions[:, 0], positions[:, 1], scenario[f'{prefix}_priority']])
+    bounds = scenario['nfz_bounds']
+    _write_csv(os.path.join(data_dir, 'nfz.csv'),
+               'nfz_id,top_left_row,top_left_col,bottom_right_row,bottom_right_col,type',
+               [scenario['nfz_id'], bounds[:, 0], bounds[:, 1], bounds[:, 2], bounds[:, 3], scenario['nfz_type']])
+
+
+def write_scenario_bundle(scenario, file_path, data_dir=None):
+    """Write a generated scenario as a compiled bundle; returns its content hash
+
+    Pass the data_dir its CSVs were written to so the bundle is considered fresh for them.
+    """
+    source_mtimes = [os.path.getmtime(os.path.join(data_dir, name)) for name in SOURCE_FILES] if data_dir else ()
+    return write_bundle(scenario, file_path, source_mtimes)
+
+
+def get_scenario_stats(scenario):
+    """Return the generated scenario's size and achieved NFZ density"""
+    nfz_mask = scenario['nfz_mask']
+    return {
+        'grid_size': f"{nfz_mask.shape[0]}x{nfz_mask.shape[1]}",
+        'nfz_count': len(scenario['nfz_id']),
+        'nfz_density': float(np.count_nonzero(nfz_mask)) / nfz_mask.size,
+        'targets': len(scenario['target_id']),
+        'waypoints': len(scenario['waypoint_id']),
+        'drones': len(scenario['drone_id'])
+    }
+
+
+def _smooth_noise(rng, block_rows, block_cols):
+    """Bilinearly upsampled coarse noise, rank-normalized to U(0, 1) over the blocks"""
+    coarse = rng.random((block_rows // _CLUSTER_BLOCKS + 2, block_cols // _CLUSTER_BLOCKS + 2))
+    row_pos = np.arange(block_rows) / _CLUSTER_BLOCKS
+    col_pos = np.arange(block_cols) / _CLUSTER_BLOCKS
+    row0, col0 = row_pos.astype(np.int64), col_pos.astype(np.int64)
+    row_frac, col_frac = (row_pos - row0)[:, None], (col_pos - col0)[None, :]
+    field = (coarse[row0][:, col0] * (1 - row_frac) * (1 - col_frac) +
+             coarse[row0 + 1][:, col0] * row_frac * (1 - col_frac) +
+             coarse[row0][:, col0 + 1] * (1 - row_frac) * col_frac +
+             coarse[row0 + 1][:, col0 + 1] * row_frac * col_frac)
+    ranks = np.empty(field.size)
+    ranks[np.argsort(field, axis=None)] = np.arange(field.size) / max(field.size - 1, 1)
+    return ranks.reshape(field.shape)
+
+
+def _sample_free_cells(rng, nfz_mask, count):
+    """Flat indices of count distinct random free cells"""
+    flat_mask = nfz_mask.ravel()
+    free_count = flat_mask.size - int(np.count_nonzero(flat_mask))
+    if count > free_count:
+        raise ValueError(f"Cannot place {count} distinct points on {free_count} free cells")
+    if count * 2 > free_count:
+        return rng.permutation(np.flatnonzero(~flat_mask))[:count]
+
+    # Rejection sampling: draw extra cells, drop NFZ hits and repeats (keeping draw order)
+    chosen = np.empty(0, dtype=np.int64)
+    while len(chosen) < count:
+        draws = rng.integers(flat_mask.size, size=max(2 * (count - len(chosen)), 64))
+        chosen = np.concatenate((chosen, draws[~flat_mask[draws]]))
+        _, first = np.unique(chosen, return_index=True)
+        chosen = chosen[np.sort(first)]
+    return chosen[:count]
+
+
+def _write_csv(path, header, columns):
+    lines = map(','.join, zip(*(map(str, np.asarray(column).tolist()) for column in columns)))
+    with open(path, 'w') as file:
+        file.write(header + '\n')
+        file.write('\n'.join(lines))
+
+
+def main():
+    """Generate a scenario: python -m utils.scenario_generator --size 10000 --output scenarios/big"""
+    parser = argparse.ArgumentParser(description="Generate a seeded random scenario for scale testing")
+    parser.add_argument('--size', type=int, default=100, help="grid size (square)")
+    parser.add_argument('--nfz-density', type=float, default=0.2, help="target fraction of NFZ cells")
+    parser.add_argument('--clustering', type=float, default=0.5, help="0 = scattered NFZs, 1 = clumped")
+    parser.add_argument('--targets', type=int, default=20, help="number of targets")
+    parser.add_argument('--waypoints', type=int, default=20, help="number of waypoints")
+    parser.add_argument('--drones', type=int, default=2, help="number of drones")
+    parser.add_argument('--block-size', type=int, default=16, help="street spacing in cells")
+    parser.add_argument('--seed', type=int, default=0, help="random seed")
+    parser.add_argument('--output', required=True, help="directory for the CSV files and/or bundle")
+    parser.add_argument('--format', choices=('csv', 'bundle', 'both'), default='csv')
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    scenario = generate_scenario(args.size, args.nfz_density, args.clustering, args.targets, args.waypoints,
+                                 args.drones, args.block_size, args.seed)
+    print(f"✅ Generated {get_scenario_stats(scenario)} in {time.perf_counter() - started:.2f}s")
+
+    if args.format in ('csv', 'both'):
+        write_scenario_csv(scenario, args.output)
+        print(f"📄 CSV files written to {args.output}")
+    if args.format in ('bundle', 'both'):
+        os.makedirs(args.output, exist_ok=True)
+        content_hash = write_scenario_bundle(scenario, os.path.join(args.output, BUNDLE_NAME),
+                                             args.output if args.format == 'both' else None)
+        print(f"📦 Bundle written to {os.path.join(args.output, BUNDLE_NAME)} ({content_hash[:12]})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,189 @@
+import os
+import shutil
+import subprocess
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from types import SimpleNamespace
+
+import matplotlib.pyplot as plt
+
+from visualization.plotter import SimulationPlotter, paths_recorded
+
+
+class MissionFrameRecorder:
+    """Records compact per-step mission state for offline frame/video export
+
+    Paths and found-target lists only ever grow, so each frame stores just their
+    lengths; the full lists are taken from the drones once, at export time. NFZ
+    layouts are stored once per change (time-activated NFZs) and frames refer to
+    them by index.
+    """
+
+    def __init__(self, drones, environment):
+        if not paths_recorded(drones):
+            raise ValueError("Frames are replayed from path history - build the FleetEngine with record_paths=True")
+        self.drones = drones
+        self.environment = environment
+        self.grid_size = environment.grid_size
+        self.nfz_layouts = []  # Distinct NFZ rectangle lists, in the order they appeared
+        self._nfz_version = None
+        self.initial_targets = list(environment.targets)
+        self.frames = []  # (step, path lengths, found counts, batteries, NFZ layout index)
+
+    def capture(self, step):
+        """Record the fleet state after a simulation step"""
+        if self.environment.version != self._nfz_version:
+            self._nfz_version = self.environment.version
+            self.nfz_layouts.append([dict(nfz) for nfz in self.environment.nfz_rectangles])
+        self.frames.append((
+            step,
+            [len(drone.path_history) for drone in self.drones],
+            [len(drone.found_targets) for drone in self.drones],
+            [drone.battery for drone in self.drones],
+            len(self.nfz_layouts) - 1,
+        ))
+
+    def scene(self):
+        """Everything a render worker needs, shared once per worker process"""
+        return {
+            'grid_size': self.grid_size,
+            'nfz_layouts': self.nfz_layouts,
+            'initial_targets': self.initial_targets,
+            'drones': [{
+                'drone_id': drone.drone_id,
+                'waypoints': list(drone.waypoints),
+                'path_history': list(drone.path_history),
+                'found_targets': list(drone.found_targets),
+            } for drone in self.drones],
+        }
+
+
+def export_frames(recorder, output_dir, workers=None, dpi=80):
+    """Render every recorded step to numbered PNG files in parallel; returns the file paths"""
+    os.makedirs(output_dir, exist_ok=True)
+    tasks = [(index, os.path.join(output_dir, f"frame_{index:06d}.png"), dpi)
+             for index in range(len(recorder.frames))]
+    return list(_render_ordered(recorder, tasks, workers))
+
+
+def export_video(recorder, output_path, fps=10, workers=None, dpi=80):
+    """Render recorded steps in parallel and stream them, in order, into an MP4 or GIF
+
+    MP4 needs ffmpeg on PATH. GIF uses ffmpeg when available and otherwise falls back
+    to Pillow, which has to keep the (palettized) frames until the file is written.
+    """
+    tasks = [(index, None, dpi) for index in range(len(recorder.frames))]
+    if not tasks:
+        raise ValueError("No frames recorded")
+
+    frames = _render_ordered(recorder, tasks, workers)
+    ffmpeg = shutil.which('ffmpeg')
+    if ffmpeg:
+        return _encode_ffmpeg(ffmpeg, frames, output_path, fps)
+    if output_path.lower().endswith('.gif'):
+        return _encode_gif_pillow(frames, output_path, fps)
+    raise RuntimeError("ffmpeg is required for video export (or export to .gif)")
+
+
+def _render_ordered(recorder, tasks, workers):
+    """Yield rendered frames in step order, keeping only a small window in flight"""
+    workers = workers or os.cpu_count() or 1
+    window = workers * 2
+    frames = recorder.frames
+
+    with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                             initargs=(recorder.scene(),)) as executor:
+        pending = deque()
+        for index, path, dpi in tasks:
+            pending.append(executor.submit(_render_frame, frames[index], path, dpi))
+            if len(pending) >= window:
+                yield pending.popleft().result()
+        while pending:
+            yield pending.popleft().result()
+
+
+def _encode_ffmpeg(ffmpeg, frames, output_path, fps):
+    """Pipe raw RGBA frames to ffmpeg as they arrive"""
+    first = next(frames)
+    width, height, _ = first
+    command = [
+        ffmpeg, '-y', '-loglevel', 'error',
+        '-f', 'rawvideo', '-pix_fmt', 'rgba', '-s', f'{width}x{height}', '-r', str(fps), '-i', '-',
+    ]
+    if output_path.lower().endswith('.gif'):
+        command += [output_path]
+    else:
+        command += ['-vf', 'pad=ceil(iw/2)*2:ceil(ih/2)*2', '-pix_fmt', 'yuv420p', output_path]
+
+    process = subprocess.Popen(command, stdin=subprocess.PIPE)
+    try:
+        process.stdin.write(first[2])
+        for _, _, rgba in frames:
+            process.stdin.write(rgba)
+    finally:
+        process.stdin.close()
+        if process.wait() != 0:
+            raise RuntimeError(f"ffmpeg exited with status {process.returncode}")
+    return output_path
+
+
+def _encode_gif_pillow(frames, output_path, fps):
+    """Palettize frames as they arrive and write an animated GIF with Pillow"""
+    from PIL import Image
+
+    images = [Image.frombuffer('RGBA', (width, height), rgba, 'raw', 'RGBA', 0, 1).convert('P')
+              for width, height, rgba in frames]
+    images[0].save(output_path, save_all=True, append_images=images[1:],
+                   duration=int(1000 / fps), loop=0)
+    return output_path
+
+
+# Per-worker scene, set once by the pool initializer
+_scene = None
+
+
+def _init_worker(scene):
+    """Switch the worker to the Agg backend and keep the shared scene"""
+    global _scene
+    plt.switch_backend('Agg')
+    _scene = scene
+
+
+def _render_frame(frame, path, dpi):
+    """Render one recorded step; saves a PNG if path is given, else returns (width, height, rgba)"""
+    step, path_lengths, found_counts, batteries, nfz_layout = frame
+    scene = _scene
+
+    drones = []
+    found_positions = set()
+    for info, path_length, found_count, battery in zip(scene['drones'], path_lengths, found_counts, batteries):
+        path_history = info['path_history'][:path_length]
+        found_targets = info['found_targets'][:found_count]
+        found_positions.update(found_targets)
+        drones.append(SimpleNamespace(
+            drone_id=info['drone_id'], waypoints=info['waypoints'], path_history=path_history,
+            found_targets=found_targets, position=path_history[-1], battery=battery
+        ))
+    environment = SimpleNamespace(
+        nfz_rectangles=scene['nfz_layouts'][nfz_layout],
+        targets=[target for target in scene['initial_targets'] if target not in found_positions]
+    )
+
+    info_text = (
+        f"Step: {step}\n"
+        f"Targets Found: {sum(found_counts)}\n"
+        f"Battery: {sum(batteries)}\n"
+        f"Drones Active: {len(drones)}"
+    )
+    fig, _ = SimulationPlotter(scene['grid_size'])._create_plot(
+        f"Mission Progress — Step {step}", drones, environment, info_text)
+    try:
+        fig.set_dpi(dpi)
+        if path is not None:
+            fig.savefig(path, dpi=dpi)
+            return path
+        fig.canvas.draw()
+        width, height = fig.canvas.get_width_height(physical=True)
+        return width, height, bytes(fig.canvas.buffer_rgba())
+    finally:
+        plt.close(fig)
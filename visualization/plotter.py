@@ -1,13 +1,25 @@
 import matplotlib.pyplot as plt
 from matplotlib.patches import Rectangle
 import matplotlib as mpl
+import numpy as np
+
+# Info box note when drones come from a FleetEngine built with record_paths=False
+PATHS_OFF_NOTE = "Trails: off (record_paths=False)"
+
+
+def paths_recorded(drones):
+    """False if any drone is a FleetEngine view whose fleet does not record path history"""
+    return all(getattr(getattr(drone, 'fleet', None), 'record_paths', True) for drone in drones)
+
 
 class SimulationPlotter:
     """Handles visualization of drone navigation and mission progress."""
 
-    def __init__(self, grid_size):
+    def __init__(self, grid_size, live=False):
         self.grid_size = grid_size  # (rows, cols)
         self.drone_colors = {}  # Maps drone_id to color for consistent displays
+        self.live = live  # Reuse one figure and update artists instead of redrawing each step
+        self._live = None  # Live-mode figure, artists and blit background
 
     def plot_step(self, drones, environment, step):
         """Display current mission state for multiple drones."""
@@ -19,11 +31,21 @@ class SimulationPlotter:
             f"Battery: {total_battery}\n"
             f"Drones Active: {len(drones)}"
         )
+        if self.live:
+            self._update_live(f"Mission Progress — Step {step}", drones, environment, info_text)
+            return
+
         fig, ax = self._create_plot(f"Mission Progress — Step {step}", drones, environment, info_text)
         plt.show(block=False)
         plt.pause(0.01)
         plt.close(fig)
 
+    def close(self):
+        """Close the live-mode figure, if any."""
+        if self._live is not None:
+            plt.close(self._live["fig"])
+            self._live = None
+
     def plot_final_state(self, drones, environment):
         """Display final mission results for multiple drones."""
         total_targets_found = sum(len(drone.found_targets) for drone in drones)
@@ -39,9 +61,185 @@ class SimulationPlotter:
 
     def _create_plot(self, title, drones, environment, info_text):
         """Create and configure the mission visualization plot."""
-        rows, cols = self.grid_size
+        if not paths_recorded(drones):
+            info_text = f"{info_text}\n{PATHS_OFF_NOTE}"
+        fig, ax = plt.subplots(figsize=(12, 10))
+        plt.subplots_adjust(right=0.82)
+        self._configure_axes(ax, title)
+
+        # Draw environment NFZs
+        self._draw_obstacles(ax, environment.nfz_rectangles)
+
+        # Build all waypoints—assume all drones share the same set
+        all_waypoints = self._collect_waypoints(drones)
+        # Mark locations where a waypoint and target overlap, for offsetting
+        target_points = set(environment.targets)
+        waypoint_points = set(all_waypoints)
+        overlap_points = target_points & waypoint_points
+
+        # Draw targets first, with offset if necessary
+        self._draw_targets(ax, environment.targets, [target for drone in drones for target in drone.found_targets], overlap_points)
+
+        # Draw all waypoints above targets; always clearly visible!
+        self._draw_waypoints(ax, all_waypoints)
+
+        # Draw drone paths and positions
+        for idx, drone in enumerate(drones):
+            color = self._drone_color(drone.drone_id, idx)
+            self._draw_drone_path(ax, drone.path_history, color)
+            self._draw_drone_position(ax, drone.position, color, drone.drone_id)
+
+        self._draw_legend(ax)
+        self._draw_info_box(fig, info_text)
+        return fig, ax
+
+    def _init_live(self, title, drones, environment, info_text):
+        """Create the live figure once: static layers drawn, dynamic artists kept for updates."""
+        self.close()
         fig, ax = plt.subplots(figsize=(12, 10))
         plt.subplots_adjust(right=0.82)
+        self._configure_axes(ax, title)
+
+        # Static layers - drawn once and cached in the blit background (NFZs redrawn when they change)
+        obstacles = self._draw_obstacles(ax, environment.nfz_rectangles)
+        all_waypoints = self._collect_waypoints(drones)
+        self._draw_waypoints(ax, all_waypoints)
+
+        # Dynamic layers - one artist per layer (or per drone), updated in place each step
+        remaining, = ax.plot([], [], marker="*", markersize=18, linestyle="None", color="green",
+                             markeredgecolor="white", markeredgewidth=2.5, alpha=0.94, zorder=7,
+                             label="Target (remaining)")
+        found, = ax.plot([], [], marker="p", markersize=15, linestyle="None", color="#277ab6",
+                         markeredgecolor="white", markeredgewidth=2.5, alpha=0.85, zorder=8,
+                         label="Target (found)")
+        drone_artists = {}
+        for idx, drone in enumerate(drones):
+            color = self._drone_color(drone.drone_id, idx)
+            path, = ax.plot([], [], "-", alpha=0.83, linewidth=2.9, color=color, zorder=6)
+            marker, = ax.plot([], [], marker="o", markersize=15, linestyle="None", color=color, zorder=10,
+                              markeredgecolor='white', markeredgewidth=2.5, label=f"Drone {drone.drone_id}")
+            label = ax.text(0, 0, str(drone.drone_id), fontsize=10, ha="center", va="center",
+                            color="white", fontweight="bold", zorder=11)
+            drone_artists[drone.drone_id] = {
+                "path": path, "marker": marker, "label": label,
+                "xs": np.empty(64), "ys": np.empty(64), "length": 0
+            }
+
+        self._draw_legend(ax)
+        info = self._draw_info_box(fig, info_text)
+
+        dynamic = [remaining, found, ax.title, info]
+        for artists in drone_artists.values():
+            dynamic.extend((artists["path"], artists["marker"], artists["label"]))
+
+        use_blit = fig.canvas.supports_blit
+        for artist in dynamic:
+            artist.set_animated(use_blit)
+
+        self._live = {
+            "fig": fig, "ax": ax, "dynamic": dynamic, "use_blit": use_blit, "background": None,
+            "remaining": remaining, "found": found, "info": info, "drones": drone_artists,
+            "drone_ids": [drone.drone_id for drone in drones],
+            "waypoint_points": set(all_waypoints), "target_state": None,
+            "obstacles": obstacles, "nfz_version": environment.version,
+        }
+
+        # Recapture the static background whenever the canvas is fully redrawn (e.g. resize)
+        fig.canvas.mpl_connect("draw_event", self._on_live_draw)
+        plt.show(block=False)
+        fig.canvas.draw()
+
+    def _on_live_draw(self, event):
+        """Cache the freshly drawn static layers and repaint the dynamic artists over them."""
+        live = self._live
+        if live is None or not live["use_blit"] or event.canvas is not live["fig"].canvas:
+            return
+        live["background"] = event.canvas.copy_from_bbox(live["fig"].bbox)
+        for artist in live["dynamic"]:
+            live["fig"].draw_artist(artist)
+
+    def _update_live(self, title, drones, environment, info_text):
+        """Update only the dynamic artists and blit them over the cached background."""
+        live = self._live
+        if (live is None or live["drone_ids"] != [drone.drone_id for drone in drones]
+                or not plt.fignum_exists(live["fig"].number)):
+            self._init_live(title, drones, environment, info_text)
+            live = self._live
+
+        if not paths_recorded(drones):
+            info_text = f"{info_text}\n{PATHS_OFF_NOTE}"
+        live["ax"].title.set_text(title)
+        live["info"].set_text(info_text)
+        self._update_live_targets(drones, environment)
+        redraw = self._update_live_obstacles(environment)
+
+        for drone in drones:
+            artists = live["drones"][drone.drone_id]
+            self._append_live_path(artists, drone.path_history)
+            r, c = drone.position
+            artists["marker"].set_data([c], [r])
+            artists["label"].set_position((c, r))
+
+        fig = live["fig"]
+        if redraw:
+            fig.canvas.draw()  # Full redraw; the draw_event handler recaptures the background
+        elif live["use_blit"] and live["background"] is not None:
+            fig.canvas.restore_region(live["background"])
+            for artist in live["dynamic"]:
+                fig.draw_artist(artist)
+            fig.canvas.blit(fig.bbox)
+        else:
+            fig.canvas.draw_idle()
+        fig.canvas.flush_events()
+
+    def _update_live_obstacles(self, environment):
+        """Redraw the NFZ layer if time-activated NFZs changed since it was drawn; returns True if so."""
+        live = self._live
+        if environment.version == live["nfz_version"]:
+            return False
+        live["nfz_version"] = environment.version
+        for patch in live["obstacles"]:
+            patch.remove()
+        live["obstacles"] = self._draw_obstacles(live["ax"], environment.nfz_rectangles)
+        self._draw_legend(live["ax"])
+        return True
+
+    def _update_live_targets(self, drones, environment):
+        """Refresh target markers, but only when a target has been found since the last step."""
+        live = self._live
+        found_targets = [target for drone in drones for target in drone.found_targets]
+        state = (environment.count_targets(), len(found_targets))
+        if state == live["target_state"]:
+            return
+        live["target_state"] = state
+
+        # Same overlap offsets as _draw_targets
+        offset = 0.18
+        overlap = live["waypoint_points"]
+        remaining = [(r + offset, c + offset) if (r, c) in overlap else (r, c) for r, c in environment.targets]
+        found = [(r - offset, c - offset) if (r, c) in overlap else (r, c) for r, c in found_targets]
+        live["remaining"].set_data([c for _, c in remaining], [r for r, _ in remaining])
+        live["found"].set_data([c for _, c in found], [r for r, _ in found])
+
+    def _append_live_path(self, artists, path_history):
+        """Append new path points to the drone's buffer (amortized O(1) per step)."""
+        length = artists["length"]
+        new_points = path_history[length:]
+        if not new_points:
+            return
+        needed = length + len(new_points)
+        if needed > len(artists["xs"]):
+            capacity = max(needed, 2 * len(artists["xs"]))
+            artists["xs"] = np.resize(artists["xs"], capacity)
+            artists["ys"] = np.resize(artists["ys"], capacity)
+        artists["ys"][length:needed], artists["xs"][length:needed] = zip(*new_points)
+        artists["length"] = needed
+        if needed > 1:
+            artists["path"].set_data(artists["xs"][:needed], artists["ys"][:needed])
+
+    def _configure_axes(self, ax, title):
+        """Set limits, ticks, grid and styling shared by every plot."""
+        rows, cols = self.grid_size
 
         # Set axes and grid style
         ax.set_xlim(-0.5, cols - 0.5)
@@ -62,34 +260,22 @@ class SimulationPlotter:
             spine.set_color("#b8c6d2")
             spine.set_linewidth(1.2)
 
-        # Draw environment NFZs
-        self._draw_obstacles(ax, environment.nfz_rectangles)
-
-        # Build all waypoints—assume all drones share the same set
+    def _collect_waypoints(self, drones):
+        """Gather every drone's waypoints into one list."""
         all_waypoints = []
         if drones:
             for drone in drones:
                 if hasattr(drone, 'waypoints'):
                     all_waypoints.extend(drone.waypoints)
-        # Mark locations where a waypoint and target overlap, for offsetting
-        target_points = set(environment.targets)
-        waypoint_points = set(all_waypoints)
-        overlap_points = target_points & waypoint_points
+        return all_waypoints
 
-        # Draw targets first, with offset if necessary
-        self._draw_targets(ax, environment.targets, [target for drone in drones for target in drone.found_targets], overlap_points)
-
-        # Draw all waypoints above targets; always clearly visible!
-        self._draw_waypoints(ax, all_waypoints)
-
-        # Draw drone paths and positions
+    def _drone_color(self, drone_id, idx):
+        """Stable tab10 color per drone id."""
         color_map = mpl.colormaps.get_cmap('tab10')
-        for idx, drone in enumerate(drones):
-            color = self.drone_colors.setdefault(drone.drone_id, color_map(idx % 10))
-            self._draw_drone_path(ax, drone.path_history, color)
-            self._draw_drone_position(ax, drone.position, color, drone.drone_id)
+        return self.drone_colors.setdefault(drone_id, color_map(idx % 10))
 
-        # Professional, grouped legend
+    def _draw_legend(self, ax):
+        """Professional, grouped legend."""
         handles, labels = ax.get_legend_handles_labels()
         by_label = dict(zip(labels, handles))
         ax.legend(
@@ -103,20 +289,18 @@ class SimulationPlotter:
             title="Legend"
         )
 
-        # Info box
-        fig.text(
+    def _draw_info_box(self, fig, info_text):
+        """Info box in the lower right corner."""
+        return fig.text(
             0.99, 0.18, info_text,
             ha="right", va="bottom",
             fontsize=12,
             bbox=dict(boxstyle="round,pad=0.7", facecolor="#e4f2ff", edgecolor="#2980b9", alpha=0.87)
         )
 
-        return fig, ax
-
     def _draw_obstacles(self, ax, nfz_rectangles):
-        """Draw No-Fly Zones as semi-transparent red rectangles."""
-        if not nfz_rectangles:
-            return
+        """Draw No-Fly Zones as semi-transparent red rectangles; returns the patches."""
+        patches = []
         label_once = True
         for nfz in nfz_rectangles:
             top_row, left_col = nfz["top_left"]
@@ -133,8 +317,9 @@ class SimulationPlotter:
                 zorder=1,
                 label="No-Fly Zone" if label_once else None,
             )
-            ax.add_patch(rect)
+            patches.append(ax.add_patch(rect))
             label_once = False
+        return patches
 
     def _draw_waypoints(self, ax, waypoints):
         """Draw waypoints as purple diamonds with large white border, always on top."""
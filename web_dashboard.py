@@ -13,8 +13,11 @@ from models.environment import SearchEnvironment
 from utils.data_loader import load_mission_data, load_targets_data, load_nfz_data, load_waypoints_data, \
     load_drone_starts
 from algorithms.waypoint import WaypointNavigator
+from algorithms.allocation import allocate_waypoints
+from algorithms.tour import optimize_tour
 from simulation.engine import SimulationEngine
 from visualization.plotter import SimulationPlotter
+from utils.scenario_bundle import load_fresh_scenario
 
 
 class WebPlotter:
@@ -90,10 +93,19 @@ class WebPlotter:
 
 
 def load_mission():
-    """Load mission data"""
+    """Load mission data (from the compiled scenario bundle when it is up to date)
+
+    The last item is the open ScenarioBundle, or None when the CSVs were read,
+    so initialize_simulation can build its environment without reopening it.
+    """
+    scenario = load_fresh_scenario('data')
+    if scenario:
+        return scenario.mission(), scenario.drone_starts(), scenario.targets(), scenario.nfz_rectangles(), \
+            scenario.waypoints(), scenario
+
     mission = load_mission_data('data/missions.csv')
     if not mission:
-        return None, None, None, None
+        return None, None, None, None, None, None
 
     drone_starts = load_drone_starts('data/drone_starts.csv')
     if not drone_starts:
@@ -103,22 +115,33 @@ def load_mission():
     nfz_rectangles = load_nfz_data('data/nfz.csv')
     waypoints = load_waypoints_data('data/waypoints.csv')
 
-    return mission, drone_starts, targets, nfz_rectangles, waypoints
+    return mission, drone_starts, targets, nfz_rectangles, waypoints, None
 
 
-def initialize_simulation(mission, drone_starts, targets, nfz_rectangles, waypoints):
-    """Initialize the simulation environment"""
-    environment = SearchEnvironment(grid_size=mission['grid_size'])
+def initialize_simulation(mission, drone_starts, targets, nfz_rectangles, waypoints, scenario=None):
+    """Initialize the simulation environment (from scenario, the bundle load_mission opened, if given)"""
+    if scenario:
+        environment = scenario.build_environment()  # Memory-mapped mask, no repainting
+    else:
+        environment = SearchEnvironment(grid_size=mission['grid_size'])
 
-    for target in targets:
-        environment.add_target(target['position'])
+        environment.add_targets(
+            [target['position'] for target in targets],
+            target_ids=[target['target_id'] for target in targets],
+            priorities=[target['priority'] for target in targets]
+        )
 
-    for nfz in nfz_rectangles:
-        environment.add_nfz_rectangle(nfz)
+        for nfz in nfz_rectangles:
+            environment.add_nfz_rectangle(nfz)
+
+    # Split waypoints between drones with NFZ-aware routing
+    allocation = allocate_waypoints(environment, drone_starts, waypoints) if waypoints else None
+    if allocation and allocation['unreachable']:
+        st.warning(f"🚧 {len(allocation['unreachable'])} waypoints unreachable from every drone start")
 
     # Create drones
     drones = []
-    for i, drone_config in enumerate(drone_starts):
+    for drone_config in drone_starts:
         drone = RescueDrone(
             start_position=drone_config['start_position'],
             battery=400,
@@ -126,17 +149,9 @@ def initialize_simulation(mission, drone_starts, targets, nfz_rectangles, waypoi
             color=drone_config['color']
         )
 
-        if waypoints:
-            # Split waypoints between drones
-            if len(drone_starts) == 2:
-                if i == 0:
-                    drone_waypoints = waypoints[:len(waypoints) // 2]
-                else:
-                    drone_waypoints = waypoints[len(waypoints) // 2:]
-            else:
-                drone_waypoints = waypoints
-
-            drone.set_waypoints(drone_waypoints)
+        if allocation:
+            tour = optimize_tour(environment, drone.position, allocation['assignments'][drone.drone_id])
+            drone.set_waypoints(tour['waypoints'])
 
         drones.append(drone)
 
@@ -199,7 +214,7 @@ def main():
         st.header("📊 Mission Info")
 
         if st.session_state.mission_data:
-            mission, drone_starts, targets, nfz_rectangles, waypoints = st.session_state.mission_data
+            mission, drone_starts, targets, nfz_rectangles, waypoints, scenario = st.session_state.mission_data
             st.write(f"**Grid Size:** {mission['grid_size'][0]}x{mission['grid_size'][1]}")
             st.write(f"**Targets:** {len(targets)}")
             st.write(f"**Drones:** {len(drone_starts)}")
@@ -212,9 +227,9 @@ def main():
         st.subheader("🎮 Live Mission View")
 
         if st.session_state.mission_running and st.session_state.mission_data:
-            mission, drone_starts, targets, nfz_rectangles, waypoints = st.session_state.mission_data
+            mission, drone_starts, targets, nfz_rectangles, waypoints, scenario = st.session_state.mission_data
             drones, environment, simulation, plotter = initialize_simulation(
-                mission, drone_starts, targets, nfz_rectangles, waypoints
+                mission, drone_starts, targets, nfz_rectangles, waypoints, scenario
             )
 
             # Create placeholder for the plot
@@ -271,9 +286,9 @@ def main():
 
         elif st.session_state.mission_data and not st.session_state.mission_running:
             # Show initial state
-            mission, drone_starts, targets, nfz_rectangles, waypoints = st.session_state.mission_data
+            mission, drone_starts, targets, nfz_rectangles, waypoints, scenario = st.session_state.mission_data
             drones, environment, simulation, plotter = initialize_simulation(
-                mission, drone_starts, targets, nfz_rectangles, waypoints
+                mission, drone_starts, targets, nfz_rectangles, waypoints, scenario
             )
 
             fig = plotter.create_plot(drones, environment, 0, 0, 0)
@@ -289,7 +304,7 @@ def main():
         st.subheader("🚁 Drone Fleet Status")
 
         if st.session_state.mission_data:
-            mission, drone_starts, targets, nfz_rectangles, waypoints = st.session_state.mission_data
+            mission, drone_starts, targets, nfz_rectangles, waypoints, scenario = st.session_state.mission_data
 
             for drone_config in drone_starts:
                 with st.container():